@@ -0,0 +1,182 @@
+# run from the root directory with: python -m core.data.__test__
+import random
+import unittest
+
+from core.data.server import PlayerDict, Server
+from types import SimpleNamespace
+
+
+class _Player:
+    """
+    Stands in for core.data.player.Player, which tells the PlayerDict of its server about changes the same way.
+    """
+    def __init__(self, server, id: int, ucid: str, name: str, *, active: bool = True, side: int = 0,
+                 slot: int = 0, unit_id: int = 0, member=None):
+        self.__dict__['server'] = None
+        self.id = id
+        self.ucid = ucid
+        self.name = name
+        self.active = active
+        self.side = side
+        self.slot = slot
+        self.unit_id = unit_id
+        self._member = member
+        self.ipaddr = f'127.0.0.{id}'
+        self.server = server
+
+    @property
+    def member(self):
+        return self._member
+
+    def __setattr__(self, key, value):
+        super().__setattr__(key, value)
+        if key in PlayerDict.ATTRIBUTES:
+            server = self.__dict__.get('server')
+            if server:
+                server.players.reindex(self)
+
+    def __repr__(self):
+        return f'Player({self.id}, {self.name}, slot={self.slot}, active={self.active})'
+
+
+class _Server:
+    def __init__(self):
+        self.players = PlayerDict()
+
+    get_player = Server.get_player
+    get_active_players = Server.get_active_players
+    get_crew_members = Server.get_crew_members
+
+
+class TestPlayerDict(unittest.TestCase):
+
+    def setUp(self):
+        self.server = _Server()
+
+    def add(self, id: int, **kwargs) -> _Player:
+        kwargs.setdefault('ucid', f'{id:032d}')
+        kwargs.setdefault('name', f'Player {id}')
+        player = _Player(self.server, id, **kwargs)
+        self.server.players[id] = player
+        return player
+
+    def assertConsistent(self):
+        players = self.server.players
+        scan = [x for x in players.values()]
+        for player in scan:
+            for name in ['ucid', 'name', 'unit_id']:
+                expected = [x for x in scan if getattr(x, name) == getattr(player, name) and x.id != 1]
+                found = self.server.get_player(**{name: getattr(player, name)})
+                self.assertIn(found, expected or [None], f'get_player({name}={getattr(player, name)})')
+            if player.member:
+                expected = [x for x in scan if x.member and x.member.id == player.member.id and x.id != 1]
+                self.assertIn(self.server.get_player(discord_id=player.member.id), expected)
+            self.assertCountEqual(self.server.get_crew_members(player),
+                                  [x for x in scan if x.slot == player.slot and x.active])
+        for side in [None, 1, 2]:
+            self.assertCountEqual(self.server.get_active_players(side=side),
+                                  [x for x in scan if x.active and (not side or x.side == side)])
+        # nothing is left in the indexes, that is not in the dict anymore
+        for name in PlayerDict.KEYS:
+            for key in list(players._indexes[name]):
+                for player in players.lookup(name, key):
+                    self.assertIs(players.get(player.id), player)
+                    self.assertEqual(PlayerDict.KEYS[name](player), key)
+
+    def test_add(self):
+        self.add(1, active=False)
+        self.add(2, side=1, slot=10)
+        self.add(3, side=2, slot=20, active=False)
+        self.assertConsistent()
+        self.assertEqual(self.server.get_player(ucid=f'{2:032d}').id, 2)
+        self.assertIsNone(self.server.get_player(ucid=f'{1:032d}'))
+        self.assertEqual([x.id for x in self.server.get_active_players()], [2])
+
+    def test_change_slot(self):
+        pilot = self.add(2, side=1, slot=10, unit_id=100)
+        copilot = self.add(3, side=1, slot=10, unit_id=100)
+        self.assertCountEqual(self.server.get_crew_members(pilot), [pilot, copilot])
+        copilot.slot = 11
+        copilot.unit_id = 101
+        self.assertEqual(self.server.get_crew_members(pilot), [pilot])
+        self.assertIs(self.server.get_player(unit_id=101), copilot)
+        self.assertConsistent()
+
+    def test_change_member(self):
+        player = self.add(2)
+        player._member = SimpleNamespace(id=4711)
+        self.assertIs(self.server.get_player(discord_id=4711), player)
+        player._member = SimpleNamespace(id=815)
+        self.assertIsNone(self.server.get_player(discord_id=4711))
+        self.assertIs(self.server.get_player(discord_id=815), player)
+        player._member = None
+        self.assertIsNone(self.server.get_player(discord_id=815))
+        self.assertConsistent()
+
+    def test_rekey(self):
+        player = self.add(2, slot=10)
+        # the player reconnected with a new id
+        self.server.players[5] = self.server.players.pop(2)
+        player.id = 5
+        self.assertIs(self.server.get_player(id=5), player)
+        self.assertIsNone(self.server.get_player(id=2))
+        self.assertIs(self.server.get_player(ucid=player.ucid), player)
+        self.assertConsistent()
+
+    def test_replace(self):
+        old = self.add(2, name='Old')
+        new = self.add(2, name='New')
+        self.assertIsNone(self.server.get_player(name='Old'))
+        self.assertIs(self.server.get_player(name='New'), new)
+        # changes of the replaced player don't touch the indexes anymore
+        old.name = 'New'
+        self.assertEqual(self.server.players.lookup('name', 'New'), [new])
+        self.assertConsistent()
+
+    def test_disconnect(self):
+        player = self.add(2, slot=10)
+        other = self.add(3, slot=10)
+        del self.server.players[2]
+        self.assertIsNone(self.server.get_player(ucid=player.ucid))
+        self.assertEqual(self.server.get_crew_members(other), [other])
+        # changes of a player that left the server don't touch the indexes anymore
+        player.slot = 20
+        self.assertEqual(self.server.players.lookup('slot', 20), [])
+        self.assertConsistent()
+        self.server.players.clear()
+        self.assertEqual(self.server.get_active_players(), [])
+        self.assertConsistent()
+
+    def test_random(self):
+        rnd = random.Random(42)
+        next_id = 2
+        for _ in range(2000):
+            players = list(self.server.players.values())
+            op = rnd.randrange(7) if players else 0
+            if op == 0:
+                self.add(next_id, name=f'Player {rnd.randrange(20)}', side=rnd.choice([1, 2]),
+                         active=rnd.random() > 0.2, slot=rnd.randrange(10), unit_id=rnd.randrange(10))
+                next_id += 1
+            elif op == 1:
+                player = rnd.choice(players)
+                player.slot = rnd.randrange(10)
+                player.unit_id = rnd.randrange(10)
+                player.side = rnd.choice([1, 2])
+            elif op == 2:
+                rnd.choice(players).active = rnd.random() > 0.5
+            elif op == 3:
+                rnd.choice(players)._member = SimpleNamespace(id=rnd.randrange(5)) if rnd.random() > 0.3 else None
+            elif op == 4:
+                rnd.choice(players).name = f'Player {rnd.randrange(20)}'
+            elif op == 5:
+                player = rnd.choice(players)
+                self.server.players[next_id] = self.server.players.pop(player.id)
+                player.id = next_id
+                next_id += 1
+            else:
+                self.server.players.pop(rnd.choice(players).id)
+            self.assertConsistent()
+
+
+if __name__ == '__main__':
+    unittest.main()
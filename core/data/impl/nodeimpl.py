@@ -15,6 +15,7 @@ import sqlparse
 import ssl
 import subprocess
 import sys
+import time
 
 from collections import defaultdict
 from contextlib import closing
@@ -58,6 +59,13 @@ __all__ = [
 
 REPO_URL = "https://api.github.com/repos/Special-K-s-Flightsim-Bots/DCSServerBot/releases"
 LOGIN_URL = 'https://api.digitalcombatsimulator.com/gameapi/login/'
+# minutes between the liveness updates of an instance in the database, per server status (0 = never)
+DEFAULT_KEEP_ALIVE = {
+    Status.LOADING: 1,
+    Status.RUNNING: 1,
+    Status.PAUSED: 1,
+    Status.STOPPED: 1
+}
 LOGOUT_URL = 'https://api.digitalcombatsimulator.com/gameapi/logout/'
 UPDATER_URL = 'https://api.digitalcombatsimulator.com/gameapi/updater/branch/{}/'
 LICENSES_URL = 'https://www.digitalcombatsimulator.com/checklicenses.php'
@@ -99,7 +107,11 @@ class NodeImpl(Node):
         self.db_version = None
         self.pool: Optional[ConnectionPool] = None
         self.apool: Optional[AsyncConnectionPool] = None
+        self.db_writer: Optional[utils.DatabaseWriter] = None
         self._master = None
+        # instances that are written with the next heartbeat
+        self._alive: set[str] = set()
+        self._keep_alive: dict[str, int] = {}
         self.listen_address = self.locals.get('listen_address', '127.0.0.1')
         if self.listen_address != '127.0.0.1':
             self.log.warning(
@@ -130,6 +142,7 @@ class NodeImpl(Node):
         if 'DCS' in self.locals:
             await self.get_dcs_branch_and_version()
         self.pool, self.apool = await self.init_db()
+        self.db_writer = utils.DatabaseWriter(self.apool)
         try:
             self._master = await self.heartbeat()
             self.log.info("- Starting as {} ...".format("Single / Master" if self._master else "Agent"))
@@ -277,6 +290,11 @@ class NodeImpl(Node):
         return db_pool, db_apool
 
     async def close_db(self):
+        if self.db_writer:
+            try:
+                await self.db_writer.close()
+            except Exception as ex:
+                self.log.exception(ex)
         if self.pool and not self.pool.closed:
             try:
                 self.pool.close()
@@ -650,6 +668,22 @@ class NodeImpl(Node):
             if not self.locals['DCS'].get('cloud', False) or self.master:
                 self.autoupdate.cancel()
 
+    def keep_alive(self, server: Server) -> None:
+        """
+        Marks the instance of a server as alive. All instances are written together with the next heartbeat of this
+        node, in the cadence that is configured for the status of the server.
+        """
+        config = self.locals.get('keep_alive', {})
+        minutes = config.get(server.status.name.lower(), DEFAULT_KEEP_ALIVE.get(server.status, 0))
+        if not minutes:
+            self._keep_alive.pop(server.name, None)
+            return
+        count = self._keep_alive.get(server.name, minutes - 1) + 1
+        if count >= minutes:
+            self._alive.add(server.name)
+            count = 0
+        self._keep_alive[server.name] = count
+
     async def heartbeat(self) -> bool:
         def has_timeout(row: dict, timeout: int):
             return (row['now'] - row['last_seen']).total_seconds() > timeout
@@ -659,11 +693,15 @@ class NodeImpl(Node):
                 async with conn.transaction():
                     async with conn.cursor(row_factory=dict_row) as cursor:
                         try:
+                            start = time.monotonic()
                             await cursor.execute("""
                                 SELECT NOW() AT TIME ZONE 'UTC' AS now, * FROM nodes 
                                 WHERE guild_id = %s FOR UPDATE
                             """, (self.guild_id, ))
                             all_nodes = await cursor.fetchall()
+                            lock_wait = time.monotonic() - start
+                            if lock_wait > 1:
+                                self.log.warning(f"Heartbeat: waited {lock_wait:.2f}s for the lock on the nodes table.")
                             await cursor.execute("""
                                 SELECT c.master, c.version, c.update_pending, n.node 
                                 FROM cluster c LEFT OUTER JOIN nodes n
@@ -795,10 +833,17 @@ class NodeImpl(Node):
                             self.log.exception(e)
                             return self.master
                         finally:
+                            # node and instances are updated in one go
+                            alive = list(self._alive)
                             await cursor.execute("""
-                                INSERT INTO nodes (guild_id, node) VALUES (%s, %s) 
-                                ON CONFLICT (guild_id, node) DO UPDATE SET last_seen = (NOW() AT TIME ZONE 'UTC')
-                            """, (self.guild_id, self.name))
+                                WITH node AS (
+                                    INSERT INTO nodes (guild_id, node) VALUES (%s, %s) 
+                                    ON CONFLICT (guild_id, node) DO UPDATE SET last_seen = (NOW() AT TIME ZONE 'UTC')
+                                )
+                                UPDATE instances SET last_seen = (NOW() AT TIME ZONE 'UTC')
+                                WHERE node = %s AND server_name = ANY(%s)
+                            """, (self.guild_id, self.name, self.name, alive))
+                            self._alive.difference_update(alive)
         except OperationalError as ex:
             self.log.error(ex)
             return self.master
@@ -1229,7 +1274,9 @@ class NodeImpl(Node):
 
         instance = server.instance
         instance.server = None
-        ServiceRegistry.get(ServiceBus).servers.pop(server.name)
+        bus = ServiceRegistry.get(ServiceBus)
+        bus.servers.pop(server.name)
+        bus.remove_message_queue(server.name)
 
     async def install_plugin(self, plugin: str) -> bool:
         from services.bot import BotService
@@ -6,7 +6,6 @@ import json
 import os
 import psutil
 import shutil
-import socket
 import subprocess
 import sys
 import tempfile
@@ -18,14 +17,13 @@ if sys.platform == 'win32':
 
 from collections import OrderedDict
 from contextlib import suppress
-from copy import deepcopy
 from core import utils, Server
 from core.data.dataobject import DataObjectFactory
 from core.data.const import Status, Channel, Coalition
 from core.extension import Extension, InstallException, UninstallException
-from core.mizfile import MizFile, UnsupportedMizFileException
+from core.mizfile import MizFile, MissionPipeline, UnsupportedMizFileException
 from core.data.node import UploadStatus
-from core.utils.performance import performance_log
+from core.utils.performance import performance_log, PerformanceLog
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
@@ -333,35 +331,35 @@ class ServerImpl(Server):
     async def get_current_mission_theatre(self) -> Optional[str]:
         filename = await self.get_current_mission_file()
         if filename:
-            miz = await asyncio.to_thread(MizFile, filename)
-            return miz.theatre
+            miz = MizFile(filename)
+            # reading the theatre does not need the mission to be parsed
+            return await asyncio.to_thread(lambda: miz.theatre)
 
-    def serialize(self, message: dict):
+    @staticmethod
+    def serialize(message: dict) -> dict:
+        """
+        Returns a copy of the message that is safe to be sent to DCS. The message itself is not changed.
+        """
         def _serialize_value(value: Any) -> Any:
             if isinstance(value, bool):
                 return value
             elif isinstance(value, int):
+                # As Lua does not support large numbers, convert them to strings
                 return str(value)
             elif isinstance(value, Enum):
                 return value.value
             elif isinstance(value, dict):
-                return self.serialize(value)
+                return {k: _serialize_value(v) for k, v in value.items()}
             elif isinstance(value, list):
                 return [_serialize_value(x) for x in value]
             return value
 
-        for key, value in message.items():
-            message[key] = _serialize_value(value)
-        return message
+        return _serialize_value(message)
 
     async def send_to_dcs(self, message: dict):
-        # As Lua does not support large numbers, convert them to strings
-        message = self.serialize(deepcopy(message))
-        msg = json.dumps(message)
+        msg = json.dumps(self.serialize(message))
         self.log.debug(f"HOST->{self.name}: {msg}")
-        dcs_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        dcs_socket.sendto(msg.encode('utf-8'), ('127.0.0.1', int(self.port)))
-        dcs_socket.close()
+        self.bus.send_datagram(msg.encode('utf-8'), int(self.port))
 
     async def rename(self, new_name: str, update_settings: bool = False) -> None:
         def update_config(old_name, new_name: str, update_settings: bool = False):
@@ -709,18 +707,30 @@ class ServerImpl(Server):
                 orig_filename = utils.get_orig_file(new_filename)
                 # and copy the orig file over
                 shutil.copy2(orig_filename, new_filename)
+            pipeline = MissionPipeline(new_filename)
             try:
                 # process all mission modifications
                 dirty = False
                 for ext in self.extensions.values():
-                    if type(ext).beforeMissionLoad != Extension.beforeMissionLoad:
-                        new_filename, _dirty = await ext.beforeMissionLoad(new_filename)
-                        if _dirty:
-                            self.log.info(f'  => {ext.name} applied on {new_filename}.')
-                        dirty |= _dirty
+                    if type(ext).editMission != Extension.editMission:
+                        with PerformanceLog(f"{self.name}: {ext.name}.editMission()"):
+                            _dirty = await ext.editMission(pipeline)
+                    elif type(ext).beforeMissionLoad != Extension.beforeMissionLoad:
+                        # the extension works on the file, so write the changes so far
+                        current = await pipeline.get_filename()
+                        with PerformanceLog(f"{self.name}: {ext.name}.beforeMissionLoad()"):
+                            new_filename, _dirty = await ext.beforeMissionLoad(current)
+                        if _dirty or new_filename != current:
+                            pipeline.set_filename(new_filename)
+                    else:
+                        continue
+                    if _dirty:
+                        self.log.info(f'  => {ext.name} applied on {pipeline.filename}.')
+                    dirty |= _dirty
                 # we did not change anything in the mission
                 if not dirty:
                     return filename
+                new_filename = await pipeline.save()
                 # check if the original mission can be written
                 if filename != new_filename:
                     missions: list[str] = self.settings['missionList']
@@ -737,8 +747,9 @@ class ServerImpl(Server):
                     self.log.error(ex)
                 else:
                     self.log.exception(ex)
-                if filename != new_filename and os.path.exists(new_filename):
-                    os.remove(new_filename)
+                for _filename in {new_filename, pipeline.filename}:
+                    if filename != _filename and os.path.exists(_filename):
+                        os.remove(_filename)
                 return filename
         finally:
             # enable autoscan
@@ -748,12 +759,8 @@ class ServerImpl(Server):
     async def keep_alive(self):
         if self.status in [Status.RUNNING, Status.PAUSED, Status.STOPPED]:
             await self.send_to_dcs({"command": "getMissionUpdate"})
-        async with self.apool.connection() as conn:
-            async with conn.transaction():
-                await conn.execute("""
-                    UPDATE instances SET last_seen = (now() AT TIME ZONE 'utc') 
-                    WHERE node = %s AND server_name = %s
-                """, (self.node.name, self.name))
+        # the instance is written with the next heartbeat of the node
+        self.node.keep_alive(self)
 
     async def uploadMission(self, filename: str, url: str, *, missions_dir: str = None, force: bool = False,
                             orig = False) -> UploadStatus:
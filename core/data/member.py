@@ -1,7 +1,7 @@
 from __future__ import annotations
 import discord
 
-from core import DataObjectFactory, DataObject
+from core import DataObjectFactory, DataObject, utils
 from dataclasses import dataclass, field
 from typing import Optional
 
@@ -47,8 +47,10 @@ class Member(DataObject):
                 if self._ucid:
                     conn.execute('UPDATE players SET discord_id = -1 WHERE ucid = %s AND discord_id = %s',
                                  (self._ucid, self.member.id))
+                    utils.player_index.update(self._ucid, discord_id=-1)
                 if ucid:
                     conn.execute('UPDATE players SET discord_id = %s WHERE ucid = %s', (self.member.id, ucid))
+                    utils.player_index.update(ucid, discord_id=self.member.id)
                 self._ucid = ucid
 
     @property
@@ -63,12 +65,15 @@ class Member(DataObject):
             with conn.transaction():
                 # verify the link
                 conn.execute('UPDATE players SET manual = %s WHERE ucid = %s', (flag, self._ucid))
+                if self._ucid:
+                    utils.player_index.update(self._ucid, manual=flag)
                 if flag:
                     # delete all old automated links
                     conn.execute("DELETE FROM players WHERE ucid = %s AND manual = FALSE", (self.ucid,))
                     conn.execute("DELETE FROM players WHERE discord_id = %s AND length(ucid) = 4", (self.member.id,))
                     conn.execute("UPDATE players SET discord_id = -1 WHERE discord_id = %s AND manual = FALSE",
                                  (self.member.id,))
+                    utils.player_index.unlink(self.member.id)
         self._verified = flag
 
     def link(self, ucid: str, verified: bool = True):
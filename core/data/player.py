@@ -2,11 +2,12 @@ from __future__ import annotations
 
 import asyncio
 import discord
+import psycopg
 
-from contextlib import closing
 from core import utils
 from core.data.dataobject import DataObject, DataObjectFactory
 from core.data.const import Side, Coalition
+from core.data.server import PlayerDict
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Optional, Union, AsyncGenerator
 
@@ -52,54 +53,91 @@ class Player(DataObject):
         self.bot = ServiceRegistry.get(BotService).bot
         if self.id == 1:
             self.active = False
+
+    def __setattr__(self, key, value):
+        super().__setattr__(key, value)
+        # keep the player indexes of the server up to date
+        if key in PlayerDict.ATTRIBUTES:
+            server = self.__dict__.get('server')
+            if server:
+                server.players.reindex(self)
+
+    async def load(self) -> None:
+        """Load the player data from the database. Has to be called once, before the player is added to a server."""
+        await self.load_all([self])
+
+    @classmethod
+    async def load_all(cls, players: list[Player]) -> None:
+        """
+        Load the data of many players at once (like on a server registration), with one query instead of one per player.
+        Has to be called once, before the players are added to a server.
+        """
+        players = [x for x in players if x.id != 1]
+        if not players:
             return
-        with self.pool.connection() as conn:
-            with conn.transaction():
-                with closing(conn.cursor()) as cursor:
-                    cursor.execute("""
-                        SELECT p.discord_id, CASE WHEN b.ucid IS NOT NULL THEN TRUE ELSE FALSE END AS banned, 
-                               p.manual, c.coalition, 
-                               CASE WHEN w.player_ucid IS NOT NULL THEN TRUE ELSE FALSE END AS watchlict, p.vip 
-                        FROM players p LEFT OUTER JOIN bans b ON p.ucid = b.ucid 
-                        LEFT OUTER JOIN coalitions c ON p.ucid = c.player_ucid 
-                        LEFT OUTER JOIN watchlist w ON p.ucid = w.player_ucid
-                        WHERE p.ucid = %s 
-                        AND COALESCE(b.banned_until, (now() AT TIME ZONE 'utc')) >= (now() AT TIME ZONE 'utc')
-                    """, (self.ucid, ))
+        bot = players[0].bot
+        ucids = [x.ucid for x in players]
+        # the bot needs a connection of its own, so don't hold ours meanwhile
+        members = await bot.get_members_by_ucid(ucids)
+        async with players[0].apool.connection() as conn:
+            async with conn.transaction():
+                cursor = await conn.execute("""
+                    SELECT p.ucid, p.discord_id, CASE WHEN b.ucid IS NOT NULL THEN TRUE ELSE FALSE END AS banned, 
+                           p.manual, c.coalition, 
+                           CASE WHEN w.player_ucid IS NOT NULL THEN TRUE ELSE FALSE END AS watchlict, p.vip 
+                    FROM players p LEFT OUTER JOIN bans b ON p.ucid = b.ucid 
+                    LEFT OUTER JOIN coalitions c ON p.ucid = c.player_ucid 
+                    LEFT OUTER JOIN watchlist w ON p.ucid = w.player_ucid
+                    WHERE p.ucid = ANY(%s) 
+                    AND COALESCE(b.banned_until, (now() AT TIME ZONE 'utc')) >= (now() AT TIME ZONE 'utc')
+                """, (ucids, ))
+                rows = {row[0]: row async for row in cursor}
+                messages = []
+                for player in players:
+                    row = rows.get(player.ucid)
                     # existing member found?
-                    if cursor.rowcount == 1:
-                        row = cursor.fetchone()
-                        self._member = self.bot.get_member_by_ucid(self.ucid)
-                        if self._member:
+                    if row:
+                        player._member = members.get(player.ucid)
+                        if player._member:
                             # special handling for discord-less bots
-                            if isinstance(self._member, discord.Member):
-                                self._verified = row[2]
+                            if isinstance(player._member, discord.Member):
+                                player._verified = row[3]
                             else:
-                                self._verified = True
-                        self.banned = row[1]
-                        if row[3]:
-                            self.coalition = Coalition(row[3])
-                        self._watchlist = row[4]
-                        self._vip = row[5]
+                                player._verified = True
+                        player.banned = row[2]
+                        if row[4]:
+                            player.coalition = Coalition(row[4])
+                        player._watchlist = row[5]
+                        player._vip = row[6]
                     else:
-                        rules = self.server.locals.get('rules')
+                        rules = player.server.locals.get('rules')
                         if rules:
-                            cursor.execute("""
-                                INSERT INTO messages (sender, player_ucid, message, ack) 
-                                VALUES (%s, %s, %s, %s)
-                            """, (self.server.locals.get('server_user', 'Admin'), self.ucid, rules,
-                                  self.server.locals.get('accept_rules_on_join', False)))
-
-                    cursor.execute("""
+                            messages.append((player.server.locals.get('server_user', 'Admin'), player.ucid, rules,
+                                             player.server.locals.get('accept_rules_on_join', False)))
+                async with conn.cursor() as cursor:
+                    if messages:
+                        await cursor.executemany("""
+                            INSERT INTO messages (sender, player_ucid, message, ack) 
+                            VALUES (%s, %s, %s, %s)
+                        """, messages)
+                    names = {x.ucid: x.name for x in players}
+                    await cursor.execute("""
                         INSERT INTO players (ucid, discord_id, name, last_seen) 
-                        VALUES (%s, -1, %s, (now() AT TIME ZONE 'utc')) 
+                        SELECT ucid, -1, name, (now() AT TIME ZONE 'utc') 
+                        FROM unnest(%s::TEXT[], %s::TEXT[]) AS t(ucid, name) 
                         ON CONFLICT (ucid) DO UPDATE SET name=excluded.name, last_seen=excluded.last_seen
-                        """, (self.ucid, self.name))
-        # if automatch is enabled, try to match the user
-        if not self.member and self.bot.locals.get('automatch', True):
-            discord_user = self.bot.match_user({"ucid": self.ucid, "name": self.name})
-            if discord_user:
-                self.member = discord_user
+                    """, (list(names.keys()), list(names.values())))
+        for player in players:
+            utils.player_index.update(player.ucid, name=player.name)
+        # if automatch is enabled, try to match the users
+        if bot.locals.get('automatch', True):
+            for player in players:
+                if player.member:
+                    continue
+                # we already know that there is no linked member, so this only looks up the member index
+                discord_user = bot.match_user({"ucid": player.ucid, "name": player.name}, True)
+                if discord_user:
+                    player.member = discord_user
 
     def is_active(self) -> bool:
         return self.active
@@ -121,10 +159,12 @@ class Player(DataObject):
             self._member = member
 
     def update_member(self, member: discord.Member) -> None:
-        with self.pool.connection() as conn:
-            with conn.transaction():
-                conn.execute('UPDATE players SET discord_id = %s WHERE ucid = %s',
-                             (member.id if member else -1, self.ucid))
+        async def _update(conn: psycopg.AsyncConnection):
+            await conn.execute('UPDATE players SET discord_id = %s WHERE ucid = %s', (discord_id, self.ucid))
+
+        discord_id = member.id if member else -1
+        self.node.db_writer.submit(_update)
+        utils.player_index.update(self.ucid, discord_id=discord_id)
 
     @property
     def verified(self) -> bool:
@@ -138,16 +178,21 @@ class Player(DataObject):
         self._verified = verified
 
     def update_verified(self, verified: bool) -> None:
-        with self.pool.connection() as conn:
-            with conn.transaction():
-                conn.execute('UPDATE players SET manual = %s WHERE ucid = %s', (verified, self.ucid))
-                if verified:
-                    # delete all old automated links (this will delete the token also)
-                    conn.execute("DELETE FROM players WHERE ucid = %s AND manual = FALSE", (self.ucid,))
-                    conn.execute("DELETE FROM players WHERE discord_id = %s AND length(ucid) = 4",
-                                 (self.member.id,))
-                    conn.execute("UPDATE players SET discord_id = -1 WHERE discord_id = %s AND manual = FALSE",
-                                 (self.member.id,))
+        async def _update(conn: psycopg.AsyncConnection):
+            await conn.execute('UPDATE players SET manual = %s WHERE ucid = %s', (verified, self.ucid))
+            if verified:
+                # delete all old automated links (this will delete the token also)
+                await conn.execute("DELETE FROM players WHERE ucid = %s AND manual = FALSE", (self.ucid,))
+                await conn.execute("DELETE FROM players WHERE discord_id = %s AND length(ucid) = 4", (discord_id,))
+                await conn.execute("UPDATE players SET discord_id = -1 WHERE discord_id = %s AND manual = FALSE",
+                                   (discord_id,))
+
+        # the member might change before the job runs
+        discord_id = self.member.id if self.member else None
+        self.node.db_writer.submit(_update)
+        utils.player_index.update(self.ucid, manual=verified)
+        if verified:
+            utils.player_index.unlink(discord_id)
 
     @property
     def watchlist(self) -> bool:
@@ -163,9 +208,11 @@ class Player(DataObject):
         self._vip = vip
 
     def update_vip(self, vip: bool) -> None:
-        with self.pool.connection() as conn:
-            with conn.transaction():
-                conn.execute('UPDATE players SET vip = %s WHERE ucid = %s', (vip, self.ucid))
+        async def _update(conn: psycopg.AsyncConnection):
+            await conn.execute('UPDATE players SET vip = %s WHERE ucid = %s', (vip, self.ucid))
+
+        self.node.db_writer.submit(_update)
+        utils.player_index.update(self.ucid, vip=vip)
 
     @property
     def coalition(self) -> Coalition:
@@ -205,6 +252,7 @@ class Player(DataObject):
                 if 'name' in data and self.name != data['name']:
                     self.name = data['name']
                     await conn.execute('UPDATE players SET name = %s WHERE ucid = %s', (self.name, self.ucid))
+                    utils.player_index.update(self.ucid, name=self.name)
                 if 'side' in data:
                     self.side = Side(data['side'])
                 if 'slot' in data:
@@ -27,6 +27,7 @@ class NodeProxy(Node):
         self.local_node = local_node
         self.pool = self.local_node.pool
         self.apool = self.local_node.apool
+        self.db_writer = self.local_node.db_writer
         self.log = self.local_node.log
         self._public_ip = public_ip
         self.locals = self.read_locals()
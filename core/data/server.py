@@ -11,7 +11,7 @@ from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 from psutil import Process
-from typing import Optional, Union, TYPE_CHECKING, Any
+from typing import Optional, Union, TYPE_CHECKING, Any, Callable, Iterable
 
 from .dataobject import DataObject
 from .const import Status, Coalition, Channel, Side
@@ -32,6 +32,115 @@ __all__ = ["Server"]
 _ = get_translation('core')
 
 
+class PlayerDict(dict):
+    """
+    The players of a server by their id, with secondary indexes on the attributes we look players up by.
+    Players tell the dict about changes of indexed attributes (see Player.__setattr__), so the indexes stay consistent
+    through slot changes, reconnects and disconnects.
+    """
+    KEYS: dict[str, Callable[[Player], Any]] = {
+        "ucid": lambda p: p.ucid,
+        "name": lambda p: p.name,
+        "unit_id": lambda p: p.unit_id,
+        "discord_id": lambda p: p.member.id if p.member else None,
+        "slot": lambda p: p.slot,
+        "active": lambda p: True if p.active else None
+    }
+    # player attributes that change the keys above
+    ATTRIBUTES = frozenset(['ucid', 'name', 'unit_id', '_member', 'slot', 'active'])
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self._indexes: dict[str, dict[Any, list[Player]]] = {x: {} for x in self.KEYS}
+        # the keys a player is indexed by, to find it again after the attributes have changed
+        self._keys: dict[int, dict[str, Any]] = {}
+        self.update(*args, **kwargs)
+
+    def _index(self, player: Player) -> None:
+        keys = {}
+        for name, func in self.KEYS.items():
+            key = func(player)
+            if key is not None:
+                self._indexes[name].setdefault(key, []).append(player)
+            keys[name] = key
+        self._keys[id(player)] = keys
+
+    def _remove(self, name: str, key: Any, player: Player) -> None:
+        if key is None:
+            return
+        bucket = self._indexes[name][key]
+        for i, p in enumerate(bucket):
+            if p is player:
+                del bucket[i]
+                break
+        if not bucket:
+            del self._indexes[name][key]
+
+    def _unindex(self, player: Player) -> None:
+        keys = self._keys.pop(id(player), None)
+        if keys is None:
+            return
+        for name, key in keys.items():
+            self._remove(name, key, player)
+
+    def reindex(self, player: Player) -> None:
+        keys = self._keys.get(id(player))
+        if keys is None:
+            return
+        for name, func in self.KEYS.items():
+            key = func(player)
+            if key != keys[name]:
+                self._remove(name, keys[name], player)
+                if key is not None:
+                    self._indexes[name].setdefault(key, []).append(player)
+                keys[name] = key
+
+    def lookup(self, name: str, key: Any) -> list[Player]:
+        return self._indexes[name].get(key, [])
+
+    def __setitem__(self, key: int, player: Player) -> None:
+        old = self.get(key)
+        if old is player:
+            return
+        elif old is not None:
+            self._unindex(old)
+        super().__setitem__(key, player)
+        if id(player) not in self._keys:
+            self._index(player)
+
+    def __delitem__(self, key: int) -> None:
+        player = self[key]
+        super().__delitem__(key)
+        self._unindex(player)
+
+    def pop(self, key: int, *args) -> Player:
+        if key not in self:
+            return super().pop(key, *args)
+        player = super().pop(key)
+        self._unindex(player)
+        return player
+
+    def popitem(self) -> tuple[int, Player]:
+        key, player = super().popitem()
+        self._unindex(player)
+        return key, player
+
+    def setdefault(self, key: int, default: Player = None) -> Player:
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs) -> None:
+        for key, player in dict(*args, **kwargs).items():
+            self[key] = player
+
+    def clear(self) -> None:
+        super().clear()
+        for index in self._indexes.values():
+            index.clear()
+        self._keys.clear()
+
+
 @dataclass
 class Server(DataObject):
     port: int
@@ -44,7 +153,7 @@ class Server(DataObject):
     _settings: Optional[Union[utils.SettingsDict, utils.RemoteSettingsDict]] = field(default=None, compare=False)
     current_mission: Optional[Mission] = field(default=None, compare=False)
     mission_id: int = field(default=-1, compare=False)
-    players: dict[int, Player] = field(default_factory=dict, compare=False)
+    players: PlayerDict = field(default_factory=PlayerDict, compare=False)
     process: Optional[Process] = field(default=None, compare=False)
     _maintenance: bool = field(compare=False, default=False)
     restart_pending: bool = field(default=False, compare=False)
@@ -183,34 +292,33 @@ class Server(DataObject):
     def get_player(self, **kwargs) -> Optional[Player]:
         if 'id' in kwargs:
             return self.players.get(kwargs['id'])
-        for player in self.players.values():
-            if player.id == 1:
-                continue
-            if 'active' in kwargs and player.active != kwargs['active']:
-                continue
-            if 'ucid' in kwargs and player.ucid == kwargs['ucid']:
-                return player
-            if 'discord_id' in kwargs and player.member and player.member.id == kwargs['discord_id']:
-                return player
-            if 'unit_id' in kwargs and player.unit_id == kwargs['unit_id']:
-                return player
-            if 'name' in kwargs and player.name == kwargs['name']:
-                return player
-            if 'ipaddr' in kwargs and player.ipaddr == kwargs['ipaddr']:
+
+        def _filter(players: Iterable[Player]) -> Optional[Player]:
+            for player in players:
+                if player.id == 1:
+                    continue
+                if 'active' in kwargs and player.active != kwargs['active']:
+                    continue
                 return player
+            return None
+
+        for name in ['ucid', 'discord_id', 'unit_id', 'name']:
+            if name in kwargs:
+                player = _filter(self.players.lookup(name, kwargs[name]))
+                if player:
+                    return player
+        if 'ipaddr' in kwargs:
+            return _filter(x for x in self.players.values() if x.ipaddr == kwargs['ipaddr'])
         return None
 
     def get_active_players(self, *, side: Side = None) -> list[Player]:
-        return [x for x in self.players.values() if x.active and (not side or side == x.side)]
+        return [x for x in self.players.lookup('active', True) if not side or side == x.side]
 
     def get_crew_members(self, pilot: Player):
-        members = []
-        if pilot:
-            # now find players that have the same slot
-            for player in self.players.values():
-                if player.active and player.slot == pilot.slot:
-                    members.append(player)
-        return members
+        if not pilot:
+            return []
+        # players that are in the same slot
+        return [x for x in self.players.lookup('slot', pilot.slot) if x.active]
 
     def is_populated(self) -> bool:
         if self.status == Status.RUNNING and self.get_active_players():
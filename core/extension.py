@@ -7,7 +7,7 @@ from abc import ABC
 from typing import Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from core import Server
+    from core import Server, MissionPipeline
 
 __all__ = [
     "Extension",
@@ -60,6 +60,14 @@ class Extension(ABC):
     async def beforeMissionLoad(self, filename: str) -> tuple[str, bool]:
         return filename, False
 
+    async def editMission(self, pipeline: MissionPipeline) -> bool:
+        """
+        Changes the mission before it is loaded. Implement this instead of beforeMissionLoad, so that the mission does
+        not need to be parsed and written by every extension. Changes to the MizFile of the pipeline have to be
+        marked with pipeline.dirty = True. Returns True, if the mission was changed.
+        """
+        return False
+
     async def startup(self) -> bool:
         self.running = True
         if self.is_running():
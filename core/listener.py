@@ -35,6 +35,8 @@ def event(name: str = MISSING, cls: Type[Event] = MISSING, **attrs) -> Callable[
 class Event:
     def __init__(self, func, **kwargs):
         self.name: str = kwargs.get('name') or func.__name__
+        # events receive a payload with read-only nested structures, unless they are declared as mutable
+        self.mutable: bool = kwargs.get('mutable', False)
         self.callback = func
 
     async def __call__(self, listener: EventListener, server: Server, data: dict) -> None:
@@ -1,26 +1,161 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import importlib
 import io
 import logging
 import luadata
 import os
+import pickle
+import re
 import shutil
 import tempfile
+import threading
 import zipfile
 
+from collections import OrderedDict
 from core import utils
+from core.utils.performance import PerformanceLog
 from datetime import datetime
 from packaging.version import parse, Version
 from typing import Union, Optional
 
 __all__ = [
     "MizFile",
+    "MissionCache",
+    "MissionPipeline",
     "UnsupportedMizFileException"
 ]
 
+# the files inside the miz that are read
+SECTIONS = ['mission', 'options', 'warehouses']
+
+# top-level values of the mission file that can be read without parsing the whole mission
+_PEEK = {
+    "theatre": re.compile(rb'^\t(?:\["theatre"\]|theatre) = "([^"\n]*)"', re.MULTILINE),
+    "start_time": re.compile(rb'^\t(?:\["start_time"\]|start_time) = ([0-9]+),', re.MULTILINE)
+}
+PEEK_CHUNK_SIZE = 65536
+
+
+class MissionCache:
+    """
+    Node-local cache of parsed missions, keyed by path, modification time and size of the miz file.
+    The parsed data is kept pickled, so every MizFile gets its own copy to work on. The memory usage is bounded
+    (least recently used missions are dropped first) and dropped missions can optionally be spilled to disk.
+    Missions in the temp directory (like the output of DCS Real Weather) are used only once and are not cached.
+    """
+
+    def __init__(self, memory: int = 256, disk: int = 0, directory: Optional[str] = None):
+        self.log = logging.getLogger(__name__)
+        self.max_memory = memory * 1024 * 1024
+        self.max_disk = disk * 1024 * 1024
+        self.directory = directory or os.path.join(tempfile.gettempdir(), 'DCSServerBot', 'missions')
+        self._entries: OrderedDict[tuple, bytes] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(filename: str) -> tuple[str, int, int]:
+        stat = os.stat(filename)
+        return os.path.normcase(os.path.abspath(filename)), stat.st_mtime_ns, stat.st_size
+
+    @staticmethod
+    def is_temporary(filename: str) -> bool:
+        tmpdir = os.path.normcase(os.path.realpath(tempfile.gettempdir()))
+        try:
+            return os.path.commonpath([os.path.normcase(os.path.realpath(filename)), tmpdir]) == tmpdir
+        except ValueError:
+            # different drives
+            return False
+
+    def _spill_file(self, key: tuple) -> str:
+        return os.path.join(self.directory, hashlib.sha1(repr(key).encode('utf-8')).hexdigest() + '.pickle')
+
+    def get(self, filename: str) -> Optional[dict]:
+        if self.is_temporary(filename):
+            return None
+        try:
+            key = self.key(filename)
+        except OSError:
+            return None
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+        if data is None and self.max_disk:
+            data = self._read_spill(key)
+            if data is not None:
+                self._put(key, data, spill=False)
+        return pickle.loads(data) if data is not None else None
+
+    def put(self, filename: str, sections: dict) -> None:
+        if self.is_temporary(filename):
+            return
+        try:
+            key = self.key(filename)
+        except OSError:
+            return
+        self._put(key, pickle.dumps(sections, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def _put(self, key: tuple, data: bytes, spill: bool = True) -> None:
+        if len(data) > self.max_memory:
+            if spill:
+                self._write_spill(key, data)
+            return
+        evicted = []
+        with self._lock:
+            if key in self._entries:
+                self._size -= len(self._entries.pop(key))
+            self._entries[key] = data
+            self._size += len(data)
+            while self._size > self.max_memory:
+                old_key, old_data = self._entries.popitem(last=False)
+                self._size -= len(old_data)
+                evicted.append((old_key, old_data))
+        if spill:
+            for old_key, old_data in evicted:
+                self._write_spill(old_key, old_data)
+
+    def _read_spill(self, key: tuple) -> Optional[bytes]:
+        filename = self._spill_file(key)
+        try:
+            with open(filename, mode='rb') as infile:
+                data = infile.read()
+            # mark the file as recently used
+            os.utime(filename)
+            return data
+        except OSError:
+            return None
+
+    def _write_spill(self, key: tuple, data: bytes) -> None:
+        if not self.max_disk or len(data) > self.max_disk:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            filename = self._spill_file(key)
+            if os.path.exists(filename):
+                os.utime(filename)
+                return
+            tmpfd, tmpname = tempfile.mkstemp(dir=self.directory)
+            with os.fdopen(tmpfd, mode='wb') as outfile:
+                outfile.write(data)
+            os.replace(tmpname, filename)
+            # remove the least recently used files, if the disk limit is exceeded
+            files = sorted((entry for entry in os.scandir(self.directory) if entry.name.endswith('.pickle')),
+                           key=lambda x: x.stat().st_mtime, reverse=True)
+            size = 0
+            for entry in files:
+                size += entry.stat().st_size
+                if size > self.max_disk:
+                    os.remove(entry.path)
+        except OSError as ex:
+            self.log.debug(f"MissionCache: Can't spill mission to disk: {ex}")
+
 
 class MizFile:
+    _cache: Optional[MissionCache] = None
 
     def __init__(self, filename: str):
         from core.services.registry import ServiceRegistry
@@ -28,33 +163,83 @@ class MizFile:
 
         self.log = logging.getLogger(__name__)
         self.filename = filename
-        self.mission: dict = {}
-        self.options: dict = {}
-        self.warehouses: dict = {}
-        self._load()
+        # the mission is only parsed, when it is accessed first
+        self._sections: Optional[dict] = None
         self._files: list[dict] = []
         self.node = ServiceRegistry.get(ServiceBus).node
 
-    def _load(self):
+    @property
+    def cache(self) -> MissionCache:
+        if not MizFile._cache:
+            config = self.node.locals.get('mission_cache', {})
+            MizFile._cache = MissionCache(memory=config.get('memory', 256), disk=config.get('disk', 0))
+        return MizFile._cache
+
+    def load(self) -> None:
+        """Parses the mission, if not done already. Raises UnsupportedMizFileException, if that is not possible."""
+        if self._sections is not None:
+            return
+        sections = self.cache.get(self.filename)
+        if sections is None:
+            sections = self._load()
+            self.cache.put(self.filename, sections)
+        self._sections = sections
+
+    def _load(self) -> dict:
+        sections = {}
         try:
             with zipfile.ZipFile(self.filename, 'r') as miz:
-                with miz.open('mission') as mission:
-                    self.mission = luadata.unserialize(io.TextIOWrapper(mission, encoding='utf-8').read(), 'utf-8')
-                try:
-                    with miz.open('options') as options:
-                        self.options = luadata.unserialize(io.TextIOWrapper(options, encoding='utf-8').read(), 'utf-8')
-                except FileNotFoundError:
-                    pass
-                try:
-                    with miz.open('warehouses') as warehouses:
-                        self.warehouses = luadata.unserialize(io.TextIOWrapper(warehouses, encoding='utf-8').read(),
-                                                              'utf-8')
-                except FileNotFoundError:
-                    pass
+                for name in SECTIONS:
+                    try:
+                        with miz.open(name) as infile:
+                            sections[name] = luadata.unserialize(io.TextIOWrapper(infile, encoding='utf-8').read(),
+                                                                 'utf-8')
+                    except KeyError:
+                        if name == 'mission':
+                            raise
+                        sections[name] = {}
+            return sections
         except Exception:
             self.log.warning(f"Error while processing mission {self.filename}", exc_info=True)
             raise UnsupportedMizFileException(self.filename)
 
+    def _peek(self, name: str) -> Optional[bytes]:
+        """Reads a top-level value from the mission file without parsing the whole mission."""
+        if self._sections is not None:
+            return None
+        try:
+            with zipfile.ZipFile(self.filename, 'r') as miz:
+                with miz.open('mission') as infile:
+                    # decompress the mission in chunks, until the value is found
+                    rest = b''
+                    while True:
+                        chunk = infile.read(PEEK_CHUNK_SIZE)
+                        data = rest + chunk
+                        # only search complete lines, the rest goes into the next chunk
+                        end = data.rfind(b'\n') + 1 if chunk else len(data)
+                        match = _PEEK[name].search(data, 0, end)
+                        if match or not chunk:
+                            return match.group(1) if match else None
+                        rest = data[end:]
+        except Exception:
+            # let the full load report the error
+            return None
+
+    @property
+    def mission(self) -> dict:
+        self.load()
+        return self._sections['mission']
+
+    @property
+    def options(self) -> dict:
+        self.load()
+        return self._sections['options']
+
+    @property
+    def warehouses(self) -> dict:
+        self.load()
+        return self._sections['warehouses']
+
     def save(self, new_filename: Optional[str] = None):
         tmpfd, tmpname = tempfile.mkstemp(dir=os.path.dirname(self.filename))
         os.close(tmpfd)
@@ -71,15 +256,12 @@ class MizFile:
                                 utils.make_unix_filename(item['target'], x) for x in utils.list_all_files(item['source'])
                             ])
                     for item in zin.infolist():
-                        if item.filename == 'mission':
-                            zout.writestr(item, "mission = " + luadata.serialize(self.mission, 'utf-8', indent='\t',
-                                                                                 indent_level=0))
-                        elif item.filename == 'options':
-                            zout.writestr(item, "options = " + luadata.serialize(self.options, 'utf-8', indent='\t',
-                                                                                 indent_level=0))
-                        elif item.filename == 'warehouses':
-                            zout.writestr(item, "warehouses = " + luadata.serialize(self.warehouses, 'utf-8', indent='\t',
-                                                                                    indent_level=0))
+                        if item.filename in SECTIONS:
+                            # stream the data into the archive, without building the whole file in memory
+                            with zout.open(item, 'w') as outfile:
+                                outfile.write(f"{item.filename} = ".encode('utf-8'))
+                                luadata.dump(getattr(self, item.filename), outfile, 'utf-8', indent='\t',
+                                             indent_level=0)
                         elif item.filename not in filenames:
                             zout.writestr(item, zin.read(item.filename))
                     for item in self._files:
@@ -101,10 +283,14 @@ class MizFile:
                 if new_filename and new_filename != self.filename:
                     shutil.copy2(tmpname, new_filename)
                 else:
+                    new_filename = self.filename
                     shutil.copy2(tmpname, self.filename)
             except PermissionError as ex:
                 self.log.error(f"Can't write new mission file: {ex}")
                 raise
+            # the new mission does not need to be parsed again, if no other files were added
+            if not self._files and self._sections is not None:
+                self.cache.put(new_filename, self._sections)
         finally:
             os.remove(tmpname)
 
@@ -139,10 +325,16 @@ class MizFile:
 
     @property
     def theatre(self) -> str:
+        value = self._peek('theatre')
+        if value is not None:
+            return value.decode('utf-8')
         return self.mission['theatre']
 
     @property
     def start_time(self) -> int:
+        value = self._peek('start_time')
+        if value is not None:
+            return int(value)
         return self.mission['start_time']
 
     @start_time.setter
@@ -560,6 +752,49 @@ class MizFile:
                 process_elements(reference, **kwargs)
 
 
+class MissionPipeline:
+    """
+    A mission that is changed by several extensions before it is loaded.
+    The mission is parsed once, all extensions change the same MizFile and it is written once at the end.
+    Extensions that need the mission on disk (e.g. to run external tools) call get_filename(), which writes all changes
+    so far, and set_filename() with the result.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        # the mission has been changed in memory, but not written yet
+        self.dirty = False
+        self._miz: Optional[MizFile] = None
+
+    async def get_miz(self) -> MizFile:
+        if not self._miz:
+            miz = MizFile(self.filename)
+            with PerformanceLog(f"MissionPipeline: parse {os.path.basename(self.filename)}"):
+                await asyncio.to_thread(miz.load)
+            self._miz = miz
+        return self._miz
+
+    async def get_filename(self) -> str:
+        await self.save()
+        return self.filename
+
+    def set_filename(self, filename: str, miz: Optional[MizFile] = None) -> None:
+        """The mission was changed on disk. A MizFile of the new file can be passed, if it is parsed already."""
+        self.filename = filename
+        self.dirty = False
+        self._miz = miz
+
+    async def save(self) -> str:
+        """Writes all changes into a writable mission and returns its filename."""
+        if self.dirty:
+            new_filename = utils.create_writable_mission(self.filename)
+            with PerformanceLog(f"MissionPipeline: save {os.path.basename(new_filename)}"):
+                await asyncio.to_thread(self._miz.save, new_filename)
+            self._miz.filename = self.filename = new_filename
+            self.dirty = False
+        return self.filename
+
+
 class UnsupportedMizFileException(Exception):
     def __init__(self, mizfile: str, message: Optional[str] = None):
         if not message:
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import asyncio
 import discord.errors
 import inspect
 import json
@@ -10,8 +9,8 @@ import psycopg
 import shutil
 import sqlparse
 import sys
+import time
 
-from copy import deepcopy
 from core import utils
 from core.services.registry import ServiceRegistry
 from discord import app_commands, Interaction
@@ -37,6 +36,8 @@ if TYPE_CHECKING:
     from services.bot import DCSServerBot
 
 BACKUP_FOLDER = 'config/backup/{}'
+# seconds between the checks for changes of the plugin configuration file
+CONFIG_CHECK_INTERVAL = 10
 
 __all__ = [
     "BACKUP_FOLDER",
@@ -242,10 +243,13 @@ class Plugin(commands.Cog, Generic[TEventListener]):
         self.pool = self.bot.pool
         self.apool = self.bot.apool
         self.loop = self.bot.loop
+        self._config_file: Optional[str] = None
+        self._config_mtime = 0.0
+        self._config_checked = time.monotonic()
         self.locals = self.read_locals()
         if self.plugin_name != 'commands' and 'commands' in self.locals:
             self.change_commands(self.locals['commands'], {x.name: x for x in self.get_app_commands()})
-        self._config = dict[str, dict]()
+        self._config: dict[Optional[tuple[str, str]], tuple[Optional[tuple[str, str]], dict]] = {}
         self.eventlistener: TEventListener = eventlistener(self) if eventlistener else None
         self.wait_for_on_ready.start()
 
@@ -431,66 +435,102 @@ class Plugin(commands.Cog, Generic[TEventListener]):
                 schema_files.append('schemas/commands_schema.yaml')
                 utils.validate(filename, schema_files, raise_exception=(validation == 'strict'))
 
+            self._config_file = filename
+            self._config_mtime = os.path.getmtime(filename)
             return yaml.load(Path(filename).read_text(encoding='utf-8'))
         except MarkedYAMLError as ex:
             raise YAMLError(filename, ex)
 
+    def _check_config_file(self) -> None:
+        # re-read the configuration if the file has changed on disk
+        now = time.monotonic()
+        if not self._config_file or now - self._config_checked < CONFIG_CHECK_INTERVAL:
+            return
+        self._config_checked = now
+        try:
+            mtime = os.path.getmtime(self._config_file)
+        except OSError:
+            return
+        if mtime == self._config_mtime:
+            return
+        self.log.info(f"  => {self.plugin_name.title()}: {self._config_file} changed, reloading the configuration ...")
+        try:
+            self.locals = self.read_locals()
+        except Exception as ex:
+            self.log.error(f"  => {self.plugin_name.title()}: configuration not reloaded: {ex}")
+            self._config_mtime = mtime
+        self._config.clear()
+
+    @staticmethod
+    def _get_mission_context(server: Server) -> Optional[tuple[str, str]]:
+        if server.current_mission:
+            return server.current_mission.map, server.current_mission.name
+        return None
+
     # get default and specific configs to be merged in derived implementations
     def get_base_config(self, server: Server) -> tuple[Optional[dict], Optional[dict]]:
-        def get_theatre() -> Optional[str]:
-            if server.current_mission:
-                return server.current_mission.map
-            else:
-                return asyncio.run(server.get_current_mission_theatre())
-
-        def get_mission() -> Optional[str]:
-            if server.current_mission:
-                return server.current_mission.name
-            else:
-                return os.path.basename(asyncio.run(server.get_current_mission_file()))[:-4]
+        """
+        Returns (shallow) copies of the default and the instance specific configuration, with the terrain and mission
+        specific sections of the currently running mission applied.
+        If no mission is loaded, these sections are ignored, as we do not want to read the mission file here.
+        """
+        context = self._get_mission_context(server)
 
         def filter_element(element: dict) -> dict:
-            full = deepcopy(element)
+            full = dict(element)
             if 'terrains' in element:
-                theatre = get_theatre()
-                if not theatre:
-                    return full
                 del full['terrains']
+                if not context:
+                    return full
                 for _theatre in element['terrains'].keys():
-                    if theatre.casefold() == _theatre.casefold():
+                    if context[0].casefold() == _theatre.casefold():
                         return full | element['terrains'][_theatre]
                 return full
             elif 'missions' in element:
-                mission = get_mission()
-                if not mission:
-                    return full
                 del full['missions']
+                if not context:
+                    return full
                 for _mission in element['missions'].keys():
-                    if mission.casefold() == _mission.casefold():
+                    if context[1].casefold() == _mission.casefold():
                         return full | element['missions'][_mission]
                 return full
             else:
-                return element
+                return full
 
-        default = deepcopy(filter_element(self.locals.get(DEFAULT_TAG, {})))
-        specific = deepcopy(filter_element(self.locals.get(server.node.name, self.locals).get(server.instance.name, {})))
+        default = filter_element(self.locals.get(DEFAULT_TAG, {}))
+        specific = filter_element(self.locals.get(server.node.name, self.locals).get(server.instance.name, {}))
         return default, specific
 
+    def build_config(self, server: Server) -> dict:
+        """
+        Merges the configuration for a server. Overwrite this in your plugin, if you need a special merge logic.
+        """
+        default, specific = self.get_base_config(server)
+        return default | specific
+
     def get_config(self, server: Optional[Server] = None, *, plugin_name: Optional[str] = None,
                    use_cache: Optional[bool] = True) -> dict:
+        """
+        Returns the configuration of this plugin for a server. The configuration is cached per node, instance and
+        mission (theatre and name) and is read-only. Use copy() or deepcopy(), if you need to change it.
+        """
         # retrieve the config from another plugin
         if plugin_name:
             for plugin in self.bot.cogs.values():  # type: Plugin
                 if plugin.plugin_name == plugin_name:
                     return plugin.get_config(server, use_cache=use_cache)
+        self._check_config_file()
         if not server:
-            return self.locals.get(DEFAULT_TAG, {})
-        if server.node.name not in self._config:
-            self._config[server.node.name] = {}
-        if server.instance.name not in self._config[server.node.name] or not use_cache:
-            default, specific = self.get_base_config(server)
-            self._config[server.node.name][server.instance.name] = default | specific
-        return self._config[server.node.name][server.instance.name]
+            key = context = None
+        else:
+            key = (server.node.name, server.instance.name)
+            context = self._get_mission_context(server)
+        entry = self._config.get(key)
+        # if no mission is loaded, we keep the configuration of the last mission
+        if not entry or not use_cache or (context and entry[0] != context):
+            config = self.build_config(server) if server else self.locals.get(DEFAULT_TAG, {})
+            entry = self._config[key] = (context, utils.make_readonly(config))
+        return entry[1]
 
     async def rename(self, conn: psycopg.AsyncConnection, old_name: str, new_name: str) -> None:
         # this function has to be implemented in your own plugins, if a server rename takes place
@@ -1,51 +1,146 @@
 import asyncio
+import json
 import psycopg
 
 from contextlib import suppress
-from typing import Callable
+from psycopg import sql
+from typing import Callable, Optional
 
 from core.data.impl.nodeimpl import NodeImpl
 
+# PostgreSQL rejects NOTIFY payloads of 8000 bytes or more
+MAX_NOTIFY_PAYLOAD = 7999
+# maximum number of messages that are written in one round trip
+MAX_BATCH_SIZE = 100
+# fallback read interval, in case a notification got lost
+READ_INTERVAL = 60.0
+
 
 class PubSub:
 
-    def __init__(self, node: NodeImpl, name: str, url: str, handler: Callable):
+    def __init__(self, node: NodeImpl, name: str, url: str, handler: Callable, *, inline: bool = False):
         self.node = node
         self.name = name
         self.log = node.log
         self.url = url
         self.handler = handler
+        # if inline is set, small messages are delivered as NOTIFY payloads, without touching the table
+        self.inline = inline
+        self._sequence = 0
         self.read_queue = asyncio.Queue()
         self.write_queue = asyncio.Queue()
         self._stop_event = asyncio.Event()
         self.read_worker = asyncio.create_task(self._process_read())
         self.write_worker = asyncio.create_task(self._process_write())
 
+    def _inline_payload(self, message: dict) -> Optional[str]:
+        if not self.inline:
+            return None
+        self._sequence += 1
+        payload = json.dumps({
+            "guild_id": message['guild_id'],
+            "node": message['node'],
+            "data": message['data'].obj,
+            # PostgreSQL folds identical notifications of one transaction
+            "seq": self._sequence
+        })
+        if len(payload.encode('utf-8')) > MAX_NOTIFY_PAYLOAD:
+            return None
+        return payload
+
+    async def _get_inline_receivers(self, conn: psycopg.AsyncConnection, nodes: set[str]) -> set[str]:
+        """
+        Returns the nodes that are listening and have no messages waiting in the table. Messages to any other node are
+        written to the table, as a notification would get lost or overtake the stored messages.
+        """
+        cursor = await conn.execute(sql.SQL("""
+            SELECT r.node FROM unnest(%(nodes)s::TEXT[]) AS r(node)
+            WHERE EXISTS (
+                SELECT 1 FROM pg_stat_activity a
+                WHERE a.application_name IN (%(prefix)s || r.node, %(prefix)s || r.node || ':Master')
+                OR (r.node = 'Master' AND a.application_name LIKE %(prefix)s || '%%:Master')
+            )
+            AND NOT EXISTS (SELECT 1 FROM {} t WHERE t.guild_id = %(guild_id)s AND t.node = r.node)
+        """).format(sql.Identifier(self.name)), {
+            "nodes": list(nodes),
+            "prefix": f"{self.name}:",
+            "guild_id": self.node.guild_id
+        })
+        return {row[0] async for row in cursor}
+
+    async def _write_batch(self, conn: psycopg.AsyncConnection, messages: list[dict]):
+        payloads = [self._inline_payload(x) for x in messages]
+        receivers = {x['node'] for x, payload in zip(messages, payloads) if payload}
+        if receivers:
+            receivers = await self._get_inline_receivers(conn, receivers)
+        # keep the order of the messages: consecutive rows are inserted at once, notifications in between
+        statements: list[tuple[sql.Composable, list]] = []
+        rows = []
+        for message, payload in zip(messages, payloads):
+            if payload and message['node'] in receivers:
+                if rows:
+                    statements.append(self._insert(rows))
+                    rows = []
+                statements.append((sql.SQL("SELECT pg_notify(%s, %s)"), [self.name, payload]))
+            else:
+                rows.append(message)
+                # everything that follows has to wait for the stored message
+                receivers.discard(message['node'])
+        if rows:
+            statements.append(self._insert(rows))
+        # send the whole batch in one round trip
+        async with conn.pipeline():
+            for query, params in statements:
+                await conn.execute(query, params)
+
+    def _insert(self, rows: list[dict]) -> tuple[sql.Composable, list]:
+        query = sql.SQL("INSERT INTO {} (guild_id, node, data) VALUES {}").format(
+            sql.Identifier(self.name),
+            sql.SQL(', ').join(sql.SQL("(%s, %s, %s)") for _ in rows)
+        )
+        return query, [x for row in rows for x in (row['guild_id'], row['node'], row['data'])]
+
+    async def _write(self, conn: psycopg.AsyncConnection, messages: list[dict]):
+        try:
+            await self._write_batch(conn, messages)
+        except psycopg.OperationalError:
+            raise
+        except psycopg.Error as ex:
+            if len(messages) == 1:
+                self.log.error(f"{self.name.title()}: message to {messages[0]['node']} can't be sent: {ex}")
+                return
+            # the statements of a pipeline run in one transaction, so nothing was sent
+            for message in messages:
+                await self._write(conn, [message])
+
     async def _process_write(self):
         await asyncio.sleep(1)  # Ensure the rest of __init__ has finished
         while not self._stop_event.is_set():
             with suppress(psycopg.OperationalError):
                 async with await psycopg.AsyncConnection.connect(self.url, autocommit=True) as conn:
                     while not self._stop_event.is_set():
-                        message = await self.write_queue.get()
-                        if not message:
-                            return
+                        messages = [await self.write_queue.get()]
+                        # collect everything that queued up meanwhile into one batch
+                        while len(messages) < MAX_BATCH_SIZE and not self.write_queue.empty():
+                            messages.append(self.write_queue.get_nowait())
+                        batch = [x for x in messages if x]
                         try:
-                            await conn.execute(f"""
-                                INSERT INTO {self.name} (guild_id, node, data) 
-                                VALUES (%(guild_id)s, %(node)s, %(data)s)
-                            """, message)
+                            if batch:
+                                await self._write(conn, batch)
                         finally:
-                            # Notify the queue that the message has been processed.
-                            self.write_queue.task_done()
+                            # Notify the queue that the messages have been processed.
+                            for _ in messages:
+                                self.write_queue.task_done()
+                        if len(batch) != len(messages):
+                            return
 
     async def _process_read(self):
         async def do_read():
             ids_to_delete = []
             cursor = await conn.execute(f"""
-                SELECT id, data 
-                FROM {self.name} 
-                WHERE guild_id = %(guild_id)s AND node = %(node)s 
+                SELECT id, data
+                FROM {self.name}
+                WHERE guild_id = %(guild_id)s AND node = %(node)s
                 ORDER BY id
             """, {
                 'guild_id': self.node.guild_id,
@@ -68,10 +163,15 @@ class PubSub:
                 async with await psycopg.AsyncConnection.connect(self.url, autocommit=True) as conn:
                     while not self._stop_event.is_set():
                         try:
-                            # we will read every 5s independent if there is data in the queue or not
-                            if not await asyncio.wait_for(self.read_queue.get(), timeout=5.0):
+                            # the table is read on notifications only, the timeout is just a safety net
+                            if not await asyncio.wait_for(self.read_queue.get(), timeout=READ_INTERVAL):
                                 return
                             try:
+                                # multiple wake-ups are served by a single read
+                                while not self.read_queue.empty():
+                                    if not self.read_queue.get_nowait():
+                                        return
+                                    self.read_queue.task_done()
                                 await do_read()
                             finally:
                                 # Notify the queue that the message has been processed.
@@ -79,21 +179,38 @@ class PubSub:
                         except (TimeoutError, asyncio.TimeoutError):
                             await do_read()
 
+    def _is_receiver(self, node: str) -> bool:
+        return node == self.node.name or (self.node.master and node == 'Master')
+
     async def subscribe(self):
         while not self._stop_event.is_set():
             with suppress(psycopg.OperationalError):
-                async with await psycopg.AsyncConnection.connect(self.url, autocommit=True) as conn:
+                # the name tells the senders of inline messages, that we are listening
+                application_name = f"{self.name}:{self.node.name}" + (":Master" if self.node.master else "")
+                async with await psycopg.AsyncConnection.connect(self.url, autocommit=True,
+                                                                 application_name=application_name) as conn:
                     async with conn.cursor() as cursor:
-                        # preprocess all rows that might be there
                         await cursor.execute(f"LISTEN {self.name}")
+                        # process all rows that might have been stored while we were not listening
+                        self.read_queue.put_nowait(self.node.name)
                         gen = conn.notifies()
                         async for n in gen:
                             if self._stop_event.is_set():
                                 self.log.debug(f'- {self.name.title()} stopped.')
                                 await gen.aclose()
                                 return
-                            node = n.payload
-                            if node == self.node.name or (self.node.master and node == 'Master'):
+                            if n.payload.startswith('{'):
+                                # inline message, no need to read the table
+                                try:
+                                    message = json.loads(n.payload)
+                                except json.JSONDecodeError:
+                                    self.log.warning(f"Invalid inline message received on {self.name} - ignoring.")
+                                    continue
+                                if (message.get('guild_id') == self.node.guild_id and
+                                        self._is_receiver(message.get('node'))):
+                                    # noinspection PyAsyncCall
+                                    asyncio.create_task(self.handler(message['data']))
+                            elif self._is_receiver(n.payload):
                                 self.read_queue.put_nowait(n.payload)
             await asyncio.sleep(1)
 
@@ -107,7 +224,7 @@ class PubSub:
                 await conn.set_autocommit(True)
                 if self.node.master:
                     await conn.execute(f"""
-                        DELETE FROM {self.name} 
+                        DELETE FROM {self.name}
                         WHERE time < ((now() AT TIME ZONE 'utc') - interval '300 seconds')
                     """)
                     await conn.execute(f"UPDATE {self.name} SET node = 'Master' WHERE node = %s", (self.node.name, ))
@@ -1,4 +1,5 @@
 from core.report.env import *
 from core.report.elements import *
+from core.report.renderer import *
 from core.report.errors import *
 from core.report.base import *
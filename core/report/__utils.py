@@ -1,14 +1,49 @@
 import asyncio
+import inspect
+import sys
+
 from core import utils, Status
 from core.report.errors import ValueNotInRange
 from psycopg.rows import dict_row
-from typing import Any
+from typing import Any, Callable, Optional
 
 __all__ = [
     "parse_params",
-    "parse_input"
+    "parse_input",
+    "get_element_class",
+    "get_parameters"
 ]
 
+# resolved element classes and their parameters, shared by all reports
+_classes: dict[tuple[str, bool], type] = {}
+_parameters: dict[Callable, frozenset[str]] = {}
+
+
+def get_element_class(name: str, builtin: bool = False) -> Optional[type]:
+    """
+    Returns the class of a report element, either by its full name ("class") or as one of the
+    elements of core.report.elements ("type").
+    """
+    element_class = _classes.get((name, builtin))
+    if not element_class:
+        if builtin:
+            element_class = getattr(sys.modules['core.report.elements'], name, None)
+        else:
+            element_class = utils.str_to_class(name)
+        # classes that can't be found (yet) are not cached
+        if element_class:
+            _classes[(name, builtin)] = element_class
+    return element_class
+
+
+def get_parameters(method: Callable) -> frozenset[str]:
+    """Returns the parameter names of a function or method."""
+    func = getattr(method, '__func__', method)
+    parameters = _parameters.get(func)
+    if parameters is None:
+        parameters = _parameters[func] = frozenset(inspect.signature(method).parameters.keys())
+    return parameters
+
 
 def parse_params(kwargs: dict, params: tuple[dict, list]):
     new_args = kwargs.copy()
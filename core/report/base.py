@@ -2,15 +2,14 @@ from __future__ import annotations
 
 import asyncio
 import discord
-import inspect
 import json
 import logging
 import os
 import psycopg
-import sys
 
 from abc import ABC, abstractmethod
 from core import utils, Channel
+from core.utils.performance import PerformanceLog
 from discord import Interaction, SelectOption
 from discord.ui import View, Button, Select, Item
 from discord.utils import MISSING
@@ -19,7 +18,7 @@ from typing import Optional, TYPE_CHECKING, Any, cast, Union
 from .elements import ReportElement
 from .env import ReportEnv
 from .errors import UnknownReportElement, ClassNotFound
-from .__utils import parse_input, parse_params
+from .__utils import parse_input, parse_params, get_element_class, get_parameters
 
 if TYPE_CHECKING:
     from core import Server
@@ -32,6 +31,58 @@ __all__ = [
     "PersistentReport"
 ]
 
+# parsed report definitions with their includes resolved, shared by all reports
+# (plugin, filename) => (path, report definition, {path of each file read: its modification time})
+_report_defs: dict[tuple[str, str], tuple[str, dict, dict[str, Optional[int]]]] = {}
+
+
+def _get_mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _read_report_def(plugin: str, filename: str, files: dict[str, Optional[int]]) -> tuple[str, dict]:
+    default = f'./plugins/{plugin}/reports/{filename}'
+    overwrite = f'./reports/{plugin}/{filename}'
+    # an overwrite that is created later on has to be recognized as well
+    files[overwrite] = _get_mtime(overwrite)
+    if files[overwrite] is not None:
+        filename = overwrite
+    elif os.path.exists(default):
+        filename = default
+        files[default] = _get_mtime(default)
+    else:
+        raise FileNotFoundError(filename)
+    with open(filename, mode='r', encoding='utf-8') as file:
+        report_def = json.load(file)
+    if 'include' in report_def:
+        report_def |= _read_report_def(report_def['include'].get('plugin', plugin),
+                                       report_def['include']['filename'], files)[1]
+    else:
+        for idx, element in enumerate(report_def.get('elements', [])):
+            if 'include' in element:
+                report_def['elements'][idx] = (
+                    _read_report_def(element['include'].get('plugin', plugin), element['include']['filename'], files)
+                )[1]
+    return filename, report_def
+
+
+def get_report_def(plugin: str, filename: str) -> tuple[str, dict]:
+    """
+    Returns the path and the (read-only) definition of a report.
+    Reports are only read again, if any of their files (including the includes) changed.
+    """
+    entry = _report_defs.get((plugin, filename))
+    if entry and all(_get_mtime(path) == mtime for path, mtime in entry[2].items()):
+        return entry[0], entry[1]
+    files = {}
+    path, report_def = _read_report_def(plugin, filename, files)
+    report_def = utils.make_readonly(report_def)
+    _report_defs[(plugin, filename)] = (path, report_def, files)
+    return path, report_def
+
 
 class Report:
 
@@ -43,26 +94,7 @@ class Report:
         self.filename, self.report_def = self.load_report_def(plugin, filename)
 
     def load_report_def(self, plugin: str, filename: str):
-        default = f'./plugins/{plugin}/reports/{filename}'
-        overwrite = f'./reports/{plugin}/{filename}'
-        if os.path.exists(overwrite):
-            filename = overwrite
-        elif os.path.exists(default):
-            filename = default
-        else:
-            raise FileNotFoundError(filename)
-        with open(filename, mode='r', encoding='utf-8') as file:
-            report_def = json.load(file)
-        if 'include' in report_def:
-            report_def |= self.load_report_def(report_def['include'].get('plugin', plugin),
-                                               report_def['include']['filename'])[1]
-        else:
-            for idx, element in enumerate(report_def.get('elements', [])):
-                if 'include' in element:
-                    report_def['elements'][idx] = (
-                        self.load_report_def(element['include'].get('plugin', plugin), element['include']['filename'])
-                    )[1]
-        return filename, report_def
+        return get_report_def(plugin, filename)
 
     async def render(self, *args, **kwargs) -> ReportEnv:
         # Cache the `report_def` locally for faster lookups and readability
@@ -111,18 +143,55 @@ class Report:
 
         # Handle the 'elements' section
         if elements := report_def.get('elements'):
-            for element in elements:
-                await self._process_element(element, env.params)
+            await self._process_elements(elements, env.params)
 
         return env
 
-    async def _process_element(self, element, params):
+    async def _process_elements(self, elements, params):
         """
-        Helper function to process individual elements sequentially.
+        Helper function to process the elements in order.
+        Consecutive elements that are marked as concurrent do not depend on each other and are rendered at the same
+        time. All other elements wait for the elements before them.
+        """
+        batch = []
+        for element in elements:
+            # Resolve the element's class and arguments
+            element_class, element_args = self._resolve_element_class_and_args(element, params)
+            if getattr(element_class, 'concurrent', False):
+                batch.append((element, element_class, element_args))
+                continue
+            await self._process_batch(batch)
+            batch = []
+            await self._process_element(element, element_class, element_args)
+        await self._process_batch(batch)
+
+    async def _process_batch(self, batch):
+        """
+        Helper function to render concurrent elements at the same time.
+        Each element gets an embed of its own, which fields are added to the report in the order of the elements.
+        """
+        if len(batch) < 2:
+            for element, element_class, element_args in batch:
+                await self._process_element(element, element_class, element_args)
+            return
+        embeds = [discord.Embed() for _ in batch]
+        results = await asyncio.gather(*[
+            self._process_element(element, element_class, element_args, embed=embed)
+            for (element, element_class, element_args), embed in zip(batch, embeds)
+        ], return_exceptions=True)
+        for embed, result in zip(embeds, results):
+            # raise the first error, like it would have happened, if the elements were processed one by one
+            if isinstance(result, BaseException):
+                raise result
+            for field in embed.fields:
+                if len(self.env.embed.fields) >= 25:
+                    return
+                self.env.embed.add_field(name=field.name, value=field.value, inline=field.inline)
+
+    async def _process_element(self, element, element_class, element_args, embed: Optional[discord.Embed] = None):
+        """
+        Helper function to process an individual element.
         """
-        # Resolve the element's class and arguments
-        element_class, element_args = self._resolve_element_class_and_args(element, params)
-
         if not element_class:
             return  # Skip if the class couldn't be resolved
 
@@ -132,13 +201,16 @@ class Report:
 
         if not isinstance(instance, ReportElement):
             raise UnknownReportElement(element.get('class', str(element)))
+        if embed is not None:
+            instance.embed = embed
 
         # Filter arguments for the render method
         render_args = self._filter_args(element_args, instance.render)
 
         # Render the element and handle exceptions
         try:
-            await instance.render(**render_args)
+            with PerformanceLog(f"Report {os.path.basename(self.filename)}: {element_class.__name__}"):
+                await instance.render(**render_args)
         except (TimeoutError, asyncio.TimeoutError):
             self.log.error(f"Timeout while processing report {self.filename}! Some elements might be empty.")
         except psycopg.OperationalError:
@@ -159,13 +231,9 @@ class Report:
 
             # Dynamically retrieve the class instance
             if class_name:
-                element_class = (
-                    utils.str_to_class(class_name)
-                    if 'class' in element
-                    else getattr(sys.modules['core.report.elements'], class_name, None)
-                )
+                element_class = get_element_class(class_name, builtin='class' not in element)
         elif isinstance(element, str):
-            element_class = getattr(sys.modules['core.report.elements'], element, None)
+            element_class = get_element_class(element, builtin=True)
             element_args = params.copy()
         else:
             raise UnknownReportElement(str(element))
@@ -179,7 +247,7 @@ class Report:
         """
         Filters arguments based on a method's signature, ensuring compatibility.
         """
-        signature = inspect.signature(method).parameters
+        signature = get_parameters(method)
         return {name: value for name, value in args.items() if name in signature}
 
 
@@ -2,13 +2,9 @@ from __future__ import annotations
 
 import asyncio
 import discord
-import inspect
 import numpy as np
 import os
-import re
-import sys
 import uuid
-import warnings
 
 from abc import ABC, abstractmethod
 from core import utils
@@ -16,12 +12,14 @@ from datetime import timedelta, datetime
 from discord import ButtonStyle, Interaction
 from io import BytesIO
 from matplotlib import pyplot as plt
+from matplotlib.figure import Figure
 from psycopg.rows import dict_row
 from typing import Optional, Any, TYPE_CHECKING, Union
 
 from .env import ReportEnv
+from .renderer import apply_style, render_figure
 from .errors import UnknownGraphElement, ClassNotFound, TooManyElements, UnknownValue, NothingToPlot
-from .__utils import parse_params
+from .__utils import parse_params, get_element_class, get_parameters
 
 
 if TYPE_CHECKING:
@@ -46,25 +44,10 @@ __all__ = [
     "SQLPieChart"
 ]
 
-_languages = None
-
-
-def get_supported_fonts() -> set[str]:
-    global _languages
-
-    if _languages is None:
-        _languages = set()
-        if os.path.exists('fonts'):
-            for filename in os.listdir('fonts'):
-                if filename.startswith("NotoSans"):
-                    match = re.search(r"NotoSans(..)-", filename)
-                    if match:
-                        lang = match.group(1)
-                        _languages.add(lang)
-    return _languages
-
-
 class ReportElement(ABC):
+    # Elements that only add fields to the embed and do not depend on other elements can be rendered concurrently.
+    concurrent: bool = False
+
     def __init__(self, env: ReportEnv):
         self.env = env
         self.bot: DCSServerBot = env.bot
@@ -122,18 +105,24 @@ class Image(EmbedElement):
 
 
 class Ruler(EmbedElement):
+    concurrent = True
+
     async def render(self, header: Optional[str] = '', ruler_length: Optional[int] = 34, *, text: Optional[str] = None):
         self.add_field(name=utils.print_ruler(header=header, ruler_length=ruler_length),
                        value=text or '_ _', inline=False)
 
 
 class Field(EmbedElement):
+    concurrent = True
+
     async def render(self, name: str, value: Any, inline: Optional[bool] = True, default: Optional[str] = '_ _'):
         self.add_field(name=utils.format_string(name, '_ _', **self.env.params),
                        value=utils.format_string(value, default, **self.env.params), inline=inline)
 
 
 class Table(EmbedElement):
+    concurrent = True
+
     async def render(self, values: Union[dict, list[dict]], obj: Optional[str] = None, inline: Optional[bool] = True,
                      ansi_colors: Optional[bool] = False):
         if obj:
@@ -208,28 +197,19 @@ class Graph(ReportElement):
     def __init__(self, env: ReportEnv):
         super().__init__(env)
         plt.switch_backend('agg')
-        self.plot_lock = asyncio.Lock()
-
-    def _plot(self):
-        plt.subplots_adjust(hspace=0.5, wspace=0.5)
-        self.env.filename = f'{uuid.uuid4()}.png'
-        self.env.buffer = BytesIO()
-        warnings.filterwarnings("ignore", category=UserWarning, message=".*Glyph.*")
-        self.env.figure.savefig(self.env.buffer, format='png', bbox_inches='tight', facecolor='#2C2F33')
-        self.env.buffer.seek(0)
 
     async def _async_plot(self):
-        async with self.plot_lock:
-            self._plot()
+        self.env.figure.subplots_adjust(hspace=0.5, wspace=0.5)
+        # the figure is drawn in another process, to not block the event loop
+        data = await render_figure(self.env.figure)
+        self.env.filename = f'{uuid.uuid4()}.png'
+        self.env.buffer = BytesIO(data)
 
     async def render(self, width: int, height: int, cols: int, rows: int, elements: list[dict],
                      facecolor: Optional[str] = None):
-        plt.style.use('dark_background')
-        plt.rcParams['axes.facecolor'] = '2C2F33'
-        fonts = get_supported_fonts()
-        if fonts:
-            plt.rcParams['font.family'] = [f"Noto Sans {x}" for x in fonts] + ['sans-serif']
-        self.env.figure = plt.figure(figsize=(width, height))
+        apply_style()
+        # the figure is not registered in pyplot, as multiple reports can be rendered at the same time
+        self.env.figure = Figure(figsize=(width, height))
         try:
             if facecolor:
                 self.env.figure.set_facecolor(facecolor)
@@ -239,18 +219,18 @@ class Graph(ReportElement):
                     element_args = parse_params(self.env.params, element['params'])
                 else:
                     element_args = self.env.params.copy()
-                element_class = utils.str_to_class(element['class']) if 'class' in element else None
+                element_class = get_element_class(element['class']) if 'class' in element else None
                 if not element_class and 'type' in element:
-                    element_class = getattr(sys.modules[__name__], element['type'])
+                    element_class = get_element_class(element['type'], builtin=True)
                 if element_class:
                     # remove parameters, that are not in the class __init__ signature
-                    signature = inspect.signature(element_class.__init__).parameters.keys()
+                    signature = get_parameters(element_class.__init__)
                     class_args = {name: value for name, value in element_args.items() if name in signature}
                     # instantiate the class
                     element_class = element_class(self.env, rows, cols, **class_args)
                     if isinstance(element_class, (GraphElement, MultiGraphElement)):
                         # remove parameters, that are not in the render methods signature
-                        signature = inspect.signature(element_class.render).parameters.keys()
+                        signature = get_parameters(element_class.render)
                         render_args = {name: value for name, value in element_args.items() if name in signature}
                         tasks.append(asyncio.create_task(element_class.render(**render_args)))
                     else:
@@ -273,9 +253,7 @@ class Graph(ReportElement):
                 footer += '\nClick on the image to zoom in.'
             self.env.embed.set_footer(text=footer)
         finally:
-            if self.env.figure:
-                plt.close(self.env.figure)
-                self.env.figure = None
+            self.env.figure = None
 
 
 def _display_no_data(element: EmbedElement, no_data: Union[str, dict], inline: bool):
@@ -287,6 +265,8 @@ def _display_no_data(element: EmbedElement, no_data: Union[str, dict], inline: b
 
 
 class SQLField(EmbedElement):
+    concurrent = True
+
     async def render(self, sql: str, inline: Optional[bool] = True, no_data: Optional[Union[str, dict]] = None,
                      on_error: Optional[dict] = None):
         try:
@@ -312,6 +292,8 @@ class SQLField(EmbedElement):
 
 
 class SQLTable(EmbedElement):
+    concurrent = True
+
     async def render(self, sql: str, inline: Optional[bool] = True, no_data: Optional[Union[str, dict]] = None,
                      ansi_colors: Optional[bool] = False, on_error: Optional[dict] = None):
         try:
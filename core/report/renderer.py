@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import pickle
+import sys
+import threading
+import warnings
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from rendering.worker import apply_style, init_worker, render, savefig
+from typing import Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+__all__ = [
+    "apply_style",
+    "render_figure"
+]
+
+logger = logging.getLogger(__name__)
+
+# do not use all cores, as the DCS servers usually run on the same machine
+MAX_WORKERS = min(os.cpu_count() or 1, 4)
+
+_executor: Optional[ProcessPoolExecutor] = None
+# fallback, if a figure can't be sent to the rendering processes
+_lock = threading.Lock()
+
+
+def _render_locally(figure: Figure) -> bytes:
+    with _lock, warnings.catch_warnings():
+        warnings.filterwarnings("ignore", category=UserWarning, message=".*Glyph.*")
+        return savefig(figure)
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+
+    if not _executor:
+        # spawn on every OS, forking the bot (with its threads and event loop) is not safe
+        _executor = ProcessPoolExecutor(max_workers=MAX_WORKERS, mp_context=multiprocessing.get_context('spawn'),
+                                        initializer=init_worker)
+    return _executor
+
+
+@contextmanager
+def _without_main():
+    # spawned processes would run the main script (run.py) again, which imports the whole bot, multiprocessing
+    # offers no other way to prevent that
+    main = sys.modules['__main__']
+    saved = {x: main.__dict__.pop(x) for x in ['__file__', '__spec__'] if x in main.__dict__}
+    main.__spec__ = None
+    try:
+        yield
+    finally:
+        main.__dict__.update(saved)
+
+
+async def render_figure(figure: Figure) -> bytes:
+    """
+    Renders a figure to PNG outside the event loop.
+    The figure is pickled and drawn in a pool of processes, so that independent reports are rendered in parallel.
+    Figures that can't be pickled are drawn in a thread instead.
+    """
+    global _executor
+
+    try:
+        data = await asyncio.to_thread(pickle.dumps, figure, pickle.HIGHEST_PROTOCOL)
+    except Exception as ex:
+        logger.debug(f"Figure can't be rendered in the process pool: {ex}")
+        return await asyncio.to_thread(_render_locally, figure)
+    executor = _get_executor()
+    try:
+        # the processes of the pool are started on submit
+        with _without_main():
+            future = asyncio.get_running_loop().run_in_executor(executor, render, data)
+        return await future
+    except BrokenProcessPool:
+        # another render might have replaced the pool already
+        if _executor is executor:
+            logger.warning("Rendering process died, restarting the process pool.")
+            executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+        return await asyncio.to_thread(_render_locally, figure)
@@ -1,10 +1,12 @@
 from core.utils.campaigns import *
 from core.utils.coalitions import *
 from core.utils.cpu import *
+from core.utils.database import *
 from core.utils.dcs import *
 from core.utils.discord import *
 from core.utils.helper import *
 from core.utils.mizedit import *
 from core.utils.os import *
 from core.utils.performance import *
+from core.utils.players import *
 from core.utils.validators import *
@@ -0,0 +1,130 @@
+# run from the root directory with: python -m core.utils.__test__
+import threading
+import unittest
+
+from core.utils import campaigns
+from core.utils.campaigns import CampaignCache, _Campaign
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+
+START = datetime(2024, 6, 1, 12, 0, 0)
+STOP = datetime(2024, 6, 30, 12, 0, 0)
+
+
+class TestCampaignCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = CampaignCache(max_age=300)
+        self.reads = 0
+        self.campaigns = [
+            _Campaign(1, 'June', START, STOP, ['Server A']),
+            _Campaign(2, 'Open End', STOP, None, ['Server A', 'Server B'])
+        ]
+        self.offset = 0.0
+        self.cache._read = self.read
+        self.now = START.replace(tzinfo=timezone.utc).timestamp()
+        # the cache and its background thread must see the same clock
+        clock = patch.object(campaigns, 'time', SimpleNamespace(time=lambda: self.now))
+        clock.start()
+        self.addCleanup(clock.stop)
+
+    def read(self, pool):
+        self.reads += 1
+        return list(self.campaigns), self.offset
+
+    @staticmethod
+    def wait():
+        # for the reloads in the background, which might start other ones
+        while threading.active_count() > 1:
+            for thread in threading.enumerate():
+                if thread is not threading.current_thread():
+                    thread.join()
+
+    def at(self, when: datetime):
+        self.now = when.replace(tzinfo=timezone.utc).timestamp()
+
+    def test_boundaries(self):
+        self.at(datetime(2024, 6, 1, 11, 59, 59))
+        self.assertEqual(self.cache.get_running(None, 'Server A'), (None, None))
+        self.at(START)
+        self.assertEqual(self.cache.get_running(None, 'Server A'), (1, 'June'))
+        self.at(datetime(2024, 6, 15))
+        self.assertEqual(self.cache.get_running(None, 'Server A'), (1, 'June'))
+        self.assertEqual(self.cache.get_running(None, 'Server B'), (None, None))
+        # both campaigns run at the stop time of the first one
+        self.at(STOP)
+        self.assertEqual(self.cache.get_running(None, 'Server A'), (None, None))
+        self.assertEqual(self.cache.get_running(None, 'Server B'), (2, 'Open End'))
+        self.at(datetime(2024, 6, 30, 12, 0, 1))
+        self.assertEqual(self.cache.get_running(None, 'Server A'), (2, 'Open End'))
+        self.assertEqual(self.cache.get_running(None, 'Server C'), (None, None))
+
+    def test_no_server(self):
+        self.at(datetime(2024, 6, 15))
+        self.assertEqual(self.cache.get_running(None), (1, 'June'))
+        self.at(STOP)
+        # more than one campaign is running
+        self.assertEqual(self.cache.get_running(None), (None, None))
+
+    def test_database_clock(self):
+        # the database is one minute ahead of us
+        self.offset = 60.0
+        self.at(datetime(2024, 6, 1, 11, 59, 30))
+        self.assertEqual(self.cache.get_running(None, 'Server A'), (1, 'June'))
+
+    def test_cached(self):
+        self.at(datetime(2024, 6, 15))
+        for _ in range(10):
+            self.cache.get_running(None, 'Server A')
+        self.assertEqual(self.reads, 1)
+
+    def test_invalidate(self):
+        self.at(datetime(2024, 6, 15))
+        self.assertEqual(self.cache.get_running(None, 'Server B'), (None, None))
+        self.campaigns.append(_Campaign(3, 'Server B', START, STOP, ['Server B']))
+        self.cache.invalidate()
+        self.wait()
+        self.assertEqual(self.reads, 2)
+        self.assertEqual(self.cache.get_running(None, 'Server B'), (3, 'Server B'))
+        self.assertEqual(self.reads, 2)
+
+    def test_invalidate_cold(self):
+        # nothing to reload, the first lookup loads the campaigns
+        self.cache.invalidate()
+        self.wait()
+        self.assertEqual(self.reads, 0)
+        self.at(datetime(2024, 6, 15))
+        self.assertEqual(self.cache.get_running(None, 'Server A'), (1, 'June'))
+        self.assertEqual(self.reads, 1)
+
+    def test_invalidate_during_load(self):
+        # the campaigns are changed while we read them, the outdated result is not kept
+        def read(pool):
+            ret = self.read(pool)
+            self.campaigns.append(_Campaign(3, 'Server B', START, STOP, ['Server B']))
+            self.cache._read = self.read
+            self.cache.invalidate()
+            return ret
+
+        self.at(datetime(2024, 6, 15))
+        self.cache.get_running(None, 'Server B')
+        self.cache._read = read
+        self.cache.invalidate()
+        self.wait()
+        self.assertEqual(self.reads, 3)
+        self.assertEqual(self.cache.get_running(None, 'Server B'), (3, 'Server B'))
+
+    def test_reload(self):
+        self.at(datetime(2024, 6, 15))
+        self.cache.get_running(None, 'Server B')
+        self.campaigns.append(_Campaign(3, 'Server B', START, STOP, ['Server B']))
+        self.at(datetime(2024, 6, 15, 0, 10))
+        # the old state is returned until the reload is done
+        self.assertEqual(self.cache.get_running(None, 'Server B'), (None, None))
+        self.cache._refresh(None)
+        self.assertEqual(self.cache.get_running(None, 'Server B'), (3, 'Server B'))
+
+
+if __name__ == '__main__':
+    unittest.main()
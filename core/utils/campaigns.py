@@ -1,15 +1,22 @@
 from __future__ import annotations
 import discord
-from contextlib import closing
+import logging
+import threading
+import time
+
+from datetime import datetime, timezone
 from typing import TYPE_CHECKING, Any, Optional
 from discord import app_commands
 from psycopg.rows import dict_row
 
 if TYPE_CHECKING:
     from core import Server
+    from psycopg_pool import ConnectionPool
     from services.bot import DCSServerBot
 
 __all__ = [
+    "CampaignCache",
+    "campaign_cache",
     "get_running_campaign",
     "get_all_campaigns",
     "get_campaign",
@@ -17,25 +24,122 @@ __all__ = [
 ]
 
 
-def get_running_campaign(bot: DCSServerBot, server: Optional[Server] = None) -> tuple[Any, Any]:
-    with bot.pool.connection() as conn:
-        with closing(conn.cursor()) as cursor:
-            if server:
-                cursor.execute("""
-                    SELECT id, name FROM campaigns c, campaigns_servers s 
-                    WHERE c.id = s.campaign_id AND s.server_name = %s 
-                    AND (now() AT TIME ZONE 'utc') BETWEEN c.start AND COALESCE(c.stop, now() AT TIME ZONE 'utc')
-                """, (server.name,))
-            else:
-                cursor.execute("""
-                    SELECT id, name FROM campaigns
-                    WHERE (now() AT TIME ZONE 'utc') BETWEEN start AND COALESCE(stop, now() AT TIME ZONE 'utc')
+logger = logging.getLogger(__name__)
+
+
+class _Campaign:
+    __slots__ = ('id', 'name', 'start', 'stop', 'servers')
+
+    def __init__(self, id: int, name: str, start: datetime, stop: Optional[datetime], servers: list[str]):
+        self.id = id
+        self.name = name
+        self.start = start
+        self.stop = stop
+        self.servers = frozenset(servers)
+
+    def is_running(self, now: datetime) -> bool:
+        return self.start <= now and (self.stop is None or now <= self.stop)
+
+
+class CampaignCache:
+    """
+    In-memory copy of all campaigns that did not end yet, so that the running campaign of a server can be determined
+    without querying the database on every game event.
+    Start and stop times are evaluated on every lookup (using the clock of the database), so campaigns begin and end on
+    time without a reload. The cache is loaded on startup and reloaded in the background when the code that changes
+    campaigns invalidates it and every max_age seconds to catch changes that were done outside of this process. The
+    last known state is used until a reload is done.
+    """
+    def __init__(self, max_age: int = 300):
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._campaigns: Optional[list[_Campaign]] = None
+        # difference between the clock of the database and ours
+        self._offset = 0.0
+        self._loaded = 0.0
+        self._loading = False
+        self._generation = 0
+        self._pool: Optional[ConnectionPool] = None
+
+    @staticmethod
+    def _read(pool: ConnectionPool) -> tuple[list[_Campaign], float]:
+        with pool.connection() as conn:
+            now = (conn.execute("SELECT now() AT TIME ZONE 'utc'").fetchone())[0]
+            offset = (now - datetime.now(timezone.utc).replace(tzinfo=None)).total_seconds()
+            return [
+                _Campaign(*row)
+                for row in conn.execute("""
+                    SELECT c.id, c.name, c.start, c.stop, ARRAY_REMOVE(ARRAY_AGG(s.server_name), NULL)
+                    FROM campaigns c LEFT OUTER JOIN campaigns_servers s ON c.id = s.campaign_id
+                    WHERE c.stop IS NULL OR c.stop >= (now() AT TIME ZONE 'utc')
+                    GROUP BY c.id, c.name, c.start, c.stop
                 """)
-            if cursor.rowcount == 1:
-                row = cursor.fetchone()
-                return row[0], row[1]
-            else:
-                return None, None
+            ], offset
+
+    def load(self, pool: ConnectionPool) -> list[_Campaign]:
+        with self._lock:
+            self._pool = pool
+            generation = self._generation
+            self._loading = True
+        try:
+            campaigns, offset = self._read(pool)
+        finally:
+            with self._lock:
+                self._loading = False
+        with self._lock:
+            # don't keep what we read, if the campaigns were changed in the meantime
+            if generation == self._generation:
+                self._campaigns = campaigns
+                self._offset = offset
+                self._loaded = time.time()
+        return campaigns
+
+    def _refresh(self, pool: ConnectionPool) -> None:
+        try:
+            self.load(pool)
+        except Exception as ex:
+            logger.exception(ex)
+
+    def invalidate(self) -> None:
+        """
+        Has to be called after campaigns or their servers were changed.
+        """
+        with self._lock:
+            self._generation += 1
+            # nothing loaded yet, the first lookup loads the campaigns anyway
+            if self._campaigns is None:
+                return
+            self._loading = True
+        threading.Thread(target=self._refresh, args=(self._pool, ), daemon=True).start()
+
+    def get_running(self, pool: ConnectionPool, server_name: Optional[str] = None) -> tuple[Any, Any]:
+        """
+        Returns (id, name) of the campaign that is running (on the given server), (None, None) if there is none.
+        """
+        with self._lock:
+            campaigns = self._campaigns
+            if campaigns is not None and time.time() - self._loaded > self.max_age and not self._loading:
+                # reload in the background, the old state is good enough until then
+                self._loading = True
+                threading.Thread(target=self._refresh, args=(pool, ), daemon=True).start()
+        if campaigns is None:
+            # only if we are asked before the load on startup is done
+            campaigns = self.load(pool)
+        now = datetime.fromtimestamp(time.time() + self._offset, tz=timezone.utc).replace(tzinfo=None)
+        running = [
+            x for x in campaigns
+            if x.is_running(now) and (not server_name or server_name in x.servers)
+        ]
+        if len(running) == 1:
+            return running[0].id, running[0].name
+        return None, None
+
+
+campaign_cache = CampaignCache()
+
+
+def get_running_campaign(bot: DCSServerBot, server: Optional[Server] = None) -> tuple[Any, Any]:
+    return campaign_cache.get_running(bot.pool, server.name if server else None)
 
 
 def get_all_campaigns(self) -> list[str]:
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from collections import deque
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Optional
+
+if TYPE_CHECKING:
+    from psycopg import AsyncConnection
+    from psycopg_pool import AsyncConnectionPool
+
+__all__ = [
+    "DatabaseWriter"
+]
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseWriter:
+    """
+    Executes database jobs one after the other on the async pool.
+    Synchronous code (like property setters) can submit their writes in here, without blocking the event loop.
+    Jobs are executed in the order they were submitted, each in its own transaction.
+    """
+
+    def __init__(self, apool: AsyncConnectionPool, maxsize: int = 1000):
+        self.apool = apool
+        self.maxsize = maxsize
+        self._jobs: deque[tuple[Callable[[AsyncConnection], Awaitable[Any]], asyncio.Future]] = deque()
+        self._wakeup = asyncio.Event()
+        self._space = asyncio.Event()
+        self._space.set()
+        self._worker: Optional[asyncio.Task] = None
+        self._closed = False
+
+    def submit(self, job: Callable[[AsyncConnection], Awaitable[Any]]) -> asyncio.Future:
+        """Queue a job and return a future for its result. Has to be called from within the event loop."""
+        if self._closed:
+            raise RuntimeError("DatabaseWriter is closed.")
+        future = asyncio.get_running_loop().create_future()
+        # errors are logged by the worker already, the caller does not need to await the future
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._jobs.append((job, future))
+        if len(self._jobs) >= self.maxsize and self._space.is_set():
+            logger.warning(f"DatabaseWriter: {len(self._jobs)} jobs pending, the database can't keep up.")
+            self._space.clear()
+        self._wakeup.set()
+        if not self._worker:
+            self._worker = asyncio.create_task(self._process())
+        return future
+
+    async def execute(self, job: Callable[[AsyncConnection], Awaitable[Any]]) -> Any:
+        """Queue a job and wait for its result. Waits for free space in the queue first."""
+        await self._space.wait()
+        return await self.submit(job)
+
+    async def _process(self):
+        while True:
+            if not self._jobs:
+                if self._closed:
+                    return
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            job, future = self._jobs.popleft()
+            if len(self._jobs) < self.maxsize:
+                self._space.set()
+            try:
+                async with self.apool.connection() as conn:
+                    async with conn.transaction():
+                        result = await job(conn)
+                if not future.done():
+                    future.set_result(result)
+            except Exception as ex:
+                logger.exception(ex)
+                if not future.done():
+                    future.set_exception(ex)
+
+    async def close(self):
+        """Execute all pending jobs and stop the worker."""
+        self._closed = True
+        self._wakeup.set()
+        if self._worker:
+            await self._worker
@@ -202,11 +202,16 @@ def lua_pattern_to_python_regex(lua_pattern):
         '%z': '\\x00',
     }
 
-    python_regex = lua_pattern
-    for lua, python in translation_dict.items():
-        python_regex = python_regex.replace(lua, python)
-
-    return python_regex
+    def _translate(match: re.Match) -> str:
+        escape = match.group(0)
+        if escape in translation_dict:
+            return translation_dict[escape]
+        # escaped magic characters, like %. or %-
+        elif not match.group(1).isalnum():
+            return re.escape(match.group(1))
+        return escape
+
+    return re.sub(r'%(.)', _translate, lua_pattern)
 
 
 def format_frequency(frequency_hz: int, *, band: bool = True) -> str:
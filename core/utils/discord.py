@@ -6,12 +6,15 @@ import functools
 import logging
 import os
 import re
+import threading
 
 from core import Status, utils
 from core.data.node import SortOrder, UploadStatus
 from core.services.registry import ServiceRegistry
 from core.translations import get_translation
+from collections import Counter
 from datetime import datetime
+from difflib import SequenceMatcher
 from discord import app_commands, Interaction, SelectOption
 from discord.ext import commands
 from discord.ui import Button, View, Select, Item, Modal, TextInput
@@ -53,6 +56,7 @@ __all__ = [
     "create_warning_embed",
     "escape_string",
     "print_ruler",
+    "MemberIndex",
     "match",
     "get_interaction_param",
     "get_all_linked_members",
@@ -793,45 +797,144 @@ def normalize_name(name: Optional[str] = None) -> Optional[str]:
     return name.strip().lower()
 
 
-def match(name: str, member_list: list[discord.Member], min_score: Optional[int] = 70) -> Optional[discord.Member]:
+# we do not want to match the DCS standard names
+_DEFAULT_NAMES = frozenset([
+    'Player',
+    'Joueur',
+    'Spieler',
+    'Игрок',
+    'Jugador',
+    '玩家',
+    'Hráč',
+    '플레이어'
+])
+_MEMBER_ATTRIBUTES = ['display_name', 'global_name', 'name']
+
+
+def _score(ratio: float) -> int:
+    # same rounding as fuzz.ratio()
+    return int(round(100 * ratio))
+
+
+def _bigrams(name: str) -> set[str]:
+    return {name[i:i + 2] for i in range(len(name) - 1)}
+
+
+class MemberIndex:
+    """
+    Index of the normalized names of all members for match().
+    Names are only scored against candidates that share some bigrams with them (names shorter than
+    MIN_BLOCKING_LENGTH are compared to all members instead). fuzz.ratio() can't exceed 2 * min(len1, len2) / (len1 +
+    len2) or the share of common characters (SequenceMatcher.quick_ratio()), so these bounds are checked before the
+    real score is calculated.
+    """
+    MIN_BLOCKING_LENGTH = 5
+
+    def __init__(self, members: Iterable[discord.Member] = ()):
+        self._lock = threading.Lock()
+        self._names: dict[int, tuple[discord.Member, list[Optional[str]]]] = {}
+        # per attribute: length => member id => normalized name
+        self._buckets: list[dict[int, dict[int, str]]] = [{} for _ in _MEMBER_ATTRIBUTES]
+        # per attribute: bigram => member ids
+        self._bigrams: list[dict[str, set[int]]] = [{} for _ in _MEMBER_ATTRIBUTES]
+        for member in members:
+            self.add(member)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, member: discord.Member) -> None:
+        if member.bot:
+            return
+        names = [normalize_name(getattr(member, attr)) for attr in _MEMBER_ATTRIBUTES]
+        with self._lock:
+            self._remove(member.id)
+            self._names[member.id] = (member, names)
+            for buckets, bigrams, name in zip(self._buckets, self._bigrams, names):
+                if not name:
+                    continue
+                buckets.setdefault(len(name), {})[member.id] = name
+                for bigram in _bigrams(name):
+                    bigrams.setdefault(bigram, set()).add(member.id)
+
+    # a changed member is just added again
+    update = add
+
+    def _remove(self, member_id: int) -> None:
+        _, names = self._names.pop(member_id, (None, []))
+        for buckets, bigrams, name in zip(self._buckets, self._bigrams, names):
+            if not name:
+                continue
+            bucket = buckets[len(name)]
+            bucket.pop(member_id, None)
+            if not bucket:
+                del buckets[len(name)]
+            for bigram in _bigrams(name):
+                ids = bigrams[bigram]
+                ids.discard(member_id)
+                if not ids:
+                    del bigrams[bigram]
+
+    def remove(self, member: Union[discord.Member, discord.User]) -> None:
+        with self._lock:
+            self._remove(member.id)
+
+    def _candidates(self, attr: int, name: str, min_score: int) -> Iterable[tuple[int, str]]:
+        buckets = self._buckets[attr]
+        if len(name) < self.MIN_BLOCKING_LENGTH:
+            for length, bucket in buckets.items():
+                if _score(2 * min(length, len(name)) / (length + len(name))) >= min_score:
+                    yield from bucket.items()
+            return
+        counts = Counter()
+        bigrams = self._bigrams[attr]
+        for bigram in _bigrams(name):
+            counts.update(bigrams.get(bigram, ()))
+        threshold = max(1, (len(name) - 1) // 4)
+        for member_id, count in counts.items():
+            if count >= threshold:
+                yield member_id, self._names[member_id][1][attr]
+
+    def match(self, name: str, min_score: Optional[int] = 70) -> Optional[discord.Member]:
+        if name in _DEFAULT_NAMES:
+            return None
+        name = normalize_name(name)
+        if not name:
+            return None
+        matcher = SequenceMatcher(None)
+        matcher.set_seq2(name)
+        max_score = 0
+        best_match = None
+        with self._lock:
+            for attr in range(len(_MEMBER_ATTRIBUTES)):
+                for member_id, user in self._candidates(attr, name, min_score):
+                    bound = _score(2 * min(len(user), len(name)) / (len(user) + len(name)))
+                    if bound < min_score or bound <= max_score:
+                        continue
+                    matcher.set_seq1(user)
+                    bound = _score(matcher.quick_ratio())
+                    if bound < min_score or bound <= max_score:
+                        continue
+                    score = fuzz.ratio(name, user)
+                    if score >= min_score and score > max_score:
+                        best_match = self._names[member_id][0]
+                        max_score = score
+        return best_match
+
+
+def match(name: str, member_list: Union[list[discord.Member], MemberIndex],
+          min_score: Optional[int] = 70) -> Optional[discord.Member]:
     """
     Match the given name with members in the member_list based on fuzzy string matching.
 
     :param name: The name to match.
-    :param member_list: The list of discord.Member objects to match against.
+    :param member_list: The list of discord.Member objects to match against, or a MemberIndex of them.
     :param min_score: The minimum score required for a match. Defaults to 70.
     :return: The discord.Member object with the best match, or None if no match is found.
     """
-    # we do not want to match the DCS standard names
-    if name in [
-        'Player',
-        'Joueur',
-        'Spieler',
-        'Игрок',
-        'Jugador',
-        '玩家',
-        'Hráč',
-        '플레이어'
-    ]:
-        return None
-
-    name = normalize_name(name)
-    weights = [3, 2, 1]
-    user_lists = [
-        [normalize_name(getattr(member, attr)) for member in member_list]
-        for attr in ['display_name', 'global_name', 'name']
-    ]
-    max_score = 0
-    best_match_index = None
-
-    for user_list, weight in zip(user_lists, weights):
-        for idx, user in enumerate(user_list):
-            score = fuzz.ratio(name, user)
-            if score > max_score:
-                best_match_index = idx if score >= min_score else None
-                max_score = score if score >= min_score else 0
-
-    return member_list[best_match_index] if best_match_index else None
+    if not isinstance(member_list, MemberIndex):
+        member_list = MemberIndex(member_list)
+    return member_list.match(name, min_score)
 
 
 def get_interaction_param(interaction: discord.Interaction, name: str) -> Optional[Any]:
@@ -1119,8 +1222,8 @@ class UserTransformer(app_commands.Transformer):
             ret.extend([
                 app_commands.Choice(name='✈ ' + name + (' (' + ucid + ')' if show_ucid else ''),
                                     value=ucid)
-                for ucid, name in get_all_players(interaction.client, self.linked, self.watchlist)
-                if not current or current.casefold() in name.casefold() or current.casefold() in ucid
+                for ucid, name in get_all_players(interaction.client, self.linked, self.watchlist, current=current,
+                                                  limit=25)
             ])
         if (self.linked is None or self.linked) and self.sel_type in [PlayerType.ALL, PlayerType.MEMBER]:
             ret.extend([
@@ -1163,8 +1266,8 @@ class PlayerTransformer(app_commands.Transformer):
             else:
                 choices = [
                     app_commands.Choice(name=f"{ucid} ({name})", value=ucid)
-                    for ucid, name in get_all_players(interaction.client, self.watchlist, self.vip)
-                    if not current or current.casefold() in name.casefold() or current.casefold() in ucid
+                    for ucid, name in get_all_players(interaction.client, watchlist=self.watchlist, vip=self.vip,
+                                                      current=current, limit=25)
                 ]
             return choices[:25]
         except Exception as ex:
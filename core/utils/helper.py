@@ -39,6 +39,8 @@ from ruamel.yaml import YAML
 from ruamel.yaml.error import MarkedYAMLError
 yaml = YAML()
 
+from .players import player_index
+
 if TYPE_CHECKING:
     from core import ServerProxy, DataObject, Node
     from services.servicebus import ServiceBus
@@ -74,7 +76,10 @@ __all__ = [
     "evaluate",
     "for_each",
     "YAMLError",
-    "DictWrapper"
+    "DictWrapper",
+    "ReadOnlyDict",
+    "ReadOnlyList",
+    "make_readonly"
 ]
 
 logger = logging.getLogger(__name__)
@@ -310,10 +315,12 @@ def alternate_parse_settings(path: str):
 
 
 def get_all_players(self, linked: Optional[bool] = None, watchlist: Optional[bool] = None,
-                    vip: Optional[bool] = None) -> list[tuple[str, str]]:
+                    vip: Optional[bool] = None, current: Optional[str] = None,
+                    limit: Optional[int] = None) -> list[tuple[str, str]]:
     """
     This method `get_all_players` returns a list of tuples containing the UCID and name of players from the database. Filtering can be optionally applied by providing values for the parameters
     * `linked`, `watchlist`, and `vip`.
+    The players are served from an in-memory index (see `PlayerIndex`), so this can be called on every keystroke.
 
     :param self: The object instance of the class.
     :param linked: Optional boolean parameter to filter players based on whether they are linked to a Discord account or not. If set to `True`, only linked players will be returned. If set
@@ -322,25 +329,12 @@ def get_all_players(self, linked: Optional[bool] = None, watchlist: Optional[boo
     * set to `False`, only players not on the watchlist will be returned. If not provided, no filtering based on watchlist status will be applied.
     :param vip: Optional boolean parameter to filter players based on whether they are VIP players or not. If set to `True`, only VIP players will be returned. If set to `False`, only non
     *-VIP players will be returned. If not provided, no filtering based on VIP status will be applied.
-    :return: A list of tuples containing the UCID and name of players from the database.
-
-    """
-    sql = "SELECT p.ucid, p.name FROM players p{} WHERE length(p.ucid) = 32"
-    sub_sql = ""
-    if watchlist:
-        sub_sql = " JOIN watchlist w ON p.ucid = w.player_ucid"
-    elif watchlist is False:
-        sql += " AND p.ucid NOT IN (SELECT player_ucid FROM watchlist)"
-    if vip:
-        sql += " AND p.vip IS NOT FALSE"
-    if linked is not None:
-        if linked:
-            sql += " AND p.discord_id != -1 AND p.manual IS TRUE"
-        else:
-            sql += " AND p.manual IS FALSE"
-    sql = sql.format(sub_sql)
-    with self.pool.connection() as conn:
-        return [(row[0], row[1]) for row in conn.execute(sql)]
+    :param current: Optional string that has to be part of the name or UCID of the player (case-insensitive).
+    :param limit: Optional maximum number of players to return.
+    :return: A list of tuples containing the UCID and name of players from the database, most recently seen first.
+
+    """
+    return player_index.search(self.pool, current, linked=linked, watchlist=watchlist, vip=vip, limit=limit)
 
 
 def is_ucid(ucid: Optional[str]) -> bool:
@@ -600,9 +594,9 @@ class SettingsDict(dict):
         tmpfd, tmpname = tempfile.mkstemp()
         os.close(tmpfd)
         if self.path.lower().endswith('.lua'):
-            with open(tmpname, mode='wb') as outfile:
-                outfile.write((f"{self.root} = " + luadata.serialize(self, indent='\t',
-                                                                     indent_level=0)).encode('utf-8'))
+            with open(tmpname, mode='w', encoding='utf-8', newline='\n') as outfile:
+                outfile.write(f"{self.root} = ")
+                luadata.dump(self, outfile, indent='\t', indent_level=0)
         elif self.path.lower().endswith('.yaml'):
             with open(tmpname, mode="w", encoding='utf-8') as outfile:
                 yaml.dump(self, outfile)
@@ -1016,3 +1010,60 @@ class DictWrapper:
     def clone(self):
         """Deeply clone the DictWrapper object."""
         return DictWrapper(deepcopy(self.to_dict()))
+
+
+class ReadOnlyDict(dict):
+    """
+    A dictionary that can be shared between multiple consumers without copying it.
+    All modifications raise a TypeError. Use copy() or deepcopy() to get a mutable (plain) dictionary.
+    """
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError(f"{self.__class__.__name__} does not support item assignment")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return {deepcopy(k, memo): deepcopy(v, memo) for k, v in self.items()}
+
+    def __reduce__(self):
+        return dict, (dict(self), )
+
+
+class ReadOnlyList(list):
+    """
+    A list that can be shared between multiple consumers without copying it.
+    All modifications raise a TypeError. Use copy() or deepcopy() to get a mutable (plain) list.
+    """
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError(f"{self.__class__.__name__} does not support item assignment")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = clear = extend = insert = pop = remove = reverse = sort = _readonly
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return [deepcopy(x, memo) for x in self]
+
+    def __reduce__(self):
+        return list, (list(self), )
+
+
+def make_readonly(data: Any) -> Any:
+    """
+    Recursively converts all dictionaries and lists in data into their read-only counterparts.
+    """
+    if isinstance(data, (ReadOnlyDict, ReadOnlyList)):
+        return data
+    elif isinstance(data, dict):
+        return ReadOnlyDict((k, make_readonly(v)) for k, v in data.items())
+    elif isinstance(data, list):
+        return ReadOnlyList(make_readonly(x) for x in data)
+    return data
@@ -3,12 +3,16 @@ import cProfile
 import io
 import logging
 import pstats
+import sys
+import threading
 import time
 import traceback
 
 from contextlib import ContextDecorator
+from typing import Optional
 
 __all__ = [
+    "LoopMonitor",
     "PerformanceLog",
     "performance_log",
     "log_call"
@@ -95,3 +99,63 @@ def log_call():
         return wrapped
 
     return decorator
+
+
+class LoopMonitor:
+    """
+    Logs the stack of the event loop thread to the performance log, whenever a callback blocks the loop for longer
+    than threshold milliseconds. A threshold of 0 disables the monitor.
+    Has to be entered from within the running event loop.
+    """
+
+    def __init__(self, threshold: int):
+        self.threshold = threshold / 1000
+        # heartbeat interval of the loop, which is also the accuracy of the measurement
+        self.interval = self.threshold / 4
+        self.logger = logging.getLogger('performance_log')
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.last_beat = 0.0
+        self._thread_id = None
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self):
+        if self.threshold:
+            self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+        return False
+
+    def start(self):
+        self.loop = asyncio.get_running_loop()
+        self._thread_id = threading.get_ident()
+        self._beat()
+        self._thread = threading.Thread(target=self._watch, name='LoopMonitor', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._handle:
+            self._handle.cancel()
+        if self._thread:
+            self._thread.join()
+
+    def _beat(self):
+        self.last_beat = time.monotonic()
+        self._handle = self.loop.call_later(self.interval, self._beat)
+
+    def _watch(self):
+        reported = None
+        while not self._stop.wait(self.interval):
+            last_beat = self.last_beat
+            blocked = time.monotonic() - last_beat - self.interval
+            # report every blocking call only once
+            if blocked < self.threshold or last_beat == reported:
+                continue
+            reported = last_beat
+            frame = sys._current_frames().get(self._thread_id)
+            stack = ''.join(traceback.format_stack(frame)) if frame else 'n/a'
+            self.logger.warning('Event loop blocked for more than {:.0f} ms:\n{}'.format(blocked * 1000, stack))
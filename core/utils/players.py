@@ -0,0 +1,336 @@
+from __future__ import annotations
+
+import bisect
+import logging
+import threading
+import time
+
+from array import array
+from typing import Optional, Any, Iterable, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from psycopg_pool import ConnectionPool
+
+__all__ = [
+    "PlayerIndex",
+    "player_index"
+]
+
+logger = logging.getLogger(__name__)
+
+_MISSING: Any = object()
+# separates the names in the haystack, can't be part of a search string
+_SEP = '\x1e'
+# subsets up to this size are scanned instead of searching the whole index
+_MAX_SCAN = 1000
+
+
+def _trigrams(value: str) -> set[str]:
+    return {value[i:i + 3] for i in range(len(value) - 2)}
+
+
+class _Entry:
+    __slots__ = ('id', 'ucid', 'name', 'folded', 'discord_id', 'manual', 'vip', 'watchlist')
+
+    def __init__(self, ucid: str, name: Optional[str], discord_id: int = -1, manual: Optional[bool] = False,
+                 vip: Optional[bool] = False, watchlist: bool = False):
+        self.id = -1
+        self.ucid = ucid
+        self.name = name or ''
+        self.folded = self.name.casefold()
+        self.discord_id = discord_id
+        self.manual = manual
+        self.vip = vip
+        self.watchlist = watchlist
+
+    @property
+    def linked(self) -> bool:
+        return self.discord_id != -1 and self.manual is True
+
+    def contains(self, needle: str) -> bool:
+        return needle in self.folded or self.ucid.startswith(needle)
+
+    def matches(self, linked: Optional[bool], watchlist: Optional[bool], vip: Optional[bool]) -> bool:
+        if watchlist is not None and self.watchlist != watchlist:
+            return False
+        if vip and self.vip is False:
+            return False
+        if linked is not None:
+            if linked and not self.linked:
+                return False
+            elif not linked and self.manual is not False:
+                return False
+        return True
+
+
+class _State:
+    def __init__(self, entries: Iterable[_Entry]):
+        self.entries: dict[str, _Entry] = {}
+        self.order: list[_Entry] = []
+        # trigrams of the names => ids of the entries (ascending, might contain outdated ids after a rename)
+        self.trigrams: dict[str, array] = {}
+        # all names for needles that are too short for the trigrams
+        self.haystack = ''
+        self.offsets: list[int] = []
+        self.dirty = False
+        self.ucids: list[str] = []
+        # small subsets, that are cheaper to scan than the whole index
+        self.linked: dict[str, _Entry] = {}
+        self.watchlist: dict[str, _Entry] = {}
+        self.vip: dict[str, _Entry] = {}
+        for entry in entries:
+            self._add(entry)
+        self.ucids.sort()
+        self.build_haystack()
+
+    def _add(self, entry: _Entry):
+        entry.id = len(self.order)
+        self.order.append(entry)
+        self.entries[entry.ucid] = entry
+        self.ucids.append(entry.ucid)
+        self.index(entry)
+        self.classify(entry)
+
+    def add(self, entry: _Entry):
+        self._add(entry)
+        self.ucids.pop()
+        bisect.insort(self.ucids, entry.ucid)
+        if not self.dirty:
+            self.offsets.append(len(self.haystack) + 1)
+            self.haystack += _SEP + entry.folded
+
+    def remove(self, ucid: str):
+        entry = self.entries.pop(ucid, None)
+        if not entry:
+            return
+        del self.ucids[bisect.bisect_left(self.ucids, ucid)]
+        for subset in [self.linked, self.watchlist, self.vip]:
+            subset.pop(ucid, None)
+        # the entry stays in the order, the trigrams and the haystack until the next load, search() skips it
+
+    def index(self, entry: _Entry):
+        for trigram in _trigrams(entry.folded):
+            ids = self.trigrams.get(trigram)
+            if ids is None:
+                self.trigrams[trigram] = array('I', [entry.id])
+            elif ids[-1] != entry.id:
+                # ids are ascending, unless the name was changed
+                ids.append(entry.id)
+                if ids[-2] > entry.id:
+                    self.trigrams[trigram] = array('I', sorted(set(ids)))
+
+    def rename(self, entry: _Entry, name: str):
+        entry.name = name
+        entry.folded = name.casefold()
+        self.index(entry)
+        self.dirty = True
+
+    def classify(self, entry: _Entry):
+        for subset, flag in [(self.linked, entry.linked), (self.watchlist, entry.watchlist),
+                             (self.vip, entry.vip is not False)]:
+            if flag:
+                subset[entry.ucid] = entry
+            else:
+                subset.pop(entry.ucid, None)
+
+    def build_haystack(self):
+        self.offsets = []
+        pos = 1
+        for entry in self.order:
+            self.offsets.append(pos)
+            pos += len(entry.folded) + 1
+        self.haystack = ''.join(_SEP + entry.folded for entry in self.order)
+        self.dirty = False
+
+    def candidates(self, needle: str) -> Iterable[_Entry]:
+        # UCIDs are searched by prefix
+        if len(needle) > 1 and needle.isalnum():
+            i = bisect.bisect_left(self.ucids, needle)
+            while i < len(self.ucids) and self.ucids[i].startswith(needle):
+                yield self.entries[self.ucids[i]]
+                i += 1
+        if len(needle) >= 3:
+            postings = []
+            for trigram in _trigrams(needle):
+                ids = self.trigrams.get(trigram)
+                if ids is None:
+                    return
+                postings.append(ids)
+            for i in min(postings, key=len):
+                yield self.order[i]
+        else:
+            if self.dirty:
+                self.build_haystack()
+            pos = self.haystack.find(needle)
+            while pos != -1:
+                i = bisect.bisect_right(self.offsets, pos) - 1
+                yield self.order[i]
+                if i + 1 == len(self.offsets):
+                    break
+                pos = self.haystack.find(needle, self.offsets[i + 1])
+
+
+class PlayerIndex:
+    """
+    In-memory index of all players for autocompletion, so that we don't need to query and filter all players on every
+    keystroke. Names are found by substring (trigrams for 3+ characters, a scan of all names for shorter ones), UCIDs
+    by prefix.
+    The index is loaded in the background on startup (or first use) and updated by the code that changes or deletes
+    players, links, the watchlist or VIPs.
+    It is reloaded in the background every max_age seconds to catch changes that were done outside of this process.
+    """
+    def __init__(self, max_age: int = 3600):
+        self.max_age = max_age
+        self._lock = threading.RLock()
+        self._state: Optional[_State] = None
+        self._loaded = 0.0
+        self._pending: Optional[list[tuple[str, tuple, dict]]] = None
+        self._loading = False
+
+    @staticmethod
+    def _read(pool: ConnectionPool) -> _State:
+        with pool.connection() as conn:
+            return _State(
+                _Entry(*row)
+                for row in conn.execute("""
+                    SELECT p.ucid, p.name, p.discord_id, p.manual, p.vip, w.player_ucid IS NOT NULL
+                    FROM players p LEFT OUTER JOIN watchlist w ON p.ucid = w.player_ucid
+                    WHERE length(p.ucid) = 32
+                    ORDER BY p.last_seen DESC NULLS LAST
+                """)
+            )
+
+    def load(self, pool: ConnectionPool) -> None:
+        with self._lock:
+            # only one load at a time, the pending changes belong to it
+            if self._loading:
+                return
+            self._loading = True
+            # changes that happen while we read the database are applied to the new state afterward
+            self._pending = []
+        try:
+            state = self._read(pool)
+            with self._lock:
+                pending, self._pending = self._pending, None
+                self._state = state
+                self._loaded = time.time()
+                for method, args, kwargs in pending:
+                    getattr(self, method)(*args, **kwargs)
+        finally:
+            # the pending changes were applied to the old state as well, if we could not read the new one
+            with self._lock:
+                self._pending = None
+                self._loading = False
+
+    def _refresh(self, pool: ConnectionPool) -> None:
+        try:
+            self.load(pool)
+        except Exception as ex:
+            logger.exception(ex)
+
+    def _get_state(self, pool: ConnectionPool) -> Optional[_State]:
+        if not self._loading and (not self._state or time.time() - self._loaded > self.max_age):
+            # (re)load in the background, the old state is good enough until then
+            self._loaded = time.time()
+            threading.Thread(target=self._refresh, args=(pool, ), daemon=True).start()
+        return self._state
+
+    def _record(self, method: str, *args, **kwargs) -> bool:
+        if self._pending is not None:
+            self._pending.append((method, args, kwargs))
+        return self._state is not None
+
+    def update(self, ucid: str, *, name: Optional[str] = _MISSING, discord_id: int = _MISSING,
+               manual: Optional[bool] = _MISSING, vip: Optional[bool] = _MISSING, watchlist: bool = _MISSING) -> None:
+        """
+        Updates the given properties of a player. Unknown players are only added, if a name is provided.
+        """
+        if not ucid or len(ucid) != 32:
+            return
+        with self._lock:
+            if not self._record('update', ucid, name=name, discord_id=discord_id, manual=manual, vip=vip,
+                                watchlist=watchlist):
+                return
+            state = self._state
+            entry = state.entries.get(ucid)
+            if not entry:
+                if name is _MISSING:
+                    return
+                entry = _Entry(ucid, name)
+                state.add(entry)
+            elif name is not _MISSING and (name or '') != entry.name:
+                state.rename(entry, name or '')
+            if discord_id is not _MISSING:
+                entry.discord_id = discord_id
+            if manual is not _MISSING:
+                entry.manual = manual
+            if vip is not _MISSING:
+                entry.vip = vip
+            if watchlist is not _MISSING:
+                entry.watchlist = watchlist
+            state.classify(entry)
+
+    def remove(self, ucid: str) -> None:
+        """
+        Removes a deleted player.
+        """
+        with self._lock:
+            if not self._record('remove', ucid):
+                return
+            self._state.remove(ucid)
+
+    def unlink(self, discord_id: int) -> None:
+        """
+        Removes all unverified links of a member.
+        """
+        with self._lock:
+            if not self._record('unlink', discord_id):
+                return
+            state = self._state
+            for entry in state.entries.values():
+                if entry.discord_id == discord_id and entry.manual is False:
+                    entry.discord_id = -1
+                    state.classify(entry)
+
+    def search(self, pool: ConnectionPool, current: Optional[str] = None, *, linked: Optional[bool] = None,
+               watchlist: Optional[bool] = None, vip: Optional[bool] = None,
+               limit: Optional[int] = None) -> list[tuple[str, str]]:
+        """
+        Returns (ucid, name) of all players, whose name contains current or whose UCID starts with it.
+        Nothing is returned until the index is loaded.
+        """
+        needle = current.casefold() if current else ''
+        with self._lock:
+            state = self._get_state(pool)
+            if not state:
+                return []
+            if watchlist:
+                subset = state.watchlist
+            elif vip:
+                subset = state.vip
+            elif linked:
+                subset = state.linked
+            else:
+                subset = None
+            if subset is not None and (not needle or len(subset) < _MAX_SCAN):
+                candidates = subset.values()
+            elif needle:
+                candidates = state.candidates(needle)
+            else:
+                candidates = state.order
+            ret = []
+            seen = set()
+            for entry in candidates:
+                if (entry.id in seen or state.entries.get(entry.ucid) is not entry or
+                        not entry.matches(linked, watchlist, vip)):
+                    continue
+                if needle and not entry.contains(needle):
+                    continue
+                seen.add(entry.id)
+                ret.append((entry.ucid, entry.name))
+                if limit and len(ret) == limit:
+                    break
+            return ret
+
+
+player_index = PlayerIndex()
@@ -3,7 +3,7 @@ import logging
 import os
 import random
 
-from core import Extension, utils, Server, YAMLError, DEFAULT_TAG, MizFile, ServerImpl
+from core import Extension, utils, Server, YAMLError, DEFAULT_TAG, MissionPipeline, ServerImpl
 from datetime import datetime
 from extensions.realweather import RealWeather
 from pathlib import Path
@@ -86,10 +86,12 @@ class MizEdit(Extension):
         return modifications
 
     @staticmethod
-    async def apply_presets(server: Server, filename: str, preset: Union[list, dict]) -> str:
+    async def _apply_presets(server: Server, pipeline: MissionPipeline, preset: Union[list, dict]) -> None:
         if preset and isinstance(preset, list):
             rw_preset = next((p for p in preset if 'RealWeather'in p), None)
             if rw_preset:
+                # RealWeather needs the mission on disk
+                filename = await pipeline.get_filename()
                 try:
                     await server.run_on_extension('RealWeather', 'is_running')
                     filename = await server.run_on_extension(
@@ -104,6 +106,7 @@ class MizEdit(Extension):
                         filename, rw_preset['RealWeather'], use_orig=False
                     )
                     await server.config_extension("RealWeather", {"enabled": False})
+                pipeline.set_filename(filename)
 
                 # remove all RealWeather presets
                 count = 0
@@ -114,16 +117,27 @@ class MizEdit(Extension):
                 if count > 1:
                     logger.error("Your preset contained more than one RealWeather preset. Only the first one was run.")
 
-        miz = await asyncio.to_thread(MizFile, filename)
+        if not preset:
+            return
+        miz = await pipeline.get_miz()
         await asyncio.to_thread(miz.apply_preset, preset)
+        pipeline.dirty = True
+
+    @staticmethod
+    async def apply_presets(server: Server, filename: str, preset: Union[list, dict]) -> str:
+        pipeline = MissionPipeline(filename)
+        await MizEdit._apply_presets(server, pipeline, preset)
         # write new mission
-        new_filename = utils.create_writable_mission(filename)
-        await asyncio.to_thread(miz.save, new_filename)
+        new_filename = await pipeline.save()
         logger.info(f"  => Presets applied on {filename} and written to {new_filename}.")
         return new_filename
 
-    async def beforeMissionLoad(self, filename: str) -> tuple[str, bool]:
-        return (await self.apply_presets(self.server, filename, await self.get_presets(self.config))), True
+    async def editMission(self, pipeline: MissionPipeline) -> bool:
+        presets = await self.get_presets(self.config)
+        if not presets:
+            return False
+        await self._apply_presets(self.server, pipeline, presets)
+        return True
 
     def is_running(self) -> bool:
         return True
@@ -16,7 +16,8 @@ class ModManager(Extension):
     async def startup(self) -> bool:
         filename = await self.server.get_current_mission_file()
         try:
-            mission = await asyncio.to_thread(MizFile, filename)
+            mission = MizFile(filename)
+            await asyncio.to_thread(mission.load)
             self.modules[self.server.name] = mission.requiredModules
         except UnsupportedMizFileException:
             self.log.warning(f"Can't read requiredModules from Mission {filename}, unsupported format.")
@@ -7,7 +7,7 @@ import subprocess
 import tempfile
 import sys
 
-from core import Extension, MizFile, utils, DEFAULT_TAG, Server
+from core import Extension, MizFile, MissionPipeline, utils, DEFAULT_TAG, Server
 from typing import Optional
 
 # TOML
@@ -151,7 +151,7 @@ class RealWeather(Extension):
         else:
             await self.generate_config_2_0(filename, tmpname, config)
 
-    async def run_realweather(self, filename: str, tmpname: str) -> tuple[str, bool]:
+    async def _run_realweather(self, filename: str, tmpname: str) -> MizFile:
         try:
             cwd = await self.server.get_missions_dir()
             rw_home = os.path.expandvars(self.config['installation'])
@@ -177,21 +177,37 @@ class RealWeather(Extension):
                 await asyncio.to_thread(run_subprocess)
 
             # check if DCS Real Weather corrupted the miz file
-            await asyncio.to_thread(MizFile, tmpname)
+            miz = MizFile(tmpname)
+            await asyncio.to_thread(miz.load)
 
-            # mission is good, take it
+            # mission is good, take it (the parsed mission is kept for the next modifications)
             new_filename = utils.create_writable_mission(filename)
             shutil.copy2(tmpname, new_filename)
-            return new_filename, True
+            miz.filename = new_filename
+            return miz
         finally:
             os.remove(tmpname)
 
+    async def run_realweather(self, filename: str, tmpname: str) -> tuple[str, bool]:
+        miz = await self._run_realweather(filename, tmpname)
+        return miz.filename, True
+
     async def beforeMissionLoad(self, filename: str) -> tuple[str, bool]:
         tmpfd, tmpname = tempfile.mkstemp()
         os.close(tmpfd)
         await self.generate_config(filename, tmpname)
         return await self.run_realweather(filename, tmpname)
 
+    async def editMission(self, pipeline: MissionPipeline) -> bool:
+        # DCS Real Weather works on the mission file
+        filename = await pipeline.get_filename()
+        tmpfd, tmpname = tempfile.mkstemp()
+        os.close(tmpfd)
+        await self.generate_config(filename, tmpname)
+        miz = await self._run_realweather(filename, tmpname)
+        pipeline.set_filename(miz.filename, miz)
+        return True
+
     async def apply_realweather(self, filename: str, config: dict, use_orig: bool = True) -> str:
         tmpfd, tmpname = tempfile.mkstemp()
         os.close(tmpfd)
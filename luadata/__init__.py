@@ -1,4 +1,4 @@
-from luadata.serializer.serialize import serialize
+from luadata.serializer.serialize import serialize, dump
 from luadata.serializer.unserialize import unserialize
 from luadata.io.read import read
 from luadata.io.write import write
@@ -1,5 +1,5 @@
 import codecs
-from luadata.serializer.serialize import serialize
+from luadata.serializer.serialize import dump
 
 
 def write(path, data, encoding="utf-8", indent=None, prefix="return "):
@@ -13,4 +13,5 @@ def write(path, data, encoding="utf-8", indent=None, prefix="return "):
         prefix (str, optional): prefix string. Defaults to "return ".
     """
     with codecs.open(path, "w", encoding) as file:
-        file.write(prefix + serialize(data, encoding=encoding, indent=indent))
+        file.write(prefix)
+        dump(data, file, encoding=encoding, indent=indent)
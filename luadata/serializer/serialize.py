@@ -1,108 +1,133 @@
+import codecs
+import io
 import re
 
-KEY_WORDS = [
+KEY_WORDS = frozenset([
     "and", "break", "do", "else", "elseif", "end", "false", "for", "function",
     "if", "in", "local", "nil", "not", "or", "repeat", "return", "then", "true", "until", "while"
-]
+])
 
+_SIMPLE_KEY = re.compile(r"[a-zA-Z_][a-zA-Z0-9_]*")
+_ESCAPES = str.maketrans({"\\": "\\\\", '"': '\\"', "\n": "\\\n"})
+# number of fragments that are collected before they are written to the stream
+_CHUNK_SIZE = 8192
 
-def __serialize(var, encoding, indent, level):
-    parts = []
-    var_type = type(var)
-    if var is None:
-        parts.append("nil")
-    elif isinstance(var, bool):
-        if var:
-            parts.append("true")
-        else:
-            parts.append("false")
-    elif isinstance(var, (int, float)):
-        parts.append(str(var))
-    elif isinstance(var, str):
-        parts.append('"')
-        parts.append(
-            var.encode(encoding)
+
+def _is_utf8(encoding):
+    return codecs.lookup(encoding).name == "utf-8"
+
+
+class _Serializer:
+    def __init__(self, write, encoding, indent):
+        self._write = write
+        self.encoding = encoding
+        self.indent = indent
+        # in UTF-8, the bytes of "\", '"' and "\n" can't be part of another character, so we can escape the str
+        self.utf8 = _is_utf8(encoding)
+        self.parts = []
+
+    def flush(self):
+        if self.parts:
+            self._write("".join(self.parts))
+            self.parts.clear()
+
+    def string(self, var):
+        if self.utf8:
+            return var.translate(_ESCAPES)
+        return (
+            var.encode(self.encoding)
             .replace(b"\\", b"\\\\")
             .replace(b'"', b'\\"')
             .replace(b"\n", b"\\\n")
-            .decode(encoding)
+            .decode(self.encoding)
         )
-        parts.append('"')
-    elif isinstance(var, (list, dict)):
-        # calc lua table entries
-        entries = []
-        if isinstance(var, list):
-            for i in range(len(var)):
-                entries.append([i + 1, var[i]])
-        elif isinstance(var, dict):
-            for k in var:
-                entries.append([k, var[k]])
-
-        # build lua table parts
-        parts.append("{")
-        s_tab_equ = "="
 
-        # process indent
+    def key(self, key, level):
+        if isinstance(key, str) and key not in KEY_WORDS and _SIMPLE_KEY.fullmatch(key):
+            return key
+        # [10010] = val # [".start with or contains special char"] = val
+        return "[" + self.scalar(key, level) + "]"
+
+    def scalar(self, var, level):
+        if var is None:
+            return "nil"
+        elif var is True:
+            return "true"
+        elif var is False:
+            return "false"
+        elif isinstance(var, (int, float)):
+            return str(var)
+        elif isinstance(var, str):
+            return '"' + self.string(var) + '"'
+        elif isinstance(var, (list, dict)):
+            # tables as keys
+            serializer = _Serializer(None, self.encoding, self.indent)
+            serializer.table(var, level)
+            return "".join(serializer.parts)
+        return ""
+
+    def value(self, var, level):
+        if isinstance(var, (list, dict)):
+            self.table(var, level)
+        else:
+            self.parts.append(self.scalar(var, level))
+
+    def table(self, var, level):
+        parts = self.parts
+        indent = self.indent
+        if not var:
+            parts.append("{}")
+            return
+        parts.append("{")
         if indent is not None:
             s_tab_equ = " = "
-            if len(entries) != 0:
-                parts.append("\n")
+            s_prefix = indent * (level + 1)
+            parts.append("\n")
+        else:
+            s_tab_equ = "="
+            s_prefix = ""
 
-        # prepare for iterator
+        if isinstance(var, dict):
+            items = var.items()
+        else:
+            items = enumerate(var, 1)
+        # keys 1..n at the beginning are written as list entries
         nohash = True
-        lastkey = None
-        lastval = None
-        hasval = False
-        for kv in entries:
-            key = kv[0]
-            val = kv[1]
-            # judge if this is a pure list table
-            if nohash and (
-                not isinstance(key, int)
-                or (
-                    lastval is None and key != 1
-                )  # first loop and index is not 1 : hash table
-                or (
-                    lastkey is not None and lastkey + 1 != key
-                )  # key is not continuously
-            ):
-                nohash = False
-            # process to insert to table
-            # insert indent
+        lastkey = 0
+        for key, val in items:
             if indent is not None:
-                parts.append(indent * (level + 1))
-            # insert key
-            if nohash:  # pure list: do not need a key
-                pass
-            elif isinstance(key, str) and key not in KEY_WORDS and re.match(
-                r"^[a-zA-Z_][a-zA-Z0-9_]*$", key
-            ):  # a = val
-                parts.append(key)
-                parts.append(s_tab_equ)
-            else:  # [10010] = val # [".start with or contains special char"] = val
-                parts.append("[")
-                parts.append(__serialize(key, encoding, indent, level + 1))
-                parts.append("]")
+                parts.append(s_prefix)
+            elif lastkey or not nohash:
+                parts.append(",")
+            if nohash and (type(key) is not int or key != lastkey + 1):
+                nohash = False
+            if nohash:
+                lastkey = key
+            else:
+                parts.append(self.key(key, level + 1))
                 parts.append(s_tab_equ)
-            # insert value
-            parts.append(__serialize(val, encoding, indent, level + 1))
-            parts.append(",")
+            self.value(val, level + 1)
             if indent is not None:
-                parts.append("\n")
-            lastkey = key
-            lastval = val
-            hasval = True
+                parts.append(",\n")
+            if self._write and len(parts) >= _CHUNK_SIZE:
+                self.flush()
 
-        # remove last `,` if no indent
-        if indent is None and hasval:
-            parts.pop()
-
-        # insert `}` with indent
-        if indent is not None and len(entries) != 0:
+        if indent is not None:
             parts.append(indent * level)
         parts.append("}")
 
-    return "".join(parts)
+
+def _serialize(var, serializer, indent, indent_level):
+    if isinstance(var, tuple):
+        spliter = ","
+        if indent is not None:
+            spliter = spliter + "\n" + indent * indent_level
+        for i, item in enumerate(var):
+            if i:
+                serializer.parts.append(spliter)
+            serializer.value(item, indent_level)
+    else:
+        serializer.value(var, indent_level)
 
 
 def serialize(var, encoding="utf-8", indent=None, indent_level=0):
@@ -117,12 +142,33 @@ def serialize(var, encoding="utf-8", indent=None, indent_level=0):
     Returns:
         string: serialized lua formatted data string
     """
-    if isinstance(var, tuple):
-        res = []
-        for item in var:
-            res.append(__serialize(item, encoding, indent, indent_level))
-        spliter = ","
-        if indent is not None:
-            spliter = spliter + "\n" + indent * indent_level
-        return spliter.join(res)
-    return __serialize(var, encoding, indent, indent_level)
+    serializer = _Serializer(None, encoding, indent)
+    _serialize(var, serializer, indent, indent_level)
+    return "".join(serializer.parts)
+
+
+def dump(var, fp, encoding="utf-8", indent=None, indent_level=0):
+    """Serialize variable to lua formatted data and write it to a stream.
+
+    The output is written in chunks, so the complete string is never held in memory.
+
+    Args:
+        var (number, int, float, str, dict, list): variable you want to serialize
+        fp (stream): text or binary stream to write to. Binary streams get the data encoded with encoding.
+        encoding (str, optional): target encoding, will affect string components escaping logic. Defaults to "utf-8".
+        indent (str, optional): indent string, such as '\\t'. Defaults to None, means no indention.
+        indent_level (int, optional): current indent level. Defaults to 0.
+    """
+    if isinstance(fp, (io.RawIOBase, io.BufferedIOBase)):
+        stream = io.TextIOWrapper(fp, encoding=encoding, newline="\n")
+    else:
+        stream = None
+    try:
+        serializer = _Serializer(stream.write if stream else fp.write, encoding, indent)
+        _serialize(var, serializer, indent, indent_level)
+        serializer.flush()
+    finally:
+        if stream:
+            stream.flush()
+            # do not close the binary stream with the wrapper
+            stream.detach()
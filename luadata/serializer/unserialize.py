@@ -1,381 +1,282 @@
-import math
+import re
 
-from lupa.lua51 import LuaRuntime, lua_type
+# One token, including the whitespace and the separator in front of it.
+# Keys in the form of ["key"] =, [1] = and key = are read as one token, as they make up most of the DCS files.
+# Numbers must not be followed by a dot or a name character, so that "1.." or "1.1." fail.
+_TOKEN = re.compile(rb"""
+    [ \t\r\n]*(?P<sep>[,;][ \t\r\n]*)?(?:
+        (?P<skey>\[[ \t\r\n]*(?:"(?P<skey1>[^"\\\n]*)"|'(?P<skey2>[^'\\\n]*)')[ \t\r\n]*\][ \t\r\n]*=)
+      | (?P<nkey>\[[ \t\r\n]*(?P<nkey1>-?[0-9]+)[ \t\r\n]*\][ \t\r\n]*=)
+      | (?P<namekey>(?P<namekey1>[A-Za-z_][A-Za-z0-9_]*)[ \t\r\n]*=)
+      | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+      | (?P<lcomment>--\[(?P<lcomment1>=*)\[.*?\](?P=lcomment1)\])
+      | (?P<comment>--(?!\[=*\[)[^\n]*)
+      | (?P<number>-?(?:0[xX][0-9a-fA-F]+|(?:[0-9]+(?:\.[0-9]*)?|\.[0-9]+)(?:[eE][+-]?[0-9]+)?)(?![A-Za-z0-9_.]))
+      | (?P<string>"[^"\\\n]*(?:\\(?:\r\n|.)[^"\\\n]*)*"|'[^'\\\n]*(?:\\(?:\r\n|.)[^'\\\n]*)*')
+      | (?P<lstring>\[(?P<lstring1>=*)\[(?:\r\n|\n)?(?P<lstring2>.*?)\](?P=lstring1)\])
+      | (?P<open>{)
+      | (?P<close>})
+      | (?P<lbracket>\[)
+      | (?P<rbracket>])
+      | (?P<assign>=)
+    )""", re.VERBOSE | re.DOTALL)
+_SPACE = re.compile(rb"[ \t\r\n]*")
+_ESCAPE = re.compile(rb"\\(\r\n|[0-9]{1,3}|.)", re.DOTALL)
+_ESCAPES = {
+    b"a": b"\a", b"b": b"\b", b"f": b"\f", b"n": b"\n", b"r": b"\r", b"t": b"\t", b"v": b"\v",
+    b"\n": b"\n", b"\r": b"\n", b"\r\n": b"\n"
+}
 
+# token types
+_SEPARATOR_TOKEN = _TOKEN.groupindex["sep"]
+_SKEY = _TOKEN.groupindex["skey"]
+_NKEY = _TOKEN.groupindex["nkey"]
+_NAMEKEY = _TOKEN.groupindex["namekey"]
+_NAME = _TOKEN.groupindex["name"]
+_LCOMMENT = _TOKEN.groupindex["lcomment"]
+_COMMENT = _TOKEN.groupindex["comment"]
+_NUMBER = _TOKEN.groupindex["number"]
+_STRING = _TOKEN.groupindex["string"]
+_LSTRING = _TOKEN.groupindex["lstring"]
+_OPEN = _TOKEN.groupindex["open"]
+_CLOSE = _TOKEN.groupindex["close"]
+_LBRACKET = _TOKEN.groupindex["lbracket"]
+_RBRACKET = _TOKEN.groupindex["rbracket"]
+_ASSIGN = _TOKEN.groupindex["assign"]
 
-def _unserialize(raw, encoding="utf-8", multival=False, verbose=False):
-    """Unserialize stringified lua data to python data
+# parser states
+_FIELD = 0          # start of a table field (or a statement on the top level)
+_VALUE = 1          # value after a key
+_SEPARATOR = 2      # separator or end of table after a value
+_KEY = 3            # key expression after "["
+_KEY_CLOSE = 4      # "]" after a key expression
+_KEY_ASSIGN = 5     # "=" after a key expression
 
-    Args:
-        raw (str): raw lua data string
-        encoding (str, optional): string encoding. Defaults to "utf-8".
-        multival (bool, optional): returns tuple for supporting multiple lua values likes "return 1, 2". Defaults to False.
-        verbose (bool, optional): show more verbose debug information. Defaults to False.
 
-    Raises:
-        Exception: unserialize errors
+def _unescape(match):
+    s = match.group(1)
+    if s.isdigit():
+        return bytes((int(s),))
+    # unknown escapes (like \\, \" or \') stand for the character itself
+    return _ESCAPES.get(s, s)
 
-    Returns:
-        tuple([*]): unserialized data
-    """
-    sbins = raw.encode(encoding)
-    root = {"entries": [], "lualen": 0, "is_root": True}
-    node = root
-    stack = []
-    state = "SEEK_CHILD"
-    pos = 0
-    slen = len(sbins)
-    byte_quoting_char = None
-    key = None
-    escaping = False
-    comment = None
-    component_name = None
-    errmsg = None
 
-    def sorter(kv):
-        if isinstance(kv[0], int):
-            return kv[0]
-        return math.inf
+def _error(raw, encoding, pos, errmsg):
+    pos = min(pos, len(raw))
+    start_pos = max(0, pos - 4)
+    end_pos = min(pos + 10, len(raw))
+    err_parts = raw[start_pos:end_pos].decode(encoding, errors="replace")
+    err_indent = " " * (pos - start_pos)
+    raise Exception(f"Unserialize luadata failed on pos {pos}:\n    {err_parts}\n    {err_indent}^\n    {errmsg}")
 
-    def node_entries_append(node, key, val):
-        node["entries"].append([key, val])
-        node["entries"].sort(key=sorter)
-        lualen = 0
-        for kv in node["entries"]:
-            if kv[0] == lualen + 1:
-                lualen = lualen + 1
-        node["lualen"] = lualen
 
-    def node_to_table(node):
-        if len(node["entries"]) == node["lualen"]:
-            lst = []
-            for kv in node["entries"]:
-                lst.append(kv[1])
-            return lst
+def _add_entry(items, entries, key, val):
+    """Adds a value to a table under construction and returns the (new) keyed entries."""
+    if key is None:
+        items.append(val)
+        if entries is not None:
+            if val is None:
+                entries.pop(len(items), None)
+            else:
+                entries[len(items)] = val
+        return entries
+    if entries is None:
+        entries = {i: v for i, v in enumerate(items, 1) if v is not None}
+    # positional fields win over keyed ones in Lua table constructors
+    if type(key) is not int or not 1 <= key <= len(items):
+        if val is None:
+            entries.pop(key, None)
         else:
-            dct = {}
-            for kv in node["entries"]:
-                dct[kv[0]] = kv[1]
-            return dct
+            entries[key] = val
+    return entries
 
-    while pos <= slen:
-        byte_current = None
-        byte_current_is_space = False
-        if pos < slen:
-            byte_current = sbins[pos: pos + 1]
-            byte_current_is_space = (
-                byte_current == b" "
-                or byte_current == b"\r"
-                or byte_current == b"\n"
-                or byte_current == b"\t"
-            )
-        if verbose:
-            print("[step] pos", pos, byte_current, state, comment, key, node)
 
-        if comment == "MULTILINE":
-            if byte_current == b"]" and sbins[pos: pos + 2] == b"]]":
-                comment = None
-                pos = pos + 1
-        elif comment == "INLINE":
-            if byte_current == b"\n":
-                comment = None
-        elif state == "SEEK_CHILD":
-            if byte_current is None:
-                break
-            if byte_current == b"-" and sbins[pos: pos + 4] == b"--[[":
-                comment = "MULTILINE"
-                pos = pos + 3
-            elif byte_current == b"-" and sbins[pos: pos + 2] == b"--":
-                comment = "INLINE"
-                pos = pos + 1
-            elif not node["is_root"] and (
-                (b"A" <= byte_current <= b"Z")
-                or (b"a" <= byte_current <= b"z")
-                or byte_current == b"_"
-            ):
-                state = "KEY_SIMPLE"
-                pos1 = pos
-            elif not node["is_root"] and byte_current == b"[":
-                state = "KEY_EXPRESSION_OPEN"
-            elif byte_current == b"}":
-                if len(stack) == 0:
-                    errmsg = (
-                        "unexpected table closing, no matching opening braces found."
-                    )
-                    break
-                prev_env = stack.pop()
-                if prev_env["state"] == "KEY_EXPRESSION_OPEN":
-                    key = node_to_table(node)
-                    state = "KEY_END"
-                elif prev_env["state"] == "VALUE":
-                    node_entries_append(
-                        prev_env["node"],
-                        prev_env["key"],
-                        node_to_table(node),
-                    )
-                    state = "VALUE_END"
-                    key = None
-                node = prev_env["node"]
-            elif not byte_current_is_space:
-                key = node["lualen"] + 1
-                state = "VALUE"
-                pos = pos - 1
-        elif state == "VALUE":
-            if byte_current is None:
-                errmsg = "unexpected empty value."
-                break
-            elif byte_current == b"-" and sbins[pos: pos + 4] == b"--[[":
-                comment = "MULTILINE"
-                pos = pos + 3
-            elif byte_current == b"-" and sbins[pos: pos + 2] == b"--":
-                comment = "INLINE"
-                pos = pos + 1
-            elif byte_current == b'"' or byte_current == b"'":
-                state = "TEXT"
-                component_name = "VALUE"
-                pos1 = pos + 1
-                byte_quoting_char = byte_current
-            elif byte_current == b"-" or (b"0" <= byte_current <= b"9"):
-                state = "INT"
-                component_name = "VALUE"
-                pos1 = pos
-            elif byte_current == b".":
-                state = "FLOAT"
-                component_name = "VALUE"
-                pos1 = pos
-            elif byte_current == b"t" and sbins[pos: pos + 4] == b"true":
-                node_entries_append(node, key, True)
-                state = "VALUE_END"
-                key = None
-                pos = pos + 3
-            elif byte_current == b"f" and sbins[pos: pos + 5] == b"false":
-                node_entries_append(node, key, False)
-                state = "VALUE_END"
-                key = None
-                pos = pos + 4
-            elif byte_current == b"{":
-                stack.append({"node": node, "state": state, "key": key})
-                state = "SEEK_CHILD"
-                node = {"entries": [], "lualen": 0, "is_root": False}
-        elif state == "TEXT":
-            if byte_current is None:
-                errmsg = "unexpected string ending: missing close quote."
-                break
-            if escaping:
-                escaping = False
-            elif byte_current == b"\\":
-                escaping = True
-            elif byte_current == byte_quoting_char:
-                data = (
-                    sbins[pos1:pos]
-                    .replace(b"\\\n", b"\n")
-                    .replace(b'\\"', b'"')
-                    .replace(b"\\\\", b"\\")
-                    .decode(encoding)
-                )
-                if component_name == "KEY":
-                    key = data
-                    state = "KEY_EXPRESSION_FINISH"
-                elif component_name == "VALUE":
-                    node_entries_append(node, key, data)
-                    state = "VALUE_END"
-                    key = None
-        elif state == "INT":
-            if byte_current == b"." or byte_current == b"e":
-                state = "FLOAT"
-            elif byte_current is None or byte_current < b"0" or byte_current > b"9":
-                data = int(sbins[pos1:pos].decode(encoding))
-                if component_name == "KEY":
-                    key = data
-                    state = "KEY_EXPRESSION_FINISH"
-                    pos = pos - 1
-                elif component_name == "VALUE":
-                    node_entries_append(node, key, data)
-                    state = "VALUE_END"
-                    key = None
-                    pos = pos - 1
-        elif state == "FLOAT":
-            if byte_current == b"e" or byte_current == b"-" or byte_current == b"+":
-                pass
-            elif byte_current is None or byte_current < b"0" or byte_current > b"9":
-                if pos == pos1 + 1 and sbins[pos1:pos] == b".":
-                    errmsg = "unexpected dot."
-                    break
-                else:
-                    data = float(sbins[pos1:pos].decode(encoding))
-                    if component_name == "KEY":
-                        key = data
-                        state = "KEY_EXPRESSION_FINISH"
-                        pos = pos - 1
-                    elif component_name == "VALUE":
-                        node_entries_append(node, key, data)
-                        state = "VALUE_END"
-                        key = None
-                        pos = pos - 1
-        elif state == "VALUE_END":
-            if byte_current is None:
-                pass
-            elif byte_current == b"-" and sbins[pos: pos + 4] == b"--[[":
-                comment = "MULTILINE"
-                pos = pos + 3
-            elif byte_current == b"-" and sbins[pos: pos + 2] == b"--":
-                comment = "INLINE"
-                pos = pos + 1
-            elif byte_current == b",":
-                state = "SEEK_CHILD"
-            elif byte_current == b"}":
-                state = "SEEK_CHILD"
-                pos = pos - 1
-            elif not byte_current_is_space:
-                errmsg = "unexpected character."
-                break
-        elif state == "KEY_EXPRESSION_OPEN":
-            if byte_current is None:
-                errmsg = "key expression expected."
-                break
-            if byte_current == b"-" and sbins[pos: pos + 4] == b"--[[":
-                comment = "MULTILINE"
-                pos = pos + 3
-            elif byte_current == b"-" and sbins[pos: pos + 2] == b"--":
-                comment = "INLINE"
-                pos = pos + 1
-            elif byte_current == b'"' or byte_current == b"'":
-                state = "TEXT"
-                component_name = "KEY"
-                pos1 = pos + 1
-                byte_quoting_char = byte_current
-            elif byte_current == b"-" or (
-                    b"0" <= byte_current <= b"9"
-            ):
-                state = "INT"
-                component_name = "KEY"
-                pos1 = pos
-            elif byte_current == b".":
-                state = "FLOAT"
-                component_name = "KEY"
-                pos1 = pos
-            elif byte_current == b"t" and sbins[pos: pos + 4] == b"true":
-                errmsg = "python do not support bool as dict key."
-                break
-            elif byte_current == b"f" and sbins[pos: pos + 5] == b"false":
-                errmsg = "python do not support bool variable as dict key."
-                break
-            elif byte_current == b"{":
-                errmsg = "python do not support lua table variable as dict key."
-                break
-        elif state == "KEY_EXPRESSION_FINISH":
-            if byte_current is None:
-                errmsg = 'unexpected end of table key expression, "]" expected.'
-                break
-            if byte_current == b"-" and sbins[pos: pos + 4] == b"--[[":
-                comment = "MULTILINE"
-                pos = pos + 3
-            elif byte_current == b"-" and sbins[pos: pos + 2] == b"--":
-                comment = "INLINE"
-                pos = pos + 1
-            elif byte_current == b"]":
-                state = "KEY_EXPRESSION_CLOSE"
-            elif not byte_current_is_space:
-                errmsg = 'unexpected character, "]" expected.'
-                break
-        elif state == "KEY_EXPRESSION_CLOSE":
-            if byte_current == b"=":
-                state = "VALUE"
-            elif byte_current == b"-" and sbins[pos: pos + 4] == b"--[[":
-                comment = "MULTILINE"
-                pos = pos + 3
-            elif byte_current == b"-" and sbins[pos: pos + 2] == b"--":
-                comment = "INLINE"
-                pos = pos + 1
-            elif not byte_current_is_space:
-                errmsg = 'unexpected character, "=" expected.'
-                break
-        elif state == "KEY_SIMPLE":
-            if not (
-                (b"A" <= byte_current <= b"Z")
-                or (b"a" <= byte_current <= b"z")
-                or (b"0" <= byte_current <= b"9")
-                or byte_current == b"_"
-            ):
-                key = sbins[pos1:pos].decode(encoding)
-                state = "KEY_SIMPLE_END"
-                pos = pos - 1
-        elif state == "KEY_SIMPLE_END":
-            if byte_current_is_space:
-                pass
-            elif byte_current == b"-" and sbins[pos: pos + 4] == b"--[[":
-                comment = "MULTILINE"
-                pos = pos + 3
-            elif byte_current == b"-" and sbins[pos: pos + 2] == b"--":
-                comment = "INLINE"
-                pos = pos + 1
-            elif byte_current == b"=":
-                state = "VALUE"
-            elif byte_current == b"," or byte_current == b"}":
-                if key == "true":
-                    node_entries_append(node, node["lualen"] + 1, True)
-                    state = "VALUE_END"
-                    key = None
-                    pos = pos - 1
-                elif key == "false":
-                    node_entries_append(node, node["lualen"] + 1, False)
-                    state = "VALUE_END"
-                    key = None
-                    pos = pos - 1
-                else:
-                    key = None
-                    errmsg = "invalid table simple key character."
-                    break
-        pos += 1
-        if verbose:
-            print("          ", pos, "    ", state, comment, key, node)
+def _to_table(items, entries):
+    if entries is None:
+        if None not in items:
+            return items
+        entries = {i: v for i, v in enumerate(items, 1) if v is not None}
+    # a table with the keys 1..n is a list
+    if all(type(k) is int for k in entries) and (not entries or (min(entries) == 1 and max(entries) == len(entries))):
+        return [entries[i] for i in range(1, len(entries) + 1)]
+    return entries
 
-    # check if there is any errors
-    if errmsg is None and len(stack) != 0:
-        errmsg = 'unexpected end of table, "}" expected.'
-    if errmsg is None and root["lualen"] == 0:
-        errmsg = "nothing can be unserialized from input string."
-    if errmsg is not None:
-        pos = min(pos, slen)
-        start_pos = max(0, pos - 4)
-        end_pos = min(pos + 10, slen)
-        err_parts = sbins[start_pos:end_pos].decode(encoding)
-        err_indent = " " * (pos - start_pos)
-        raise Exception(f"Unserialize luadata failed on pos {pos}:\n    {err_parts}\n    {err_indent}^\n    {errmsg}")
 
-    res = []
-    for kv in root["entries"]:
-        res.append(kv[1])
-    if multival:
-        return tuple(res)
-    return res[0]
+def _parse(raw, encoding):
+    stack = []
+    items = []
+    entries = None
+    key = None
+    state = _FIELD
+    pos = 0
+    token = _TOKEN.match
+    while True:
+        match = token(raw, pos)
+        if match is None:
+            break
+        pos = match.end()
+        kind = match.lastindex
+
+        if match.group(_SEPARATOR_TOKEN) is not None:
+            if state != _SEPARATOR:
+                _error(raw, encoding, match.start(_SEPARATOR_TOKEN), "unexpected character.")
+            state = _FIELD
+        if kind == _COMMENT or kind == _LCOMMENT:
+            continue
+        if state == _SEPARATOR:
+            if not stack and kind == _NAMEKEY:
+                # assignments on the top level do not need a separator
+                state = _FIELD
+            elif kind != _CLOSE:
+                _error(raw, encoding, match.start(kind), "unexpected character.")
+        if kind == _CLOSE and (state == _FIELD or state == _SEPARATOR):
+            if not stack:
+                _error(raw, encoding, match.start(kind), "unexpected table closing, no matching opening braces found.")
+            val = _to_table(items, entries)
+            items, entries, key = stack.pop()
+            entries = _add_entry(items, entries, key, val)
+            key = None
+            state = _SEPARATOR
+            continue
 
+        if state == _FIELD:
+            if kind == _SKEY:
+                key = match.group(kind + 1)
+                if key is None:
+                    key = match.group(kind + 2)
+                key = key.decode(encoding)
+                state = _VALUE
+                continue
+            elif kind == _NKEY:
+                key = int(match.group(kind + 1))
+                state = _VALUE
+                continue
+            elif kind == _NAMEKEY:
+                key = match.group(kind + 1).decode(encoding)
+                state = _VALUE
+                continue
+            elif kind == _LBRACKET:
+                state = _KEY
+                continue
+            elif kind == _NAME and match.group(kind) not in (b"true", b"false", b"nil"):
+                if match.group(kind) == b"return" and not stack and not items and entries is None:
+                    continue
+                _error(raw, encoding, match.start(kind), "invalid table simple key character.")
+        elif state == _KEY:
+            if kind == _OPEN:
+                _error(raw, encoding, match.start(kind), "python do not support lua table variable as dict key.")
+            elif kind == _NAME and match.group(kind) in (b"true", b"false"):
+                _error(raw, encoding, match.start(kind), "python do not support bool as dict key.")
+        elif state == _KEY_CLOSE:
+            if kind != _RBRACKET:
+                _error(raw, encoding, match.start(kind), 'unexpected character, "]" expected.')
+            state = _KEY_ASSIGN
+            continue
+        elif state == _KEY_ASSIGN:
+            if kind != _ASSIGN:
+                _error(raw, encoding, match.start(kind), 'unexpected character, "=" expected.')
+            state = _VALUE
+            continue
 
-def _lua_table_to_dict(lua_table):
-    # Check if a Lua table is a list
-    def is_lua_list(table):
-        keys = list(table.keys())
-        return all(isinstance(key, int) for key in keys) and sorted(keys) == list(range(1, len(keys) + 1))
+        # values
+        if kind == _STRING:
+            val = match.group(kind)[1:-1]
+            if b"\\" in val:
+                val = _ESCAPE.sub(_unescape, val)
+            val = val.decode(encoding)
+        elif kind == _NUMBER:
+            val = match.group(kind)
+            if val.isdigit() or (val[:1] == b"-" and val[1:].isdigit()):
+                val = int(val)
+            elif b"x" in val or b"X" in val:
+                val = int(val, 16)
+            else:
+                val = float(val)
+                # Lua 5.1 has no integers, integral numbers are returned as int (as lupa did)
+                if val.is_integer():
+                    val = int(val)
+        elif kind == _OPEN and state != _KEY:
+            stack.append((items, entries, key))
+            items = []
+            entries = None
+            key = None
+            state = _FIELD
+            continue
+        elif kind == _NAME and match.group(kind) == b"true":
+            val = True
+        elif kind == _NAME and match.group(kind) == b"false":
+            val = False
+        elif kind == _NAME and match.group(kind) == b"nil":
+            val = None
+        elif kind == _LSTRING:
+            val = match.group(kind + 2).decode(encoding)
+        elif kind == _CLOSE:
+            _error(raw, encoding, match.start(kind), "unexpected table closing, no matching opening braces found.")
+        else:
+            _error(raw, encoding, match.start(kind), "unexpected character.")
+
+        if state == _KEY:
+            key = val
+            state = _KEY_CLOSE
+            continue
+        if type(key) is str and entries is not None and val is not None:
+            entries[key] = val
+        elif key is None and entries is None:
+            items.append(val)
+        else:
+            entries = _add_entry(items, entries, key, val)
+        key = None
+        state = _SEPARATOR
 
-    # Handle conversion
-    if is_lua_list(lua_table):
-        # Convert to Python list
-        return [lua_table[i] if lua_type(lua_table[i]) != "table" else _lua_table_to_dict(lua_table[i])
-                for i in range(1, len(lua_table) + 1)]
-    else:
-        # Convert to Python dict
-        py_dict = {}
-        for key, value in lua_table.items():
-            if lua_type(value) == "table":
-                # Recursively convert nested Lua tables
-                value = _lua_table_to_dict(value)
-            py_dict[key] = value
-        return py_dict
+    # anything left that could not be read?
+    end = _SPACE.match(raw, pos).end()
+    if end < len(raw):
+        char = raw[end:end + 1]
+        if char in (b'"', b"'"):
+            _error(raw, encoding, end, "unexpected string ending: missing close quote.")
+        elif char == b".":
+            _error(raw, encoding, end, "unexpected dot.")
+        _error(raw, encoding, end, "unexpected character.")
+    if stack:
+        _error(raw, encoding, end, 'unexpected end of table, "}" expected.')
+    elif state == _VALUE:
+        _error(raw, encoding, end, "unexpected empty value.")
+    elif state == _KEY:
+        _error(raw, encoding, end, "key expression expected.")
+    elif state == _KEY_CLOSE:
+        _error(raw, encoding, end, 'unexpected end of table key expression, "]" expected.')
+    elif state == _KEY_ASSIGN:
+        _error(raw, encoding, end, 'unexpected character, "=" expected.')
+    elif not items and entries is None:
+        _error(raw, encoding, end, "nothing can be unserialized from input string.")
+    if entries is not None:
+        # assignments (like "mission = {...}"), the value of the first variable is returned
+        first = next(iter(entries), None)
+        return [entries.get(first)]
+    return items
 
 
 def unserialize(raw, encoding="utf-8", multival=False, verbose=False):
-    lua = LuaRuntime(unpack_returned_tuples=multival, encoding=encoding, max_memory=0)
-    lua.execute(raw)
-    variable = raw.split("=")[0].strip()
-    lua_table = lua.globals()[variable]
-    return _lua_table_to_dict(lua_table)
+    """Unserialize stringified lua data to python data
+
+    The input can either be one or more values (like "{1, 2}" or "return 1, 2") or one or more assignments
+    (like "mission = {...}"), in which case the value of the first variable is returned.
+    Tables with the keys 1..n are returned as lists, all others as dictionaries.
+    The input is read in one pass, without the need of a Lua interpreter.
+
+    Args:
+        raw (str): raw lua data string
+        encoding (str, optional): string encoding. Defaults to "utf-8".
+        multival (bool, optional): returns tuple for supporting multiple lua values likes "return 1, 2". Defaults to False.
+        verbose (bool, optional): not used anymore, kept for compatibility. Defaults to False.
+
+    Raises:
+        Exception: unserialize errors
+
+    Returns:
+        tuple([*]): unserialized data
+    """
+    res = _parse(raw.encode(encoding), encoding)
+    if multival:
+        return tuple(res)
+    return res[0]
@@ -611,6 +611,7 @@ class Admin(Plugin[AdminEventListener]):
                             await plugin.prune(conn, ucids=[ucid])
                             await cursor.execute('DELETE FROM players WHERE ucid = %s', (ucid, ))
                             await cursor.execute('DELETE FROM players_hist WHERE ucid = %s', (ucid, ))
+                        utils.player_index.remove(ucid)
                         if isinstance(user, discord.Member):
                             await interaction.followup.send(_("Data of user {} deleted.").format(user.display_name))
                         else:
@@ -643,6 +644,7 @@ class Admin(Plugin[AdminEventListener]):
                         for ucid in ucids:
                             await cursor.execute('DELETE FROM players WHERE ucid = %s', (ucid, ))
                             await cursor.execute('DELETE FROM players_hist WHERE ucid = %s', (ucid,))
+                            utils.player_index.remove(ucid)
                         await interaction.followup.send(f"{len(ucids)} players pruned.", ephemeral=ephemeral)
                     elif view.what == 'data':
                         days = int(view.age)
@@ -24,7 +24,8 @@ class AdminEventListener(EventListener["Admin"]):
     @event(name="enableExtension")
     async def enableExtension(self, server: Server, data: dict) -> None:
         extension = data['extension']
-        config = data.get('config', {})
+        # nested payload data is read-only
+        config = dict(data.get('config') or {})
         config['enabled'] = True
         asyncio.create_task(self.enable(server, extension, config))
 
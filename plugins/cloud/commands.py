@@ -300,9 +300,11 @@ class Cloud(Plugin[CloudListener]):
                                 VALUES (%s, %s, %s)
                                 ON CONFLICT (player_ucid) DO NOTHING
                             """, (ucid, reason, 'DGSA'))
+                            utils.player_index.update(ucid, watchlist=True)
                         # find watches to remove
                         for ucid in watches - external_bans:
                             await conn.execute("DELETE FROM watchlist WHERE player_ucid = %s", (ucid,))
+                            utils.player_index.update(ucid, watchlist=False)
             if self.config.get('discord-ban', False):
                 bans: dict = await self.get('discord-bans')
                 users_to_ban = {user for ban in bans if (user := await self.bot.fetch_user(ban['discord_id'])) is not None}
@@ -339,7 +341,7 @@ class Cloud(Plugin[CloudListener]):
                 async with conn.transaction():
                     async with conn.cursor(row_factory=dict_row) as cursor:
                         await cursor.execute("""
-                            SELECT s.player_ucid, m.mission_theatre, s.slot, 
+                            SELECT s.player_ucid, s.mission_theatre, s.slot, 
                                    SUM(s.kills) as kills, SUM(s.pvp) as pvp, SUM(deaths) as deaths, 
                                    SUM(ejections) as ejections, SUM(crashes) as crashes, 
                                    SUM(teamkills) as teamkills, SUM(kills_planes) AS kills_planes, 
@@ -349,9 +351,9 @@ class Cloud(Plugin[CloudListener]):
                                    SUM(deaths_helicopters) AS deaths_helicopters, SUM(deaths_ships) AS deaths_ships,
                                    SUM(deaths_sams) AS deaths_sams, SUM(deaths_ground) AS deaths_ground, 
                                    SUM(takeoffs) as takeoffs, SUM(landings) as landings, 
-                                   ROUND(SUM(EXTRACT(EPOCH FROM (s.hop_off - s.hop_on))))::BIGINT AS playtime 
-                            FROM statistics s, missions m 
-                            WHERE s.player_ucid = %s AND s.hop_off IS NOT null AND s.mission_id = m.id 
+                                   ROUND(SUM(s.playtime))::BIGINT AS playtime 
+                            FROM statistics_daily s 
+                            WHERE s.player_ucid = %s 
                             GROUP BY 1, 2, 3
                         """, (row[0], ))
                         async for line in cursor:
@@ -0,0 +1,130 @@
+# run from the root directory with: python -m plugins.creditsystem.__test__
+import asyncio
+import logging
+import unittest
+
+from contextlib import asynccontextmanager
+from core.utils.database import DatabaseWriter
+from plugins.creditsystem.player import CreditCache
+
+
+class _Connection:
+    """
+    Stands in for a connection of the async pool. The statements are only kept, if the transaction succeeds.
+    """
+    def __init__(self, pool: "_Pool"):
+        self.pool = pool
+        self.statements = []
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+        self.pool.committed.extend(self.statements)
+
+    @asynccontextmanager
+    async def cursor(self):
+        yield self
+
+    async def executemany(self, query: str, params: list) -> None:
+        if self.pool.fail:
+            raise ConnectionError('database is down')
+        table = 'credits_log' if 'credits_log' in query else 'credits'
+        self.statements.append((table, list(params)))
+
+
+class _Pool:
+    def __init__(self):
+        self.committed = []
+        self.fail = False
+
+    @asynccontextmanager
+    async def connection(self):
+        yield _Connection(self)
+
+    def rows(self, table: str) -> list:
+        return [row for name, params in self.committed if name == table for row in params]
+
+
+class TestCreditCache(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.pool = _Pool()
+        self.writer = DatabaseWriter(self.pool)
+        self.cache = CreditCache()
+        # failed jobs are logged by the writer
+        logging.disable(logging.CRITICAL)
+        self.addCleanup(logging.disable, logging.NOTSET)
+
+    async def asyncTearDown(self):
+        await self.writer.close()
+
+    async def test_batch(self):
+        self.cache.update(self.writer, 1, 'a', 10)
+        self.cache.audit(self.writer, 1, 'a', 'Test', 0, 10, 'first')
+        self.cache.update(self.writer, 1, 'a', 20)
+        self.cache.update(self.writer, 1, 'b', 5)
+        self.cache.audit(self.writer, 1, 'a', 'Test', 10, 20, 'second')
+        # changes are visible before they are written
+        self.assertEqual(self.cache.get(1, 'a'), 20)
+        await self.cache.flush()
+        self.assertEqual(len(self.pool.committed), 2)
+        self.assertCountEqual(self.pool.rows('credits'), [(1, 'a', 20), (1, 'b', 5)])
+        self.assertEqual([x[5] for x in self.pool.rows('credits_log')], ['first', 'second'])
+
+    async def test_next_batch(self):
+        self.cache.update(self.writer, 1, 'a', 10)
+        await self.cache.flush()
+        self.cache.update(self.writer, 1, 'a', 20)
+        await self.cache.flush()
+        self.assertEqual(self.pool.rows('credits'), [(1, 'a', 10), (1, 'a', 20)])
+        await self.cache.flush()
+        self.assertEqual(len(self.pool.committed), 2)
+
+    async def test_failed_write(self):
+        self.pool.fail = True
+        self.cache.update(self.writer, 1, 'a', 10)
+        self.cache.update(self.writer, 1, 'b', 10)
+        self.cache.audit(self.writer, 1, 'a', 'Test', 0, 10, 'first')
+        await self.cache.flush()
+        self.assertEqual(self.pool.committed, [])
+        # a newer change wins over the one that was not written
+        self.cache.update(self.writer, 1, 'a', 30)
+        self.cache.audit(self.writer, 1, 'a', 'Test', 10, 30, 'second')
+        self.pool.fail = False
+        await self.cache.flush()
+        self.assertCountEqual(self.pool.rows('credits'), [(1, 'a', 30), (1, 'b', 10)])
+        self.assertEqual([x[5] for x in self.pool.rows('credits_log')], ['first', 'second'])
+
+    async def test_retry_on_flush(self):
+        self.pool.fail = True
+        self.cache.update(self.writer, 1, 'a', 10)
+        await self.cache.flush()
+        self.pool.fail = False
+        # nothing changed since, but the pending change is written anyway
+        await self.cache.flush()
+        self.assertEqual(self.pool.rows('credits'), [(1, 'a', 10)])
+
+    async def test_change_while_writing(self):
+        self.cache.update(self.writer, 1, 'a', 10)
+        # the write starts, but did not finish
+        await asyncio.sleep(0)
+        self.cache.update(self.writer, 1, 'a', 20)
+        await self.cache.flush()
+        await self.cache.flush()
+        self.assertEqual(self.pool.rows('credits'), [(1, 'a', 10), (1, 'a', 20)])
+
+    async def test_forget(self):
+        self.cache.update(self.writer, 1, 'a', 10)
+        self.cache.update(self.writer, 2, 'a', 10)
+        self.cache.update(self.writer, 1, 'b', 10)
+        self.cache.audit(self.writer, 1, 'a', 'Test', 0, 10, 'first')
+        self.cache.forget('a')
+        self.assertIsNone(self.cache.get(1, 'a'))
+        self.assertEqual(self.cache.get(1, 'b'), 10)
+        await self.cache.flush()
+        self.assertEqual(self.pool.rows('credits'), [(1, 'b', 10)])
+        self.assertEqual(self.pool.rows('credits_log'), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
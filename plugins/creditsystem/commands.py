@@ -10,7 +10,7 @@ from services.bot import DCSServerBot
 from typing import Optional, cast, Union
 
 from .listener import CreditSystemListener
-from .player import CreditPlayer
+from .player import CreditPlayer, credit_cache
 
 _ = get_translation(__name__.split('.')[1])
 
@@ -36,16 +36,20 @@ class CreditSystem(Plugin[CreditSystemListener]):
             for ucid in ucids:
                 await conn.execute('DELETE FROM credits WHERE player_ucid = %s', (ucid,))
                 await conn.execute('DELETE FROM credits_log WHERE player_ucid = %s', (ucid,))
+                credit_cache.forget(ucid)
         self.log.debug('Creditsystem pruned.')
 
     async def rename(self, conn: psycopg.AsyncConnection, old_name: str, new_name: str):
         await conn.execute('UPDATE campaigns_servers SET server_name = %s WHERE server_name = %s', (new_name, old_name))
+        utils.campaign_cache.invalidate()
 
     async def update_ucid(self, conn: psycopg.AsyncConnection, old_ucid: str, new_ucid: str) -> None:
         await conn.execute('UPDATE credits SET player_ucid = %s WHERE player_ucid = %s', (new_ucid, old_ucid))
         await conn.execute('UPDATE credits_log SET player_ucid = %s WHERE player_ucid = %s', (new_ucid, old_ucid))
+        credit_cache.forget(old_ucid)
 
     async def get_credits(self, ucid: str) -> list[dict]:
+        await credit_cache.flush()
         async with self.apool.connection() as conn:
             async with conn.cursor(row_factory=dict_row) as cursor:
                 await cursor.execute("""
@@ -57,6 +61,7 @@ class CreditSystem(Plugin[CreditSystemListener]):
                 return await cursor.fetchall()
 
     async def get_credits_log(self, ucid: str) -> list[dict]:
+        await credit_cache.flush()
         async with self.apool.connection() as conn:
             async with conn.cursor(row_factory=dict_row) as cursor:
                 await cursor.execute("""
@@ -68,6 +73,15 @@ class CreditSystem(Plugin[CreditSystemListener]):
                 """, (ucid, ))
                 return await cursor.fetchall()
 
+    async def get_points(self, campaign_id: int, ucid: str) -> int:
+        async with self.apool.connection() as conn:
+            return (await credit_cache.load(conn, campaign_id, [ucid])).get(ucid, 0)
+
+    def add_points(self, campaign_id: int, ucid: str, old_points: int, points: int, remark: str) -> None:
+        # players that are not online are changed in the cache, too, to keep the order of the writes
+        credit_cache.update(self.node.db_writer, campaign_id, ucid, old_points + points)
+        credit_cache.audit(self.node.db_writer, campaign_id, ucid, 'donation', old_points, old_points + points, remark)
+
     # New command group "/credits"
     credits = Group(name="credits", description=_("Commands to manage player credits"))
 
@@ -169,61 +183,41 @@ class CreditSystem(Plugin[CreditSystemListener]):
             p_receiver = cast(CreditPlayer, server.get_player(ucid=receiver))
             if p_receiver:
                 break
-        async with self.apool.connection() as conn:
-            async with conn.transaction():
-                if not p_receiver:
-                    cursor = await conn.execute("""
-                        SELECT COALESCE(SUM(points), 0) 
-                        FROM credits 
-                        WHERE campaign_id = %s AND player_ucid = %s
-                    """, (data[n]['id'], receiver))
-                    old_points_receiver = (await cursor.fetchone())[0]
-                else:
-                    old_points_receiver = p_receiver.points
-                if 'max_points' in self.get_config() and \
-                        (old_points_receiver + donation) > int(self.get_config()['max_points']):
-                    await interaction.followup.send(
-                        _('Member {} would overrun the configured maximum points with this donation. Aborted.').format(
-                            utils.escape_string(to.display_name)))
-                    return
-                if p_receiver:
-                    p_receiver.points += donation
-                    p_receiver.audit('donation', old_points_receiver,
-                                     _('Donation from member {}').format(interaction.user.display_name))
-                else:
-                    await conn.execute("""
-                        INSERT INTO credits (campaign_id, player_ucid, points) 
-                        VALUES (%s, %s, %s) 
-                        ON CONFLICT (campaign_id, player_ucid) DO UPDATE 
-                        SET points = credits.points + EXCLUDED.points
-                    """, (data[n]['id'], receiver, donation))
-                    cursor = await conn.execute("""
-                        SELECT points FROM credits WHERE campaign_id = %s AND player_ucid = %s
-                    """, (data[n]['id'], receiver))
-                    new_points_receiver = (await cursor.fetchone())[0]
-                    await conn.execute("""
-                        INSERT INTO credits_log (campaign_id, event, player_ucid, old_points, new_points, remark) 
-                        VALUES (%s, %s, %s, %s, %s, %s)
-                    """, (data[n]['id'], 'donation', receiver, old_points_receiver, new_points_receiver,
-                          _('Credit points change by Admin {}').format(interaction.user.display_name)))
-            if donation > 0:
-                try:
-                    await (await to.create_dm()).send(
-                        _('You just received {} credit points from an Admin.').format(donation))
-                except discord.Forbidden:
-                    await interaction.followup.send(
-                        to.mention + _(', you just received {} credit points from an Admin.').format(donation))
-            else:
-                try:
-                    await (await to.create_dm()).send(
-                        _('Your credits were decreased by {} credit points by an Admin.').format(donation))
-                except discord.Forbidden:
-                    await interaction.followup.send(
-                        to.mention + _(', your credits were decreased by {} credit points by an Admin.').format(
-                            donation))
+        if not p_receiver:
+            old_points_receiver = await self.get_points(data[n]['id'], receiver)
+        else:
+            old_points_receiver = p_receiver.points
+        if 'max_points' in self.get_config() and \
+                (old_points_receiver + donation) > int(self.get_config()['max_points']):
             await interaction.followup.send(
-                _('Donated {credits} points to {name}.').format(credits=donation, name=to.display_name),
-                ephemeral=ephemeral)
+                _('Member {} would overrun the configured maximum points with this donation. Aborted.').format(
+                    utils.escape_string(to.display_name)))
+            return
+        if p_receiver:
+            p_receiver.points += donation
+            p_receiver.audit('donation', old_points_receiver,
+                             _('Donation from member {}').format(interaction.user.display_name))
+        else:
+            self.add_points(data[n]['id'], receiver, old_points_receiver, donation,
+                            _('Credit points change by Admin {}').format(interaction.user.display_name))
+        if donation > 0:
+            try:
+                await (await to.create_dm()).send(
+                    _('You just received {} credit points from an Admin.').format(donation))
+            except discord.Forbidden:
+                await interaction.followup.send(
+                    to.mention + _(', you just received {} credit points from an Admin.').format(donation))
+        else:
+            try:
+                await (await to.create_dm()).send(
+                    _('Your credits were decreased by {} credit points by an Admin.').format(donation))
+            except discord.Forbidden:
+                await interaction.followup.send(
+                    to.mention + _(', your credits were decreased by {} credit points by an Admin.').format(
+                        donation))
+        await interaction.followup.send(
+            _('Donated {credits} points to {name}.').format(credits=donation, name=to.display_name),
+            ephemeral=ephemeral)
 
     @credits.command(description=_('Donate credits to another member'))
     @utils.app_has_role('DCS')
@@ -285,65 +279,37 @@ class CreditSystem(Plugin[CreditSystemListener]):
             p_receiver = cast(CreditPlayer, server.get_player(ucid=receiver))
             if p_receiver:
                 break
-        async with self.apool.connection() as conn:
-            async with conn.transaction():
-                if not p_receiver:
-                    cursor = await conn.execute("""
-                        SELECT COALESCE(SUM(points), 0) FROM credits WHERE campaign_id = %s AND player_ucid = %s
-                    """, (data[n]['id'], receiver))
-                    old_points_receiver = (await cursor.fetchone())[0]
-                else:
-                    old_points_receiver = p_receiver.points
-                if 'max_points' in self.get_config() and \
-                        (old_points_receiver + donation) > int(self.get_config()['max_points']):
-                    await interaction.followup.send(
-                        _('Member {} would overrun the configured maximum points with this donation. Aborted.').format(
-                            utils.escape_string(to.display_name)), ephemeral=True)
-                    return
-                if p_donor:
-                    p_donor.points -= donation
-                    p_donor.audit('donation', data[n]['credits'], _('Donation to member {}').format(to.display_name))
-                else:
-                    await conn.execute("""
-                        UPDATE credits SET points = points - %s WHERE campaign_id = %s AND player_ucid = %s
-                    """, (donation, data[n]['id'], donor))
-                    cursor = await conn.execute("""
-                        SELECT points FROM credits WHERE campaign_id = %s AND player_ucid = %s
-                    """, (data[n]['id'], donor))
-                    new_points_donor = (await cursor.fetchone())[0]
-                    await conn.execute("""
-                        INSERT INTO credits_log (campaign_id, event, player_ucid, old_points, new_points, remark) 
-                        VALUES (%s, %s, %s, %s, %s, %s)
-                    """, (data[n]['id'], 'donation', donor, data[n]['credits'], new_points_donor,
-                          _('Donation to member {}').format(to.display_name)))
-                if p_receiver:
-                    p_receiver.points += donation
-                    p_receiver.audit('donation', old_points_receiver,
-                                     _('Donation from member {}').format(interaction.user.display_name))
-                else:
-                    await conn.execute("""
-                        INSERT INTO credits (campaign_id, player_ucid, points) 
-                        VALUES (%s, %s, %s) 
-                        ON CONFLICT (campaign_id, player_ucid) DO UPDATE 
-                        SET points = credits.points + EXCLUDED.points
-                    """, (data[n]['id'], receiver, donation))
-                    cursor = await conn.execute("""
-                        SELECT points FROM credits WHERE campaign_id = %s AND player_ucid = %s
-                    """, (data[n]['id'], receiver))
-                    new_points_receiver = (await cursor.fetchone())[0]
-                    await conn.execute("""
-                        INSERT INTO credits_log (campaign_id, event, player_ucid, old_points, new_points, remark) 
-                        VALUES (%s, %s, %s, %s, %s, %s)
-                    """, (data[n]['id'], 'donation', receiver, old_points_receiver, new_points_receiver,
-                          _('Donation from member {}').format(interaction.user.display_name)))
-            try:
-                await (await to.create_dm()).send(
-                    _('You just received {donation} credit points from {member}!').format(
-                        donation=donation, member=utils.escape_string(interaction.user.display_name)))
-            except discord.Forbidden:
-                await interaction.followup.send(
-                    to.mention + _(', you just received {donation} credit points from {member}!').format(
-                        donation=donation, member=utils.escape_string(interaction.user.display_name)))
+        if not p_receiver:
+            old_points_receiver = await self.get_points(data[n]['id'], receiver)
+        else:
+            old_points_receiver = p_receiver.points
+        if 'max_points' in self.get_config() and \
+                (old_points_receiver + donation) > int(self.get_config()['max_points']):
+            await interaction.followup.send(
+                _('Member {} would overrun the configured maximum points with this donation. Aborted.').format(
+                    utils.escape_string(to.display_name)), ephemeral=True)
+            return
+        if p_donor:
+            p_donor.points -= donation
+            p_donor.audit('donation', data[n]['credits'], _('Donation to member {}').format(to.display_name))
+        else:
+            self.add_points(data[n]['id'], donor, data[n]['credits'], -donation,
+                            _('Donation to member {}').format(to.display_name))
+        if p_receiver:
+            p_receiver.points += donation
+            p_receiver.audit('donation', old_points_receiver,
+                             _('Donation from member {}').format(interaction.user.display_name))
+        else:
+            self.add_points(data[n]['id'], receiver, old_points_receiver, donation,
+                            _('Donation from member {}').format(interaction.user.display_name))
+        try:
+            await (await to.create_dm()).send(
+                _('You just received {donation} credit points from {member}!').format(
+                    donation=donation, member=utils.escape_string(interaction.user.display_name)))
+        except discord.Forbidden:
+            await interaction.followup.send(
+                to.mention + _(', you just received {donation} credit points from {member}!').format(
+                    donation=donation, member=utils.escape_string(interaction.user.display_name)))
 
     @tasks.loop(minutes=5)
     async def update_leaderboard(self):
@@ -1,7 +1,122 @@
-from contextlib import closing
-from core import Player, DataObjectFactory, utils, Plugin
+import asyncio
+import psycopg
+
+from core import Player, DataObjectFactory, Plugin, utils
 from dataclasses import field, dataclass
-from typing import cast
+from typing import Any, cast, Optional
+
+
+class CreditCache:
+    """
+    Write-through cache of the credit points per (campaign, player).
+    Changes are visible immediately and written to the credits and credits_log tables in batches: the first change
+    schedules a write on the DatabaseWriter, all changes that happen until that write runs are written with it.
+    If a write fails, its changes are kept and written together with the next change.
+    """
+    def __init__(self):
+        self._points: dict[tuple[int, str], int] = {}
+        self._updates: dict[tuple[int, str], int] = {}
+        self._log: list[tuple[int, str, str, int, int, str]] = []
+        self._write: Optional[asyncio.Future] = None
+        self._writer: Optional[utils.DatabaseWriter] = None
+
+    def get(self, campaign_id: int, ucid: str) -> Optional[int]:
+        return self._points.get((campaign_id, ucid))
+
+    async def load(self, conn: psycopg.AsyncConnection, campaign_id: int, ucids: list[str]) -> dict[str, int]:
+        """
+        Returns the points of the given players, players without credits are not part of the result.
+        """
+        ret = {}
+        missing = []
+        for ucid in ucids:
+            points = self._points.get((campaign_id, ucid))
+            if points is not None:
+                ret[ucid] = points
+            else:
+                missing.append(ucid)
+        if missing:
+            cursor = await conn.execute("""
+                SELECT player_ucid, points FROM credits WHERE campaign_id = %s AND player_ucid = ANY(%s)
+            """, (campaign_id, missing))
+            async for ucid, points in cursor:
+                # don't overwrite changes that happened while we were reading
+                ret[ucid] = self._points.setdefault((campaign_id, ucid), points)
+        return ret
+
+    def update(self, writer: utils.DatabaseWriter, campaign_id: int, ucid: str, points: int) -> None:
+        self._points[(campaign_id, ucid)] = points
+        self._updates[(campaign_id, ucid)] = points
+        self._schedule(writer)
+
+    def audit(self, writer: utils.DatabaseWriter, campaign_id: int, ucid: str, event: str, old_points: int,
+              new_points: int, remark: str) -> None:
+        self._log.append((campaign_id, event, ucid, old_points, new_points, remark))
+        self._schedule(writer)
+
+    def forget(self, ucid: str) -> None:
+        """
+        Drops all cached points and pending changes of a player, whose credits were changed in the database directly.
+        """
+        for data in [self._points, self._updates]:
+            for key in [x for x in data.keys() if x[1] == ucid]:
+                del data[key]
+        self._log = [x for x in self._log if x[2] != ucid]
+
+    async def flush(self) -> None:
+        """
+        Waits until all pending changes are written to the database.
+        """
+        if not self._write and (self._updates or self._log) and self._writer:
+            # the last write failed, try again
+            self._schedule(self._writer)
+        if self._write:
+            await asyncio.wait([self._write])
+
+    def _schedule(self, writer: utils.DatabaseWriter) -> None:
+        self._writer = writer
+        if self._write:
+            return
+        batch: dict[str, Any] = {}
+
+        async def write(conn: psycopg.AsyncConnection) -> None:
+            # changes from now on go into the next write
+            self._write = None
+            batch['updates'], self._updates = self._updates, {}
+            batch['log'], self._log = self._log, []
+            await self._flush(conn, batch['updates'], batch['log'])
+
+        def done(future: asyncio.Future) -> None:
+            if not future.cancelled() and not future.exception():
+                return
+            if self._write is future:
+                self._write = None
+            # put the changes back, they will be written with the next change
+            for key, points in batch.get('updates', {}).items():
+                self._updates.setdefault(key, points)
+            self._log[:0] = batch.get('log', [])
+
+        self._write = writer.submit(write)
+        self._write.add_done_callback(done)
+
+    @staticmethod
+    async def _flush(conn: psycopg.AsyncConnection, updates: dict[tuple[int, str], int],
+                     log: list[tuple[int, str, str, int, int, str]]) -> None:
+        async with conn.cursor() as cursor:
+            if updates:
+                await cursor.executemany("""
+                    INSERT INTO credits (campaign_id, player_ucid, points)
+                    VALUES (%s, %s, %s)
+                    ON CONFLICT (campaign_id, player_ucid) DO UPDATE SET points = EXCLUDED.points
+                """, [(campaign_id, ucid, points) for (campaign_id, ucid), points in updates.items()])
+            if log:
+                await cursor.executemany("""
+                    INSERT INTO credits_log (campaign_id, event, player_ucid, old_points, new_points, remark)
+                    VALUES (%s, %s, %s, %s, %s, %s)
+                """, log)
+
+
+credit_cache = CreditCache()
 
 
 @dataclass
@@ -11,21 +126,35 @@ class CreditPlayer(Player):
     deposit: int = field(compare=False, default=0)
 
     @property
-    def points(self) -> int:
-        if self._points == -1:
-            with self.pool.connection() as conn:
-                with closing(conn.cursor()) as cursor:
-                    # load credit points
-                    campaign_id, _ = utils.get_running_campaign(self.bot, self.server)
-                    if not campaign_id:
-                        return -1
-                    cursor.execute('SELECT points FROM credits WHERE campaign_id = %s AND player_ucid = %s',
-                                   (campaign_id, self.ucid))
-                    if cursor.rowcount == 1:
-                        self._points = cursor.fetchone()[0]
+    def campaign_id(self) -> Optional[int]:
+        return utils.get_running_campaign(self.bot, self.server)[0]
+
+    @classmethod
+    async def load_all(cls, players: list[Player]) -> None:
+        await super().load_all(players)
+        # the campaign depends on the server
+        servers: dict[str, list[CreditPlayer]] = {}
+        for player in players:
+            if player.id != 1:
+                servers.setdefault(player.server.name, []).append(cast(CreditPlayer, player))
+        if not servers:
+            return
+        async with players[0].apool.connection() as conn:
+            # load credit points
+            for server_players in servers.values():
+                campaign_id = server_players[0].campaign_id
+                if not campaign_id:
+                    continue
+                points = await credit_cache.load(conn, campaign_id, [x.ucid for x in server_players])
+                for player in server_players:
+                    if player.ucid in points:
+                        player._points = points[player.ucid]
                     else:
-                        self.log.debug(
-                            f'CreditPlayer: No entry found in credits table for player {self.name}({self.ucid})')
+                        player.log.debug(f'CreditPlayer: No entry found in credits table for player '
+                                         f'{player.name}({player.ucid})')
+
+    @property
+    def points(self) -> int:
         return self._points
 
     @points.setter
@@ -41,15 +170,10 @@ class CreditPlayer(Player):
             self._points = 0
         else:
             self._points = p
-        campaign_id, _ = utils.get_running_campaign(self.bot, self.server)
+        campaign_id = self.campaign_id
         if campaign_id:
-            with self.pool.connection() as conn:
-                with conn.transaction():
-                    conn.execute("""
-                        INSERT INTO credits (campaign_id, player_ucid, points) 
-                        VALUES (%s, %s, %s) 
-                        ON CONFLICT (campaign_id, player_ucid) DO UPDATE SET points = EXCLUDED.points
-                    """, (campaign_id, self.ucid, self._points))
+            # the database is updated in the background, in the order of the changes
+            credit_cache.update(self.node.db_writer, campaign_id, self.ucid, self._points)
         else:
             self.log.debug("No campaign active, player points will vanish after a bot restart.")
         # sending points to DCS
@@ -62,12 +186,6 @@ class CreditPlayer(Player):
     def audit(self, event: str, old_points: int, remark: str):
         if old_points == self.points:
             return
-        campaign_id, _ = utils.get_running_campaign(self.bot, self.server)
-        if not campaign_id:
-            return
-        with self.pool.connection() as conn:
-            with conn.transaction():
-                conn.execute("""
-                    INSERT INTO credits_log (campaign_id, event, player_ucid, old_points, new_points, remark) 
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                """, (campaign_id, event, self.ucid, old_points, self._points, remark))
+        campaign_id = self.campaign_id
+        if campaign_id:
+            credit_cache.audit(self.node.db_writer, campaign_id, self.ucid, event, old_points, self._points, remark)
@@ -58,21 +58,11 @@ class FunkMan(Plugin[FunkManEventListener]):
             return True
         return False
 
-    def get_config(self, server: Optional[Server] = None, *, plugin_name: Optional[str] = None,
-                   use_cache: Optional[bool] = True) -> dict:
-        # retrieve the config from another plugin
-        if plugin_name:
-            return super().get_config(server, plugin_name=plugin_name, use_cache=use_cache)
-        if not server:
-            return self.locals.get(DEFAULT_TAG, {})
-        if server.node.name not in self._config:
-            self._config[server.node.name] = {}
-        if server.instance.name not in self._config[server.node.name] or not use_cache:
-            default, specific = self.get_base_config(server)
-            for x in ['strafe_board', 'strafe_channel', 'bomb_board', 'bomb_channel']:
-                default.pop(x, None)
-            self._config[server.node.name][server.instance.name] = default | specific
-        return self._config[server.node.name][server.instance.name]
+    def build_config(self, server: Server) -> dict:
+        default, specific = self.get_base_config(server)
+        for x in ['strafe_board', 'strafe_channel', 'bomb_board', 'bomb_channel']:
+            default.pop(x, None)
+        return default | specific
 
     async def prune(self, conn: psycopg.AsyncConnection, *, days: int = -1, ucids: list[str] = None,
                     server: Optional[str] = None) -> None:
@@ -150,14 +150,14 @@ class FunkManEventListener(EventListener["FunkMan"]):
         # noinspection PyAsyncCall
         asyncio.create_task(channel.send(data['text'], delete_after=self.config.get('delete_after')))
 
-    @event(name="moose_bomb_result")
+    @event(name="moose_bomb_result", mutable=True)
     async def moose_bomb_result(self, server: Server, data: dict) -> None:
         config = self.plugin.get_config(server)
         player: Player = server.get_player(name=data['player'])
         if player:
-            with self.pool.connection() as conn:
-                with conn.transaction():
-                    conn.execute("""
+            async with self.apool.connection() as conn:
+                async with conn.transaction():
+                    await conn.execute("""
                         INSERT INTO bomb_runs (mission_id, player_ucid, unit_type, range_name, distance, quality)
                         VALUES (%s, %s, %s, %s, %s, %s)
                     """, (server.mission_id, player.ucid, player.unit_type, data.get('rangename', 'n/a'),
@@ -174,14 +174,14 @@ class FunkManEventListener(EventListener["FunkMan"]):
         # noinspection PyAsyncCall
         asyncio.create_task(self.send_fig(fig, channel))
 
-    @event(name="moose_strafe_result")
+    @event(name="moose_strafe_result", mutable=True)
     async def moose_strafe_result(self, server: Server, data: dict) -> None:
         config = self.plugin.get_config(server)
         player: Player = server.get_player(name=data['player'])
         if player:
-            with self.pool.connection() as conn:
-                with conn.transaction():
-                    conn.execute("""
+            async with self.apool.connection() as conn:
+                async with conn.transaction():
+                    await conn.execute("""
                         INSERT INTO strafe_runs (mission_id, player_ucid, unit_type, range_name, accuracy, quality)
                         VALUES (%s, %s, %s, %s, %s, %s)
                     """, (server.mission_id, player.ucid, player.unit_type, data.get('rangename', 'n/a'),
@@ -198,7 +198,7 @@ class FunkManEventListener(EventListener["FunkMan"]):
         # noinspection PyAsyncCall
         asyncio.create_task(self.send_fig(fig, channel))
 
-    @event(name="moose_lso_grade")
+    @event(name="moose_lso_grade", mutable=True)
     async def moose_lso_grade(self, server: Server, data: dict) -> None:
         config = self.plugin.get_config(server)
         channel = self.bot.get_channel(int(config.get('CHANNELID_AIRBOSS', -1)))
@@ -108,10 +108,13 @@ class GameMaster(Plugin[GameMasterEventListener]):
         if server:
             await conn.execute("DELETE FROM campaigns_servers WHERE server_name = %s", (server, ))
             await conn.execute("DELETE FROM coalitions WHERE server_name = %s", (server, ))
+        if days > -1 or server:
+            utils.campaign_cache.invalidate()
         self.log.debug('Gamemaster pruned.')
 
     async def rename(self, conn: psycopg.AsyncConnection, old_name: str, new_name: str):
         await conn.execute('UPDATE campaigns_servers SET server_name = %s WHERE server_name = %s', (new_name, old_name))
+        utils.campaign_cache.invalidate()
 
     async def update_ucid(self, conn: psycopg.AsyncConnection, old_ucid: str, new_ucid: str) -> None:
         await conn.execute('UPDATE coalitions SET player_ucid = %s WHERE player_ucid = %s', (new_ucid, old_ucid))
@@ -355,6 +358,7 @@ class GameMaster(Plugin[GameMasterEventListener]):
                         SELECT id, %s FROM campaigns WHERE name = %s 
                         ON CONFLICT DO NOTHING
                         """, (server.name, campaign))
+            utils.campaign_cache.invalidate()
             # noinspection PyUnresolvedReferences
             await interaction.response.send_message(
                 _("Server {server} added to campaign {campaign}.").format(server=server.name, campaign=campaign),
@@ -381,6 +385,7 @@ class GameMaster(Plugin[GameMasterEventListener]):
                         SELECT id FROM campaigns WHERE name = %s 
                     ) AND server_name = %s 
                     """, (campaign, server_name))
+        utils.campaign_cache.invalidate()
         # noinspection PyUnresolvedReferences
         await interaction.response.send_message(
             _("Server {server} deleted from campaign {campaign}.").format(server=server_name, campaign=campaign),
@@ -177,50 +177,57 @@ class GameMasterEventListener(EventListener["GameMaster"]):
     async def campaign(self, command: str, *, servers: Optional[list[Server]] = None, name: Optional[str] = None,
                        description: Optional[str] = None, start: Optional[datetime] = None,
                        end: Optional[datetime] = None):
-        async with self.apool.connection() as conn:
-            async with conn.transaction():
-                if command == 'add':
-                    await conn.execute('INSERT INTO campaigns (name, description, start, stop) VALUES (%s, %s, %s, %s)',
-                                       (name, description, start, end))
-                    if servers:
-                        cursor = await conn.execute('SELECT id FROM campaigns WHERE name ILIKE %s', (name,))
-                        campaign_id = (await cursor.fetchone())[0]
-                        for server in servers:
-                            # add this server to the server list
-                            await conn.execute('INSERT INTO campaigns_servers VALUES (%s, %s) ON CONFLICT DO NOTHING',
-                                               (campaign_id, server.name))
-                elif command == 'start':
-                    cursor = await conn.execute("""
-                        SELECT id FROM campaigns WHERE name ILIKE %s 
-                        AND (now() AT TIME ZONE 'utc') BETWEEN start 
-                        AND COALESCE(stop, (now() AT TIME ZONE 'utc'))
-                    """, (name,))
-                    if cursor.rowcount == 0:
-                        await conn.execute('INSERT INTO campaigns (name) VALUES (%s)', (name,))
-                    else:
-                        raise ValueError(f"Campaign {name} is already active!")
-                    if servers:
+        try:
+            async with self.apool.connection() as conn:
+                async with conn.transaction():
+                    if command == 'add':
+                        await conn.execute("""
+                            INSERT INTO campaigns (name, description, start, stop) VALUES (%s, %s, %s, %s)
+                        """, (name, description, start, end))
+                        if servers:
+                            cursor = await conn.execute('SELECT id FROM campaigns WHERE name ILIKE %s', (name,))
+                            campaign_id = (await cursor.fetchone())[0]
+                            for server in servers:
+                                # add this server to the server list
+                                await conn.execute("""
+                                    INSERT INTO campaigns_servers VALUES (%s, %s) ON CONFLICT DO NOTHING
+                                """, (campaign_id, server.name))
+                    elif command == 'start':
                         cursor = await conn.execute("""
                             SELECT id FROM campaigns WHERE name ILIKE %s 
                             AND (now() AT TIME ZONE 'utc') BETWEEN start 
                             AND COALESCE(stop, (now() AT TIME ZONE 'utc'))
                         """, (name,))
-                        # don't use currval() in here, as we can't rely on the sequence name
+                        if cursor.rowcount == 0:
+                            await conn.execute('INSERT INTO campaigns (name) VALUES (%s)', (name,))
+                        else:
+                            raise ValueError(f"Campaign {name} is already active!")
+                        if servers:
+                            cursor = await conn.execute("""
+                                SELECT id FROM campaigns WHERE name ILIKE %s 
+                                AND (now() AT TIME ZONE 'utc') BETWEEN start 
+                                AND COALESCE(stop, (now() AT TIME ZONE 'utc'))
+                            """, (name,))
+                            # don't use currval() in here, as we can't rely on the sequence name
+                            campaign_id = (await cursor.fetchone())[0]
+                            for server in servers:
+                                await conn.execute("""
+                                    INSERT INTO campaigns_servers VALUES (%s, %s) ON CONFLICT DO NOTHING
+                                """, (campaign_id, server.name,))
+                    elif command == 'stop':
+                        await conn.execute("""
+                            UPDATE campaigns SET stop = (now() AT TIME ZONE 'utc') WHERE name ILIKE %s 
+                            AND (now() AT TIME ZONE 'utc') BETWEEN start 
+                            AND COALESCE(stop, (now() AT TIME ZONE 'utc') )
+                        """, (name,))
+                    elif command == 'delete':
+                        cursor = await conn.execute('SELECT id FROM campaigns WHERE name ILIKE %s', (name,))
                         campaign_id = (await cursor.fetchone())[0]
-                        for server in servers:
-                            await conn.execute("INSERT INTO campaigns_servers VALUES (%s, %s) ON CONFLICT DO NOTHING",
-                                               (campaign_id, server.name,))
-                elif command == 'stop':
-                    await conn.execute("""
-                        UPDATE campaigns SET stop = (now() AT TIME ZONE 'utc') WHERE name ILIKE %s 
-                        AND (now() AT TIME ZONE 'utc') BETWEEN start 
-                        AND COALESCE(stop, (now() AT TIME ZONE 'utc') )
-                    """, (name,))
-                elif command == 'delete':
-                    cursor = await conn.execute('SELECT id FROM campaigns WHERE name ILIKE %s', (name,))
-                    campaign_id = (await cursor.fetchone())[0]
-                    await conn.execute('DELETE FROM campaigns_servers WHERE campaign_id = %s', (campaign_id,))
-                    await conn.execute('DELETE FROM campaigns WHERE id = %s', (campaign_id,))
+                        await conn.execute('DELETE FROM campaigns_servers WHERE campaign_id = %s', (campaign_id,))
+                        await conn.execute('DELETE FROM campaigns WHERE id = %s', (campaign_id,))
+        finally:
+            # the running campaign might have changed
+            utils.campaign_cache.invalidate()
 
     @event(name="startCampaign")
     async def startCampaign(self, server: Server, data: dict) -> None:
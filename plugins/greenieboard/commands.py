@@ -7,7 +7,7 @@ import psycopg
 import shutil
 
 from contextlib import suppress
-from core import Plugin, PluginRequiredError, utils, PaginationReport, Report, Group, Server, DEFAULT_TAG, \
+from core import Plugin, PluginRequiredError, utils, PaginationReport, Report, Group, Server, \
     get_translation
 from discord import SelectOption, app_commands
 from discord.app_commands import Range
@@ -56,23 +56,13 @@ class GreenieBoard(Plugin[GreenieBoardEventListener]):
             config = super().read_locals()
         return config
 
-    def get_config(self, server: Optional[Server] = None, *, plugin_name: Optional[str] = None,
-                   use_cache: Optional[bool] = True) -> dict:
-        # retrieve the config from another plugin
-        if plugin_name:
-            return super().get_config(server, plugin_name=plugin_name, use_cache=use_cache)
-        if not server:
-            return self.locals.get(DEFAULT_TAG, {})
-        if server.node.name not in self._config:
-            self._config[server.node.name] = {}
-        if server.instance.name not in self._config[server.node.name] or not use_cache:
-            default, specific = self.get_base_config(server)
-            if 'persistent_board' in default:
-                del default['persistent_board']
-            if 'persistent_channel' in default:
-                del default['persistent_channel']
-            self._config[server.node.name][server.instance.name] = default | specific
-        return self._config[server.node.name][server.instance.name]
+    def build_config(self, server: Server) -> dict:
+        default, specific = self.get_base_config(server)
+        if 'persistent_board' in default:
+            del default['persistent_board']
+        if 'persistent_channel' in default:
+            del default['persistent_channel']
+        return default | specific
 
     def plot_trapheet(self, filename: str) -> bytes:
         ts = read_trapsheet(filename)
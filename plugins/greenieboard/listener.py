@@ -244,7 +244,7 @@ class GreenieBoardEventListener(EventListener["GreenieBoard"]):
                 # noinspection PyAsyncCall
                 asyncio.create_task(self.update_greenieboard(server))
 
-    @event(name="moose_lso_grade")
+    @event(name="moose_lso_grade", mutable=True)
     async def moose_lso_grade(self, server: Server, data: dict) -> None:
         config = self.plugin.get_config(server)
         player: Player = server.get_player(name=data['name']) if 'name' in data else None
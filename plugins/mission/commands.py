@@ -701,7 +701,8 @@ class Mission(Plugin[MissionEventListener]):
         ephemeral = utils.get_ephemeral(interaction)
         # noinspection PyUnresolvedReferences
         await interaction.response.defer(ephemeral=ephemeral)
-        miz = await asyncio.to_thread(MizFile, server.current_mission.filename)
+        miz = MizFile(server.current_mission.filename)
+        await asyncio.to_thread(miz.load)
         config_file = os.path.join(self.node.config_dir, 'presets.yaml')
         if os.path.exists(config_file):
             with open(config_file, mode='r', encoding='utf-8') as infile:
@@ -1151,6 +1152,7 @@ class Mission(Plugin[MissionEventListener]):
                 async with conn.transaction():
                     await conn.execute("INSERT INTO watchlist (player_ucid, reason, created_by) VALUES (%s, %s, %s)",
                                        (ucid, reason, interaction.user.display_name))
+            utils.player_index.update(ucid, watchlist=True)
             # noinspection PyUnresolvedReferences
             await interaction.response.send_message(_("Player {} is now on the watchlist.").format(
                 user.display_name if isinstance(user, discord.Member) else ucid),
@@ -1180,6 +1182,7 @@ class Mission(Plugin[MissionEventListener]):
         async with self.apool.connection() as conn:
             async with conn.transaction():
                 await conn.execute("DELETE FROM watchlist WHERE player_ucid = %s", (ucid, ))
+        utils.player_index.update(ucid, watchlist=False)
         # noinspection PyUnresolvedReferences
         await interaction.response.send_message(
             _("Player {} removed from the watchlist.").format(
@@ -1321,6 +1324,7 @@ class Mission(Plugin[MissionEventListener]):
                     break
             else:
                 await conn.execute('UPDATE players SET discord_id = -1, manual = FALSE WHERE ucid = %s', (ucid,))
+                utils.player_index.update(ucid, discord_id=-1, manual=False)
                 server = None
             await interaction.followup.send(_('Member {name} unlinked from UCID {ucid}.').format(
                 name=utils.escape_string(member.display_name), ucid=ucid), ephemeral=ephemeral)
@@ -1513,6 +1517,7 @@ class Mission(Plugin[MissionEventListener]):
                 async with conn.transaction():
                     await conn.execute('UPDATE players SET discord_id = %s, manual = TRUE WHERE ucid = %s',
                                        (unmatched[n]['match'].id, unmatched[n]['ucid']))
+                    utils.player_index.update(unmatched[n]['ucid'], discord_id=unmatched[n]['match'].id, manual=True)
                     await self.bot.audit(
                         f"linked ucid {unmatched[n]['ucid']} to user {unmatched[n]['match'].display_name}.",
                         user=interaction.user)
@@ -1573,6 +1578,9 @@ class Mission(Plugin[MissionEventListener]):
                     await conn.execute('UPDATE players SET discord_id = %s, manual = %s WHERE ucid = %s',
                                        (suspicious[n]['match'].id if 'match' in suspicious[n] else -1,
                                         'match' in suspicious[n], suspicious[n]['ucid']))
+                    utils.player_index.update(suspicious[n]['ucid'],
+                                              discord_id=suspicious[n]['match'].id if 'match' in suspicious[n] else -1,
+                                              manual='match' in suspicious[n])
                     await self.bot.audit(
                         f"unlinked ucid {suspicious[n]['ucid']} from user {suspicious[n]['mismatch'].display_name}.",
                         user=interaction.user)
@@ -1674,10 +1682,13 @@ class Mission(Plugin[MissionEventListener]):
     async def expire_token(self):
         async with self.apool.connection() as conn:
             async with conn.transaction():
-                await conn.execute("""
+                cursor = await conn.execute("""
                     DELETE FROM players 
                     WHERE LENGTH(ucid) = 4 AND last_seen < (DATE(now() AT TIME ZONE 'utc') - interval '2 days')
+                    RETURNING ucid
                 """)
+                async for row in cursor:
+                    utils.player_index.remove(row[0])
 
     @tasks.loop(minutes=1.0)
     async def check_for_unban(self):
@@ -1688,14 +1699,15 @@ class Mission(Plugin[MissionEventListener]):
                         SELECT ucid FROM bans WHERE banned_until < (NOW() AT TIME ZONE 'utc')
                     """)
                     rows = await cursor.fetchall()
+                    servers = [
+                        server for server in self.bot.servers.values()
+                        if server.status in [Status.PAUSED, Status.RUNNING, Status.STOPPED]
+                    ]
                     for row in rows:
-                        for server in self.bot.servers.values():
-                            if server.status not in [Status.PAUSED, Status.RUNNING, Status.STOPPED]:
-                                continue
-                            await server.send_to_dcs({
-                                "command": "unban",
-                                "ucid": row[0]
-                            })
+                        await self.bus.send_many(servers, {
+                            "command": "unban",
+                            "ucid": row[0]
+                        })
                         # delete unbanned accounts from the database
                         await conn.execute("DELETE FROM bans WHERE ucid = %s", (row[0], ))
         except Exception as ex:
@@ -400,19 +400,27 @@ class MissionEventListener(EventListener["Mission"]):
         # all players are inactive for now
         for p in server.players.values():
             p.active = False
+        # load all new players at once
+        new_players: list[Player] = [
+            DataObjectFactory().new(
+                Player, node=server.node, server=server, id=p['id'], name=p['name'], active=p['active'],
+                side=Side(p['side']), ucid=p['ucid'], slot=int(p['slot']), sub_slot=p['sub_slot'],
+                unit_callsign=p['unit_callsign'], unit_name=p['unit_name'], unit_type=p['unit_type'],
+                unit_display_name=p.get('unit_display_name', p['unit_type']), group_id=p['group_id'],
+                group_name=p['group_name'], ipaddr=p.get('ipaddr'))
+            for p in data['players']
+            if p['id'] != 1 and not server.get_player(ucid=p['ucid'])
+        ]
+        if new_players:
+            await type(new_players[0]).load_all(new_players)
+            for player in new_players:
+                server.add_player(player)
+        new_ucids = {x.ucid for x in new_players}
         for p in data['players']:
             if p['id'] == 1:
                 continue
             player: Player = server.get_player(ucid=p['ucid'])
-            if not player:
-                player = DataObjectFactory().new(
-                    Player, node=server.node, server=server, id=p['id'], name=p['name'], active=p['active'],
-                    side=Side(p['side']), ucid=p['ucid'], slot=int(p['slot']), sub_slot=p['sub_slot'],
-                    unit_callsign=p['unit_callsign'], unit_name=p['unit_name'], unit_type=p['unit_type'],
-                    unit_display_name=p.get('unit_display_name', p['unit_type']), group_id=p['group_id'],
-                    group_name=p['group_name'], ipaddr=p.get('ipaddr'))
-                server.add_player(player)
-            else:
+            if player.ucid not in new_ucids:
                 await player.update(p)
             if player.member:
                 autorole = server.locals.get('autorole', self.bot.locals.get('autorole', {}).get('online'))
@@ -537,6 +545,7 @@ class MissionEventListener(EventListener["Mission"]):
             player = DataObjectFactory().new(
                 Player, node=server.node, server=server, id=data['id'], name=data['name'],
                 active=data['active'], side=Side(data['side']), ucid=data['ucid'], ipaddr=data.get('ipaddr'))
+            await player.load()
             server.add_player(player)
         else:
             await player.update(data)
@@ -585,6 +594,7 @@ class MissionEventListener(EventListener["Mission"]):
             player = DataObjectFactory().new(
                 Player, node=server.node, server=server, id=data['id'], name=data['name'],
                 active=data['active'], side=Side(data['side']), ucid=data['ucid'], ipaddr=data.get('ipaddr'))
+            await player.load()
             server.add_player(player)
         else:
             await player.update(data)
@@ -1015,6 +1025,7 @@ class MissionEventListener(EventListener["Mission"]):
                     old_ucid = row[0]
                     await cursor.execute("UPDATE players SET discord_id = -1, manual = FALSE WHERE ucid = %s",
                                          (old_ucid, ))
+                    utils.player_index.update(old_ucid, discord_id=-1, manual=False)
                     for plugin in self.bot.cogs.values():  # type: Plugin
                         await plugin.update_ucid(conn, old_ucid, player.ucid)
                     await self.bot.audit(f'updated their UCID from {old_ucid} to {player.ucid}.',
@@ -85,7 +85,8 @@ class MissionUploadHandler(ServerUploadHandler):
                 await utils.yn_question(ctx, _('Do you want to load mission {}?').format(name))):
             extensions = [
                 x.name for x in self.server.extensions.values()
-                if getattr(x, 'beforeMissionLoad').__module__ != 'core.extension'
+                if (getattr(x, 'beforeMissionLoad').__module__ != 'core.extension' or
+                    getattr(x, 'editMission').__module__ != 'core.extension')
             ]
             if len(extensions):
                 modify = await utils.yn_question(ctx, _("Do you want to apply extensions before mission start?"))
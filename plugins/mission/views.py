@@ -338,6 +338,7 @@ class InfoView(View):
             async with conn.transaction():
                 await conn.execute("INSERT INTO watchlist (player_ucid, reason, created_by) VALUES (%s, %s, %s)",
                                    (self.ucid, 'n/a', interaction.user.display_name))
+        utils.player_index.update(self.ucid, watchlist=True)
         await interaction.followup.send("User is now on the watchlist.", ephemeral=self.ephemeral)
         self.stop()
 
@@ -347,6 +348,7 @@ class InfoView(View):
         async with self.bot.apool.connection() as conn:
             async with conn.transaction():
                 await conn.execute("DELETE FROM watchlist WHERE player_ucid = %s", (self.ucid, ))
+        utils.player_index.update(self.ucid, watchlist=False)
         await interaction.followup.send("User removed from the watchlist.", ephemeral=self.ephemeral)
         name = self.player.name if self.player else self.member.display_name if isinstance(self.member, discord.Member) else self.member
         message = f'removed player {name} '
@@ -1,8 +1,13 @@
 import asyncio
+import logging
+import psycopg
 import psycopg_pool
+import time
 
 from core import EventListener, PersistentReport, Server, Coalition, Channel, event, Report, get_translation
+from datetime import datetime, timezone
 from discord.ext import tasks
+from psycopg_pool import AsyncConnectionPool
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -11,6 +16,127 @@ if TYPE_CHECKING:
 _ = get_translation(__name__.split('.')[1])
 
 
+class MissionStatisticsBuffer:
+    """
+    Write-behind buffer for the missionstats table.
+    Events are collected in memory and written in batches, either when BATCH_SIZE events are pending or on flush().
+    If the database is not available, the events are kept and written with the next flush.
+    """
+    BATCH_SIZE = 500
+    # warn, if more than this number of events are pending
+    HIGH_WATERMARK = 10000
+
+    SQL_INSERT = """
+        INSERT INTO missionstats (mission_id, event, init_id, init_side, init_type, init_cat, 
+                                  target_id, target_side, target_type, target_cat, weapon, place, 
+                                  comment, time) 
+        VALUES (%(mission_id)s, %(event)s, %(init_id)s, %(init_side)s, %(init_type)s, %(init_cat)s, 
+                %(target_id)s, %(target_side)s, %(target_type)s, %(target_cat)s, %(weapon)s, 
+                %(place)s, %(comment)s, %(time)s)
+    """
+
+    def __init__(self, apool: AsyncConnectionPool, log: logging.Logger):
+        self.apool = apool
+        self.log = log
+        self.rows: list[dict] = []
+        self.lock = asyncio.Lock()
+        # the statistics are reported to the performance log
+        self.perf_log = logging.getLogger('performance_log')
+        self.stats = {
+            "pending_max": 0,
+            "flushes": 0,
+            "flushes_failed": 0,
+            "rows_written": 0,
+            "rows_dropped": 0,
+            "last_flush_ms": 0
+        }
+
+    def add(self, dataset: dict) -> None:
+        self.rows.append(dataset)
+        pending = len(self.rows)
+        if pending > self.stats['pending_max']:
+            self.stats['pending_max'] = pending
+            if pending > self.HIGH_WATERMARK and pending % self.HIGH_WATERMARK == 1:
+                self.log.warning(f"Missionstats: {pending} events waiting to be written to the database.")
+        if pending >= self.BATCH_SIZE and not self.lock.locked():
+            # noinspection PyAsyncCall
+            asyncio.create_task(self.flush())
+
+    async def _write(self, rows: list[dict]) -> None:
+        async with self.apool.connection() as conn:
+            async with conn.transaction():
+                async with conn.cursor() as cursor:
+                    await cursor.executemany(self.SQL_INSERT, rows)
+
+    async def _write_single(self, rows: list[dict]) -> None:
+        # find and skip the rows that can't be written, rows that were processed are removed from the list
+        async with self.apool.connection() as conn:
+            while rows:
+                row = rows[0]
+                try:
+                    async with conn.transaction():
+                        await conn.execute(self.SQL_INSERT, row)
+                    self.stats['rows_written'] += 1
+                except psycopg.errors.DataError as ex:
+                    self.log.warning(f"Missionstats: event {row['event']} can't be stored: {ex}")
+                    self.stats['rows_dropped'] += 1
+                except psycopg.errors.IntegrityError as ex:
+                    self.log.warning(f"Missionstats: event {row['event']} can't be stored: {ex}")
+                    self.stats['rows_dropped'] += 1
+                del rows[0]
+
+    async def flush(self) -> None:
+        async with self.lock:
+            while self.rows:
+                rows = self.rows[:self.BATCH_SIZE]
+                del self.rows[:self.BATCH_SIZE]
+                count = len(rows)
+                start = time.perf_counter()
+                try:
+                    try:
+                        await self._write(rows)
+                        self.stats['rows_written'] += len(rows)
+                    except (psycopg.errors.DataError, psycopg.errors.IntegrityError):
+                        await self._write_single(rows)
+                except (psycopg_pool.PoolTimeout, psycopg.OperationalError) as ex:
+                    # put the rows back and try again with the next flush
+                    self.rows[:0] = rows
+                    self.stats['flushes_failed'] += 1
+                    self.log.warning(f"Missionstats: {ex} / {len(self.rows)} events pending")
+                    return
+                except asyncio.CancelledError:
+                    # keep the rows for the flush on shutdown
+                    self.rows[:0] = rows
+                    self.stats['flushes_failed'] += 1
+                    raise
+                except Exception as ex:
+                    self.rows[:0] = rows
+                    self.stats['flushes_failed'] += 1
+                    self.log.exception(ex)
+                    return
+                self.stats['flushes'] += 1
+                self.stats['last_flush_ms'] = int((time.perf_counter() - start) * 1000)
+                self.log.debug(f"Missionstats: {count} events processed in {self.stats['last_flush_ms']} ms, "
+                               f"{len(self.rows)} pending.")
+
+    def report(self) -> None:
+        """
+        Writes the statistics since the last report into the performance log.
+        """
+        if not self.stats['flushes'] and not self.stats['flushes_failed']:
+            return
+        self.perf_log.info("Missionstats: {rows_written} events written in {flushes} batches (last one took "
+                           "{last_flush_ms} ms), {rows_dropped} dropped, {flushes_failed} failed writes, max. "
+                           "{pending_max} pending".format(**self.stats))
+        self.stats |= {
+            "pending_max": len(self.rows),
+            "flushes": 0,
+            "flushes_failed": 0,
+            "rows_written": 0,
+            "rows_dropped": 0
+        }
+
+
 class MissionStatisticsEventListener(EventListener["MissionStatistics"]):
 
     COALITION = {
@@ -45,13 +171,17 @@ class MissionStatisticsEventListener(EventListener["MissionStatistics"]):
         super().__init__(plugin)
         self.mission_stats = {}
         self.update: dict[str, bool] = {}
+        self.buffer = MissionStatisticsBuffer(self.apool, self.log)
         self.do_update.start()
+        self.do_flush.start()
 
     async def shutdown(self):
         self.do_update.cancel()
+        self.do_flush.cancel()
+        await self.buffer.flush()
         self.mission_stats.clear()
 
-    @event(name="getMissionSituation")
+    @event(name="getMissionSituation", mutable=True)
     async def getMissionSituation(self, server: Server, data: dict) -> None:
         self.mission_stats[server.name] = data
         self.update[server.name] = True
@@ -75,7 +205,7 @@ class MissionStatisticsEventListener(EventListener["MissionStatistics"]):
         # noinspection PyAsyncCall
         asyncio.create_task(self._toggle_mission_stats(server))
 
-    async def _update_database(self, server: Server, config: dict, data: dict):
+    def _update_database(self, server: Server, config: dict, data: dict):
         def get_value(values: dict, index1, index2):
             if index1 not in values:
                 return None
@@ -106,28 +236,17 @@ class MissionStatisticsEventListener(EventListener["MissionStatistics"]):
                 'target_cat': self.UNIT_CATEGORY.get(get_value(data, 'target', 'category'), 'Unknown'),
                 'weapon': get_value(data, 'weapon', 'name'),
                 'place': get_value(data, 'place', 'name'),
-                'comment': data['comment'] if 'comment' in data else ''
+                'comment': data['comment'] if 'comment' in data else '',
+                # the time of the event, not of the write
+                'time': datetime.now(timezone.utc).replace(tzinfo=None)
             }
-            try:
-                async with self.apool.connection() as conn:
-                    async with conn.transaction():
-                        await conn.execute("""
-                            INSERT INTO missionstats (mission_id, event, init_id, init_side, init_type, init_cat, 
-                                                      target_id, target_side, target_type, target_cat, weapon, place, 
-                                                      comment) 
-                            VALUES (%(mission_id)s, %(event)s, %(init_id)s, %(init_side)s, %(init_type)s, %(init_cat)s, 
-                                    %(target_id)s, %(target_side)s, %(target_type)s, %(target_cat)s, %(weapon)s, 
-                                    %(place)s, %(comment)s)
-                        """, dataset)
-            except psycopg_pool.PoolTimeout as ex:
-                self.log.warning(str(ex) + ' / ignoring event')
+            self.buffer.add(dataset)
 
     @event(name="onMissionEvent")
     async def onMissionEvent(self, server: Server, data: dict) -> None:
         config = self.plugin.get_config(server)
         if config.get('persistence', True):
-            # noinspection PyAsyncCall
-            asyncio.create_task(self._update_database(server, config, data))
+            self._update_database(server, config, data)
         if not data['server_name'] in self.mission_stats or not data.get('initiator'):
             return
         stats = self.mission_stats[data['server_name']]
@@ -255,11 +374,25 @@ class MissionStatisticsEventListener(EventListener["MissionStatistics"]):
     @event(name="onGameEvent")
     async def onGameEvent(self, server: Server, data: dict) -> None:
         if data['eventName'] == 'mission_end':
+            # make sure all events are stored before the mission end statistics are rendered
+            await self.buffer.flush()
             # noinspection PyAsyncCall
             asyncio.create_task(self._process_event(server))
 
+    @event(name="onSimulationStop")
+    async def onSimulationStop(self, server: Server, _: dict) -> None:
+        await self.buffer.flush()
+
+    @tasks.loop(seconds=5)
+    async def do_flush(self):
+        try:
+            await self.buffer.flush()
+        except Exception as ex:
+            self.log.exception(ex)
+
     @tasks.loop(minutes=5)
     async def do_update(self):
+        self.buffer.report()
         for server_name, update in self.update.items():
             server: Server = self.bot.servers.get(server_name)
             if not update or not server:
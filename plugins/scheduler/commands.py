@@ -419,7 +419,7 @@ class Scheduler(Plugin[SchedulerListener]):
                         if restart_in < 0:
                             restart_in = 0
                         if rconf['method'] == 'restart':
-                            rconf['shutdown'] = True
+                            rconf = rconf | {'shutdown': True}
                         asyncio.create_task(self.restart_mission(server, config, rconf, restart_in))
                         return
                 elif 'idle_time' in rconf and server.idle_since:
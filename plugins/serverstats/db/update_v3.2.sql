@@ -0,0 +1 @@
+UPDATE serverstats SET read_bytes = ROUND(read_bytes / 60, 2), write_bytes = ROUND(write_bytes / 60, 2), bytes_sent = bytes_sent * 120, bytes_recv = bytes_recv * 120;
@@ -1,8 +1,18 @@
 import asyncio
 import math
+import psycopg
+import time
 
+from collections import deque
 from core import EventListener, Plugin, event, Server, utils, ServiceRegistry
+from datetime import datetime, timedelta, timezone
 from services.bot import BotService
+from typing import Optional
+
+# seconds of server load that are kept in memory for live views
+LIVE_HISTORY = 3600
+# rows that are kept while the database can't be written
+MAX_PENDING = 10000
 
 
 class ServerStatsListener(EventListener["ServerStats"]):
@@ -10,6 +20,60 @@ class ServerStatsListener(EventListener["ServerStats"]):
         super().__init__(plugin)
         self.fps = {}
         self.minutes = {}
+        self.load: dict[str, deque[dict]] = {}
+        self.started = time.time()
+        self._rows: list[tuple] = []
+        self._write: Optional[asyncio.Future] = None
+
+    def get_live_load(self, node: str, server_name: Optional[str] = None) -> Optional[list[dict]]:
+        """
+        Returns the server load of the last hour from memory or None, if we did not receive it for a full hour yet.
+        """
+        if time.time() - self.started < LIVE_HISTORY:
+            return None
+        since = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=LIVE_HISTORY)
+        return [
+            row
+            for name, load in self.load.items() if not server_name or name == server_name
+            for row in load
+            if row['node'] == node and row['time'] > since
+        ]
+
+    def _schedule(self) -> None:
+        if self._write:
+            return
+        batch: list[tuple] = []
+
+        async def write(conn: psycopg.AsyncConnection) -> None:
+            # rows from now on go into the next write
+            self._write = None
+            batch.extend(self._rows)
+            self._rows = []
+            await self._flush(conn, batch)
+
+        def done(future: asyncio.Future) -> None:
+            if not future.cancelled() and not future.exception():
+                return
+            if self._write is future:
+                self._write = None
+            # put the rows back, they will be written with the next ones, but don't pile them up forever
+            self._rows[:0] = batch
+            if len(self._rows) > MAX_PENDING:
+                self.log.warning(f"ServerStats: {len(self._rows) - MAX_PENDING} rows dropped, the database can't be "
+                                 f"written.")
+                del self._rows[:-MAX_PENDING]
+
+        self._write = self.node.db_writer.submit(write)
+        self._write.add_done_callback(done)
+
+    @staticmethod
+    async def _flush(conn: psycopg.AsyncConnection, rows: list[tuple]) -> None:
+        async with conn.cursor() as cursor:
+            await cursor.executemany("""
+                INSERT INTO serverstats (server_name, node, mission_id, users, status, mission_time, cpu, mem_total, 
+                                         mem_ram, read_bytes, write_bytes, bytes_sent, bytes_recv, fps, ping, time) 
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            """, rows)
 
     @event(name="perfmon")
     async def perfmon(self, server: Server, data: dict):
@@ -52,12 +116,28 @@ class ServerStatsListener(EventListener["ServerStats"]):
             fps = -1
 
         mission_time = (server.current_mission.start_time + server.current_mission.mission_time) if server.current_mission else None
-        with self.pool.connection() as conn:
-            with conn.transaction():
-                conn.execute("""
-                    INSERT INTO serverstats (server_name, node, mission_id, users, status, mission_time, cpu, mem_total, 
-                                             mem_ram, read_bytes, write_bytes, bytes_sent, bytes_recv, fps, ping) 
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """, (server.name, server.node.name, server.mission_id, len(server.get_active_players()),
-                      server.status.name, mission_time, cpu, data['mem_total'], data['mem_ram'], data['read_bytes'],
-                      data['write_bytes'], data['bytes_sent'], data['bytes_recv'], fps, ping))
+        row = {
+            "time": datetime.now(timezone.utc).replace(tzinfo=None),
+            "node": server.node.name,
+            "server_name": server.name,
+            "users": len(server.get_active_players()),
+            "cpu": cpu,
+            "mem_total": data['mem_total'],
+            "mem_ram": data['mem_ram'],
+            "read_bytes": data['read_bytes'],
+            "write_bytes": data['write_bytes'],
+            "bytes_sent": data['bytes_sent'],
+            "bytes_recv": data['bytes_recv'],
+            "fps": fps,
+            "ping": ping
+        }
+        load = self.load.get(server.name)
+        if load is None:
+            # a little more than an hour, as the samples are not exactly one minute apart
+            load = self.load[server.name] = deque(maxlen=LIVE_HISTORY // 60 + 5)
+        load.append(row)
+        # the rows of all servers are written in bulk
+        self._rows.append((server.name, row['node'], server.mission_id, row['users'], server.status.name, mission_time,
+                           cpu, row['mem_total'], row['mem_ram'], row['read_bytes'], row['write_bytes'],
+                           row['bytes_sent'], row['bytes_recv'], fps, ping, row['time']))
+        self._schedule()
@@ -14,6 +14,7 @@ warnings.filterwarnings("ignore", category=UserWarning)
 
 
 class ServerUsage(report.EmbedElement):
+    concurrent = True
 
     async def render(self, server_name: Optional[str], period: StatisticsFilter):
 
@@ -53,6 +54,7 @@ class ServerUsage(report.EmbedElement):
 
 
 class TopTheatresPerServer(report.EmbedElement):
+    concurrent = True
 
     async def render(self, server_name: Optional[str], period: StatisticsFilter):
 
@@ -88,6 +90,7 @@ class TopTheatresPerServer(report.EmbedElement):
 
 
 class TopMissionPerServer(report.EmbedElement):
+    concurrent = True
 
     async def render(self, server_name: Optional[str], period: StatisticsFilter, limit: int):
 
@@ -133,6 +136,7 @@ class TopMissionPerServer(report.EmbedElement):
 
 
 class TopModulesPerServer(report.EmbedElement):
+    concurrent = True
 
     async def render(self, server_name: Optional[str], period: StatisticsFilter, limit: int):
 
@@ -594,17 +598,38 @@ class ServerLoadHeader(EmbedElement):
 
 class ServerLoad(report.MultiGraphElement):
 
-    async def render(self, node: str, period: StatisticsFilter, server_name: Optional[str] = None):
-
-        self.env.embed.title = f"Server Load ({period.period.title()})"
+    def _get_live_series(self, node: str, server_name: Optional[str] = None) -> Optional[pd.DataFrame]:
+        plugin = self.bot.cogs.get('ServerStats')
+        rows = plugin.eventlistener.get_live_load(node, server_name) if plugin else None
+        if rows is None:
+            return None
+        elif not rows:
+            return pd.DataFrame()
+        df = pd.DataFrame.from_records(rows)
+        df['time'] = df['time'].dt.floor('min')
+        df['mem_paged'] = (df['mem_total'] - df['mem_ram']).clip(lower=0) / (1024 * 1024)
+        df['mem_ram'] = df['mem_ram'] / (1024 * 1024)
+        for column, source in [('read', 'read_bytes'), ('write', 'write_bytes'), ('sent', 'bytes_sent'),
+                               ('recv', 'bytes_recv')]:
+            df[column] = df[source] / 1024
+        columns = ['users', 'cpu', 'mem_paged', 'mem_ram', 'read', 'write', 'sent', 'recv', 'fps', 'ping']
+        # same aggregation as in the database query below
+        df = df.groupby(['time', 'server_name'])[columns].mean()
+        return df.groupby('time').agg({
+            "users": "sum", "cpu": "sum", "mem_paged": "sum", "mem_ram": "sum", "read": "sum", "write": "sum",
+            "sent": "mean", "recv": "mean", "fps": "mean", "ping": "mean"
+        }).reset_index()
+
+    async def _get_series(self, node: str, period: StatisticsFilter,
+                          server_name: Optional[str] = None) -> pd.DataFrame:
         inner_sql = f"""
             SELECT date_trunc('minute', time) AS time, AVG(users) AS users, AVG(cpu) AS cpu, 
                    AVG(CASE WHEN mem_total-mem_ram < 0 THEN 0 ELSE mem_total-mem_ram END)/(1024*1024) AS mem_paged,  
                    AVG(mem_ram)/(1024*1024) AS mem_ram, 
-                   SUM(read_bytes)/1024 AS read, 
-                   SUM(write_bytes)/1024 AS write, 
-                   ROUND(AVG(bytes_sent)) AS sent, 
-                   ROUND(AVG(bytes_recv)) AS recv, 
+                   AVG(read_bytes)/1024 AS read, 
+                   AVG(write_bytes)/1024 AS write, 
+                   ROUND(AVG(bytes_sent)/1024, 2) AS sent, 
+                   ROUND(AVG(bytes_recv)/1024, 2) AS recv, 
                    ROUND(AVG(fps), 2) AS fps, 
                    ROUND(AVG(ping), 2) AS ping 
             FROM serverstats 
@@ -621,8 +646,8 @@ class ServerLoad(report.MultiGraphElement):
         else:
             sql = f"""
                 SELECT time, SUM(users) AS users, SUM(cpu) AS cpu, SUM(mem_paged) AS mem_paged, SUM(mem_ram) AS mem_ram, 
-                             SUM(read) AS read, SUM(write) AS write, ROUND(AVG(sent)) AS sent, ROUND(AVG(recv)) AS recv, 
-                             ROUND(AVG(fps), 2) AS fps, ROUND(AVG(ping), 2) AS ping        
+                             SUM(read) AS read, SUM(write) AS write, ROUND(AVG(sent), 2) AS sent, 
+                             ROUND(AVG(recv), 2) AS recv, ROUND(AVG(fps), 2) AS fps, ROUND(AVG(ping), 2) AS ping        
                 FROM (
                     {inner_sql} 
                     GROUP BY 1, server_name
@@ -632,15 +657,24 @@ class ServerLoad(report.MultiGraphElement):
         async with self.apool.connection() as conn:
             async with conn.cursor(row_factory=dict_row) as cursor:
                 await cursor.execute(sql, {"node": node, "server_name": server_name})
-                if cursor.rowcount == 0:
-                    for i in range(0, 4):
-                        self.axes[i].bar([], [])
-                        self.axes[i].set_xticks([])
-                        self.axes[i].set_yticks([])
-                        self.axes[i].text(0, 0, 'No data available.', ha='center', va='center', size=20)
-                    return
-                else:
-                    series = pd.DataFrame.from_dict(await cursor.fetchall())
+                return pd.DataFrame.from_dict(await cursor.fetchall())
+
+    async def render(self, node: str, period: StatisticsFilter, server_name: Optional[str] = None):
+
+        self.env.embed.title = f"Server Load ({period.period.title()})"
+        series = None
+        if period.period == 'hour':
+            # the last hour is read from memory, if available
+            series = self._get_live_series(node, server_name)
+        if series is None:
+            series = await self._get_series(node, period, server_name)
+        if series.empty:
+            for i in range(0, 4):
+                self.axes[i].bar([], [])
+                self.axes[i].set_xticks([])
+                self.axes[i].set_yticks([])
+                self.axes[i].text(0, 0, 'No data available.', ha='center', va='center', size=20)
+            return
 
         series.columns = ['time', 'Users', 'CPU', 'Memory (paged)', 'Memory (RAM)', 'Read', 'Write', 'Sent',
                           'Recv', 'FPS', 'Ping']
@@ -704,7 +738,7 @@ class ServerLoad(report.MultiGraphElement):
                     xticks=[], xlabel="", ylabel='Memory (MB)', kind='area', stacked=True)
         self.axes[2].legend(loc='upper left')
         series.plot(ax=self.axes[3], x='time', y=['Read', 'Write'], title='Disk', logy=True, xticks=[],
-                    xlabel='', ylabel='KB', grid=True)
+                    xlabel='', ylabel='KB/s', grid=True)
         self.axes[3].legend(loc='upper left')
         series.plot(ax=self.axes[4], x='time', y=['Sent', 'Recv'], title='Network', logy=True, xlabel='',
                     ylabel='KB/s', grid=True)
@@ -67,21 +67,13 @@ class SlotBlocking(Plugin[SlotBlockingListener]):
             with open(server_config, mode='w', encoding='utf-8') as outfile:
                 yaml.dump(server_data, outfile)
 
-    def get_config(self, server: Optional[Server] = None, *, plugin_name: Optional[str] = None,
-                   use_cache: Optional[bool] = True) -> dict:
-        if plugin_name:
-            return super().get_config(server, plugin_name=plugin_name, use_cache=use_cache)
-        if not server:
-            return self.locals.get(DEFAULT_TAG, {})
-        if server.node.name not in self._config:
-            self._config[server.node.name] = {}
-        if server.instance.name not in self._config[server.node.name] or not use_cache:
-            default, specific = self.get_base_config(server)
-            vips = default.get('VIP', {}) | specific.get('VIP', {})
-            self._config[server.node.name][server.instance.name] = default | specific
-            if vips:
-                self._config[server.node.name][server.instance.name]['VIP'] = vips
-        return self._config[server.node.name][server.instance.name]
+    def build_config(self, server: Server) -> dict:
+        default, specific = self.get_base_config(server)
+        vips = default.get('VIP', {}) | specific.get('VIP', {})
+        config = default | specific
+        if vips:
+            config['VIP'] = vips
+        return config
 
     @commands.Cog.listener()
     async def on_member_update(self, before: discord.Member, after: discord.Member):
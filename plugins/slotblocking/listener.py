@@ -1,10 +1,12 @@
 import asyncio
-import re
 
+from copy import deepcopy
 from core import EventListener, Server, Status, utils, event, Side
 from plugins.creditsystem.player import CreditPlayer
 from typing import Union, cast, Optional, TYPE_CHECKING
 
+from .slots import SlotRules
+
 if TYPE_CHECKING:
     from .commands import SlotBlocking
 
@@ -13,18 +15,22 @@ class SlotBlockingListener(EventListener["SlotBlocking"]):
     def __init__(self, plugin: "SlotBlocking"):
         super().__init__(plugin)
         self.lock = asyncio.Lock()
+        self.rules: dict[str, tuple[dict, SlotRules]] = {}
 
-    def _migrate_roles(self, config: dict) -> None:
+    def _migrate_roles(self, config: dict) -> dict:
+        # the cached config is read-only
+        config = deepcopy(config)
         if config.get('VIP', {}).get('discord', []):
             config['VIP']['discord'] = utils.get_role_ids(self.plugin, config.get('VIP', {}).get('discord', []))
         for restriction in config.get('restricted', []):
             if 'discord' in restriction:
                 restriction['discord'] = utils.get_role_ids(self.plugin, restriction['discord'])
+        return config
 
     async def _load_params_into_mission(self, server: Server):
         config: dict = self.plugin.get_config(server, use_cache=False)
         if config:
-            self._migrate_roles(config)
+            config = self._migrate_roles(config)
             await server.send_to_dcs({
                 'command': 'loadParams',
                 'plugin': self.plugin_name,
@@ -72,43 +78,27 @@ class SlotBlockingListener(EventListener["SlotBlocking"]):
         # noinspection PyAsyncCall
         asyncio.create_task(self._load_params_into_mission(server))
 
-    def _get_points(self, server: Server, player: CreditPlayer) -> int:
+    def _get_rules(self, server: Server) -> SlotRules:
         config = self.plugin.get_config(server)
+        # the config is cached and only changes on reloads, so it can be used as the version of the rules
+        entry = self.rules.get(server.name)
+        if not entry or entry[0] is not config:
+            entry = self.rules[server.name] = (config, SlotRules(config.get('restricted', [])))
+        return entry[1]
 
-        for unit in config.get('restricted', []):
-            is_unit_type = unit.get('unit_type') == player.unit_type
-            is_unit_name = unit.get('unit_name') in player.unit_name
-            is_group_name = unit.get('group_name') in player.group_name
-            side = unit.get('side', player.side) == player.side
-
-            if side and (is_unit_type or is_unit_name or is_group_name):
-                is_player_slot = player.sub_slot == 0 and 'points' in unit
-                is_crew_slot = player.sub_slot > 0 and 'crew' in unit
-
-                if is_player_slot:
-                    return unit['points']
-                elif is_crew_slot:
-                    return unit['crew']
-        return 0
+    def _get_points(self, server: Server, player: CreditPlayer) -> int:
+        key = 'points' if player.sub_slot == 0 else 'crew'
+        rule = self._get_rules(server).find(player.unit_type, player.unit_name, player.group_name,
+                                            side=player.side.value, key=key)
+        return rule[key] if rule else 0
 
     def _get_costs(self, server: Server, data: Union[CreditPlayer, dict]) -> int:
-        def _get_data(data: Union[CreditPlayer, dict], attribute_name: str):
-            return getattr(data, attribute_name) if isinstance(data, CreditPlayer) else data[attribute_name]
-
-        def _is_unit_match(unit: dict, attribute_name: str, attribute_value: str) -> bool:
-            if attribute_name in unit and re.search(unit[attribute_name],
-                                                    utils.lua_pattern_to_python_regex(attribute_value)):
-                return True
-            return False
-
-        config = self.plugin.get_config(server)
-
-        attributes = ['unit_type', 'unit_name', 'group_name']
-        for unit in config.get('restricted', []):
-            for attribute in attributes:
-                if _is_unit_match(unit, attribute, _get_data(data, attribute)):
-                    return unit.get('costs', 0)
-        return 0
+        if isinstance(data, CreditPlayer):
+            unit_type, unit_name, group_name = data.unit_type, data.unit_name, data.group_name
+        else:
+            unit_type, unit_name, group_name = data['unit_type'], data['unit_name'], data['group_name']
+        rule = self._get_rules(server).find(unit_type, unit_name, group_name)
+        return rule.get('costs', 0) if rule else 0
 
     def _is_vip(self, config: dict, data: dict) -> bool:
         if 'VIP' not in config:
@@ -1,6 +1,10 @@
 import discord
+import re
+
 from abc import ABC
+from core import utils
 from dataclasses import dataclass, field
+from typing import Callable, Optional
 
 
 @dataclass
@@ -35,3 +39,67 @@ class CreditBasedSlot(Slot):
 
     def match(self, **kwargs) -> bool:
         return super().match(**kwargs)
+
+
+class SlotRules:
+    """
+    The "restricted" section of the slotblocking configuration, compiled for fast lookups.
+    Unit types are looked up in a dictionary, unit and group names are matched against precompiled patterns.
+    As with the list itself, the first matching rule wins.
+    """
+
+    def __init__(self, rules: list[dict]):
+        self.rules = rules
+        # one view for all rules (costs) and one each for the rules that define points or crew points
+        self._views = {key: self._compile(key) for key in [None, 'points', 'crew']}
+
+    @staticmethod
+    def _pattern(lua_pattern: str) -> Callable[[str], bool]:
+        pattern = utils.lua_pattern_to_python_regex(lua_pattern)
+        if re.escape(pattern) == pattern:
+            return lambda x: pattern in x
+        try:
+            return re.compile(pattern).search
+        except re.error:
+            return lambda x: lua_pattern in x
+
+    def _compile(self, key: Optional[str]) -> tuple[dict, list]:
+        exact: dict[str, list[tuple[int, Optional[int]]]] = {}
+        patterns: list[tuple[int, Optional[int], Optional[Callable], Optional[Callable]]] = []
+        for idx, rule in enumerate(self.rules):
+            if key and key not in rule:
+                continue
+            side = rule.get('side')
+            if 'unit_type' in rule:
+                exact.setdefault(rule['unit_type'], []).append((idx, side))
+            if 'unit_name' in rule or 'group_name' in rule:
+                patterns.append((
+                    idx, side,
+                    self._pattern(rule['unit_name']) if 'unit_name' in rule else None,
+                    self._pattern(rule['group_name']) if 'group_name' in rule else None
+                ))
+        return exact, patterns
+
+    def find(self, unit_type: str, unit_name: str, group_name: str, *, side: Optional[int] = None,
+             key: Optional[str] = None) -> Optional[dict]:
+        """
+        Returns the first rule that matches the unit. If a side is given, rules for the other side are ignored.
+        If a key is given, only rules that define this key are considered.
+        """
+        exact, patterns = self._views[key]
+        found = None
+        for idx, _side in exact.get(unit_type, []):
+            if side is None or _side is None or _side == side:
+                found = idx
+                break
+        for idx, _side, unit_match, group_match in patterns:
+            # rules after a found one can't win anymore
+            if found is not None and idx > found:
+                break
+            if side is not None and _side is not None and _side != side:
+                continue
+            if (unit_match and unit_name and unit_match(unit_name)) or \
+                    (group_match and group_name and group_match(group_name)):
+                found = idx
+                break
+        return self.rules[found] if found is not None else None
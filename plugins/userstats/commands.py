@@ -14,7 +14,8 @@ from psycopg.rows import dict_row
 from services.bot import DCSServerBot
 from typing import Union, Optional, Type
 
-from .filter import StatisticsFilter, PeriodFilter, CampaignFilter, MissionFilter, PeriodTransformer, SquadronFilter
+from .filter import StatisticsFilter, PeriodFilter, CampaignFilter, MissionFilter, PeriodTransformer, SquadronFilter, \
+    STATISTICS_COLUMNS
 from .listener import UserStatisticsEventListener
 from .views import SquadronModal
 
@@ -108,6 +109,23 @@ class UserStatistics(Plugin[UserStatisticsEventListener]):
                 with open(path, mode='w', encoding='utf-8') as outfile:
                     yaml.dump(self.locals, outfile)
                 self.log.warning(f"New file {path} written, please check for possible errors.")
+        elif new_version == '3.7':
+            self.log.info(f'  => Migrating {self.plugin_name.title()} to version {new_version}. This may take a bit.')
+            await self.rebuild_rollups(conn)
+
+    @staticmethod
+    async def rebuild_rollups(conn: psycopg.AsyncConnection) -> None:
+        # the rollups are maintained by triggers on the statistics table, so block any change while we rebuild them
+        await conn.execute("LOCK TABLE statistics IN SHARE ROW EXCLUSIVE MODE")
+        await conn.execute("TRUNCATE TABLE statistics_daily")
+        await conn.execute("""
+            INSERT INTO statistics_daily (day, player_ucid, server_name, mission_theatre, slot, side, playtime, {0})
+            SELECT DATE(s.hop_on), s.player_ucid, m.server_name, m.mission_theatre, s.slot, COALESCE(s.side, 0), 
+                   SUM(EXTRACT(EPOCH FROM (s.hop_off - s.hop_on))), {1}
+            FROM statistics s, missions m 
+            WHERE s.mission_id = m.id AND s.hop_off IS NOT NULL 
+            GROUP BY 1, 2, 3, 4, 5, 6
+        """.format(', '.join(STATISTICS_COLUMNS), ', '.join(f"SUM(COALESCE(s.{x}, 0))" for x in STATISTICS_COLUMNS)))
 
     async def cog_unload(self):
         if self.locals:
@@ -125,6 +143,9 @@ class UserStatistics(Plugin[UserStatisticsEventListener]):
             await conn.execute("""
                 DELETE FROM statistics WHERE hop_off < (DATE(now() AT TIME ZONE 'utc') - %s::interval)
             """, (f'{days} days',))
+            await conn.execute("""
+                DELETE FROM statistics_daily WHERE day < (DATE(now() AT TIME ZONE 'utc') - %s::interval)
+            """, (f'{days} days',))
         if server:
             await conn.execute("""
                 DELETE FROM statistics WHERE mission_id in (
@@ -136,8 +157,13 @@ class UserStatistics(Plugin[UserStatisticsEventListener]):
                     SELECT id FROM missions
                 )
             """)
+            # rollups that were left over by earlier versions
+            await conn.execute("DELETE FROM statistics_daily WHERE server_name = %s", (server, ))
         self.log.debug('Userstats pruned.')
 
+    async def rename(self, conn: psycopg.AsyncConnection, old_name: str, new_name: str) -> None:
+        await conn.execute("UPDATE statistics_daily SET server_name = %s WHERE server_name = %s", (new_name, old_name))
+
     async def update_ucid(self, conn: psycopg.AsyncConnection, old_ucid: str, new_ucid: str) -> None:
         await conn.execute("UPDATE statistics SET player_ucid = %s WHERE player_ucid = %s", (new_ucid, old_ucid))
         await conn.execute("UPDATE squadron_members SET player_ucid = %s WHERE player_ucid = %s", (new_ucid, old_ucid))
@@ -190,6 +216,7 @@ class UserStatistics(Plugin[UserStatisticsEventListener]):
                     await self.bot.audit('reset statistics', user=interaction.user, server=_server)
                 else:
                     await conn.execute("TRUNCATE TABLE statistics")
+                    await conn.execute("TRUNCATE TABLE statistics_daily")
                     await conn.execute("TRUNCATE TABLE missionstats")
                     await conn.execute("TRUNCATE TABLE missions")
                     if 'greenieboard' in self.node.plugins:
@@ -197,6 +224,19 @@ class UserStatistics(Plugin[UserStatisticsEventListener]):
                     await interaction.followup.send(f'Statistics for ALL servers have been wiped.', ephemeral=ephemeral)
                     await self.bot.audit('reset statistics of ALL servers', user=interaction.user)
 
+    @command(description='Rebuilds the daily statistics')
+    @app_commands.guild_only()
+    @utils.app_has_role('Admin')
+    async def rebuild_statistics(self, interaction: discord.Interaction):
+        ephemeral = utils.get_ephemeral(interaction)
+        # noinspection PyUnresolvedReferences
+        await interaction.response.defer(ephemeral=ephemeral)
+        async with self.apool.connection() as conn:
+            async with conn.transaction():
+                await self.rebuild_rollups(conn)
+        await interaction.followup.send('Daily statistics rebuilt.', ephemeral=ephemeral)
+        await self.bot.audit('rebuilt the daily statistics', user=interaction.user)
+
     @command(description='Shows player statistics')
     @app_commands.guild_only()
     @utils.app_has_role('DCS')
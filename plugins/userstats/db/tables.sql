@@ -3,3 +3,46 @@ CREATE INDEX IF NOT EXISTS idx_statistics_player_ucid ON statistics(player_ucid)
 CREATE TABLE IF NOT EXISTS squadrons (id SERIAL PRIMARY KEY, name TEXT NOT NULL, description TEXT NULL, role BIGINT NULL, image_url TEXT NULL, channel BIGINT NULL, locked BOOLEAN NOT NULL DEFAULT FALSE);
 CREATE UNIQUE INDEX IF NOT EXISTS idx_squadrons_name ON squadrons (name);
 CREATE TABLE IF NOT EXISTS squadron_members (squadron_id INTEGER NOT NULL, player_ucid TEXT NOT NULL, PRIMARY KEY (squadron_id, player_ucid));
+CREATE TABLE IF NOT EXISTS statistics_daily (day DATE NOT NULL, player_ucid TEXT NOT NULL, server_name TEXT NOT NULL, mission_theatre TEXT NOT NULL, slot TEXT NOT NULL, side INTEGER NOT NULL DEFAULT 0, playtime NUMERIC NOT NULL DEFAULT 0, kills INTEGER NOT NULL DEFAULT 0, pvp INTEGER NOT NULL DEFAULT 0, deaths INTEGER NOT NULL DEFAULT 0, ejections INTEGER NOT NULL DEFAULT 0, crashes INTEGER NOT NULL DEFAULT 0, teamkills INTEGER NOT NULL DEFAULT 0, kills_planes INTEGER NOT NULL DEFAULT 0, kills_helicopters INTEGER NOT NULL DEFAULT 0, kills_ships INTEGER NOT NULL DEFAULT 0, kills_sams INTEGER NOT NULL DEFAULT 0, kills_ground INTEGER NOT NULL DEFAULT 0, deaths_pvp INTEGER NOT NULL DEFAULT 0, deaths_planes INTEGER NOT NULL DEFAULT 0, deaths_helicopters INTEGER NOT NULL DEFAULT 0, deaths_ships INTEGER NOT NULL DEFAULT 0, deaths_sams INTEGER NOT NULL DEFAULT 0, deaths_ground INTEGER NOT NULL DEFAULT 0, takeoffs INTEGER NOT NULL DEFAULT 0, landings INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (day, player_ucid, server_name, mission_theatre, slot, side));
+CREATE INDEX IF NOT EXISTS idx_statistics_daily_player_ucid ON statistics_daily(player_ucid);
+CREATE INDEX IF NOT EXISTS idx_statistics_daily_server_name ON statistics_daily(server_name, day);
+CREATE OR REPLACE FUNCTION statistics_daily_add(rec statistics, sign INTEGER)
+RETURNS void
+AS $$
+BEGIN
+    INSERT INTO statistics_daily (day, player_ucid, server_name, mission_theatre, slot, side, playtime, kills, pvp, deaths, ejections, crashes, teamkills, kills_planes, kills_helicopters, kills_ships, kills_sams, kills_ground, deaths_pvp, deaths_planes, deaths_helicopters, deaths_ships, deaths_sams, deaths_ground, takeoffs, landings)
+    SELECT DATE(rec.hop_on), rec.player_ucid, m.server_name, m.mission_theatre, rec.slot, COALESCE(rec.side, 0), sign * EXTRACT(EPOCH FROM (rec.hop_off - rec.hop_on)), sign * COALESCE(rec.kills, 0), sign * COALESCE(rec.pvp, 0), sign * COALESCE(rec.deaths, 0), sign * COALESCE(rec.ejections, 0), sign * COALESCE(rec.crashes, 0), sign * COALESCE(rec.teamkills, 0), sign * COALESCE(rec.kills_planes, 0), sign * COALESCE(rec.kills_helicopters, 0), sign * COALESCE(rec.kills_ships, 0), sign * COALESCE(rec.kills_sams, 0), sign * COALESCE(rec.kills_ground, 0), sign * COALESCE(rec.deaths_pvp, 0), sign * COALESCE(rec.deaths_planes, 0), sign * COALESCE(rec.deaths_helicopters, 0), sign * COALESCE(rec.deaths_ships, 0), sign * COALESCE(rec.deaths_sams, 0), sign * COALESCE(rec.deaths_ground, 0), sign * COALESCE(rec.takeoffs, 0), sign * COALESCE(rec.landings, 0)
+    FROM missions m WHERE m.id = rec.mission_id
+    ON CONFLICT (day, player_ucid, server_name, mission_theatre, slot, side) DO UPDATE SET playtime = statistics_daily.playtime + EXCLUDED.playtime, kills = statistics_daily.kills + EXCLUDED.kills, pvp = statistics_daily.pvp + EXCLUDED.pvp, deaths = statistics_daily.deaths + EXCLUDED.deaths, ejections = statistics_daily.ejections + EXCLUDED.ejections, crashes = statistics_daily.crashes + EXCLUDED.crashes, teamkills = statistics_daily.teamkills + EXCLUDED.teamkills, kills_planes = statistics_daily.kills_planes + EXCLUDED.kills_planes, kills_helicopters = statistics_daily.kills_helicopters + EXCLUDED.kills_helicopters, kills_ships = statistics_daily.kills_ships + EXCLUDED.kills_ships, kills_sams = statistics_daily.kills_sams + EXCLUDED.kills_sams, kills_ground = statistics_daily.kills_ground + EXCLUDED.kills_ground, deaths_pvp = statistics_daily.deaths_pvp + EXCLUDED.deaths_pvp, deaths_planes = statistics_daily.deaths_planes + EXCLUDED.deaths_planes, deaths_helicopters = statistics_daily.deaths_helicopters + EXCLUDED.deaths_helicopters, deaths_ships = statistics_daily.deaths_ships + EXCLUDED.deaths_ships, deaths_sams = statistics_daily.deaths_sams + EXCLUDED.deaths_sams, deaths_ground = statistics_daily.deaths_ground + EXCLUDED.deaths_ground, takeoffs = statistics_daily.takeoffs + EXCLUDED.takeoffs, landings = statistics_daily.landings + EXCLUDED.landings;
+END;
+$$ LANGUAGE 'plpgsql';
+CREATE OR REPLACE FUNCTION statistics_daily_change()
+RETURNS trigger
+AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.hop_off IS NOT NULL THEN
+        PERFORM statistics_daily_add(OLD, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.hop_off IS NOT NULL THEN
+        PERFORM statistics_daily_add(NEW, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE 'plpgsql';
+CREATE TRIGGER tgr_statistics_daily_insert AFTER INSERT ON statistics FOR EACH ROW WHEN (NEW.hop_off IS NOT NULL) EXECUTE PROCEDURE statistics_daily_change();
+CREATE TRIGGER tgr_statistics_daily_update AFTER UPDATE ON statistics FOR EACH ROW WHEN (OLD.hop_off IS NOT NULL OR NEW.hop_off IS NOT NULL) EXECUTE PROCEDURE statistics_daily_change();
+CREATE TRIGGER tgr_statistics_daily_delete AFTER DELETE ON statistics FOR EACH ROW WHEN (OLD.hop_off IS NOT NULL) EXECUTE PROCEDURE statistics_daily_change();
+CREATE OR REPLACE FUNCTION statistics_daily_mission_delete()
+RETURNS trigger
+AS $$
+DECLARE
+    rec statistics;
+BEGIN
+    -- the rollups can't be corrected anymore, once the mission is gone
+    FOR rec IN SELECT * FROM statistics WHERE mission_id = OLD.id AND hop_off IS NOT NULL LOOP
+        PERFORM statistics_daily_add(rec, -1);
+    END LOOP;
+    RETURN OLD;
+END;
+$$ LANGUAGE 'plpgsql';
+CREATE TRIGGER tgr_statistics_daily_mission_delete BEFORE DELETE ON missions FOR EACH ROW EXECUTE PROCEDURE statistics_daily_mission_delete();
@@ -8,6 +8,13 @@ from discord import app_commands
 from services.bot import DCSServerBot
 from typing import Any, Optional, Type
 
+# columns of the daily rollups, see StatisticsFilter.source()
+STATISTICS_COLUMNS = [
+    'kills', 'pvp', 'deaths', 'ejections', 'crashes', 'teamkills', 'kills_planes', 'kills_helicopters', 'kills_ships',
+    'kills_sams', 'kills_ground', 'deaths_pvp', 'deaths_planes', 'deaths_helicopters', 'deaths_ships', 'deaths_sams',
+    'deaths_ground', 'takeoffs', 'landings'
+]
+
 
 class StatisticsFilter(ABC):
     def __init__(self, period: Optional[str] = None):
@@ -35,6 +42,30 @@ class StatisticsFilter(ABC):
     def format(self, bot: DCSServerBot) -> str:
         ...
 
+    def rollup(self, bot: DCSServerBot) -> Optional[str]:
+        """
+        Returns the filter condition for the daily rollups in table statistics_daily or None, if this filter
+        needs the raw statistics.
+        """
+        return None
+
+    def source(self, bot: DCSServerBot) -> str:
+        """
+        Returns a (filtered) sub-select over the finished sessions, which can be used instead of the statistics table.
+        Columns are day, player_ucid, server_name, mission_theatre, slot, side, playtime (in seconds) and the
+        statistics counters.
+        """
+        rollup = self.rollup(bot)
+        if rollup:
+            return f"(SELECT * FROM statistics_daily s WHERE {rollup})"
+        columns = ', '.join(f"s.{x}" for x in STATISTICS_COLUMNS)
+        return f"""(
+            SELECT DATE(s.hop_on) AS day, s.player_ucid, m.server_name, m.mission_theatre, s.slot, s.side, 
+                   EXTRACT(EPOCH FROM (s.hop_off - s.hop_on)) AS playtime, {columns} 
+            FROM statistics s, missions m 
+            WHERE s.mission_id = m.id AND s.hop_off IS NOT NULL AND {self.filter(bot)}
+        )"""
+
     @staticmethod
     def detect(bot: DCSServerBot, period: str) -> Any:
         if MissionFilter.supports(bot, period):
@@ -111,6 +142,19 @@ class PeriodFilter(StatisticsFilter):
         else:
             return "1 = 1"
 
+    def rollup(self, bot: DCSServerBot) -> Optional[str]:
+        if self.period and self.period.startswith('period:'):
+            period = self.period[7:].strip()
+        else:
+            period = self.period
+        if period in [None, 'all']:
+            return '1 = 1'
+        elif period == 'yesterday':
+            return "s.day = current_date - 1"
+        elif period == 'today':
+            return "s.day = current_date"
+        # rolling windows and date ranges need the exact session times
+        return None
 
     def format(self, bot: DCSServerBot) -> str:
         if self.period and self.period.startswith('period:'):
@@ -226,6 +270,13 @@ class MonthFilter(StatisticsFilter):
             DATE_PART('year', s.hop_on) = DATE_PART('year', CURRENT_DATE)
         """
 
+    def rollup(self, bot: DCSServerBot) -> Optional[str]:
+        month = MonthFilter.get_month(self.period[6:].strip())
+        return f"""
+            DATE_PART('month', s.day) = {month} AND 
+            DATE_PART('year', s.day) = DATE_PART('year', CURRENT_DATE)
+        """
+
     def format(self, bot: DCSServerBot) -> str:
         month = MonthFilter.get_month(self.period[6:].strip())
         return f'Month "{const.MONTH[month]}" '
@@ -252,6 +303,9 @@ class SquadronFilter(StatisticsFilter):
             )
         """
 
+    def rollup(self, bot: DCSServerBot) -> Optional[str]:
+        return self.filter(bot)
+
     def format(self, bot: DCSServerBot) -> str:
         return f'Squadron "{self.period[9:].strip().title()}"\n'
 
@@ -39,18 +39,16 @@ class HighscorePlaytime(report.GraphElement):
 
     async def render(self, interaction: discord.Interaction, server_name: str, limit: int,
                      flt: StatisticsFilter, bar_labels: Optional[bool] = True):
-        sql = "SELECT p.discord_id, COALESCE(p.name, 'Unknown') AS name, ROUND(SUM(EXTRACT(EPOCH FROM (s.hop_off - " \
-              "s.hop_on)))) AS playtime FROM statistics s, players p, missions m WHERE p.ucid = s.player_ucid AND " \
-              "s.hop_off IS NOT NULL AND s.mission_id = m.id "
+        sql = f"SELECT p.discord_id, COALESCE(p.name, 'Unknown') AS name, ROUND(SUM(s.playtime)) AS playtime " \
+              f"FROM {flt.source(self.env.bot)} s, players p WHERE p.ucid = s.player_ucid "
         if server_name:
-            sql += "AND m.server_name = %(server_name)s"
+            sql += "AND s.server_name = %(server_name)s"
             self.env.embed.description = utils.escape_string(server_name)
             if server_name in self.bot.servers:
                 sql += ' AND s.side in (' + ','.join([
                     str(x) for x in get_sides(interaction, self.bot.servers[server_name])
                 ]) + ')'
         self.env.embed.title = flt.format(self.env.bot) + self.env.embed.title
-        sql += ' AND ' + flt.filter(self.env.bot)
         sql += f' GROUP BY 1, 2 ORDER BY 3 DESC LIMIT {limit}'
 
         async with self.apool.connection() as conn:
@@ -111,8 +109,8 @@ class HighscoreElement(report.GraphElement):
                         'deaths_helicopters + deaths_ships + deaths_sams + deaths_ground)::DECIMAL) END',
             'PvP-KD-Ratio': 'CASE WHEN SUM(s.deaths_pvp) = 0 THEN SUM(s.pvp) ELSE SUM(s.pvp::DECIMAL)/SUM('
                             's.deaths_pvp::DECIMAL) END',
-            'Most Efficient Killers': 'SUM(s.kills::DECIMAL) / (SUM(EXTRACT(EPOCH FROM (s.hop_off - s.hop_on)))::DECIMAL / 3600.0)',
-            'Most Wasteful Pilots': 'SUM(s.crashes::DECIMAL) / (SUM(EXTRACT(EPOCH FROM (s.hop_off - s.hop_on)))::DECIMAL / 3600.0)'
+            'Most Efficient Killers': 'SUM(s.kills::DECIMAL) / (SUM(s.playtime) / 3600.0)',
+            'Most Wasteful Pilots': 'SUM(s.crashes::DECIMAL) / (SUM(s.playtime) / 3600.0)'
         }
         xlabels = {
             'Air Targets': 'kills',
@@ -125,17 +123,16 @@ class HighscoreElement(report.GraphElement):
             'Most Wasteful Pilots': 'airframes wasted / h'
         }
         sql = f"SELECT p.discord_id, COALESCE(p.name, 'Unknown') AS name, {sql_parts[kill_type]} AS value FROM " \
-              f"players p, statistics s, missions m WHERE s.player_ucid = p.ucid AND s.mission_id = m.id "
+              f"players p, {flt.source(self.env.bot)} s WHERE s.player_ucid = p.ucid "
         if server_name:
-            sql += "AND m.server_name = %(server_name)s"
+            sql += "AND s.server_name = %(server_name)s"
             if server_name in self.bot.servers:
                 sql += ' AND s.side in (' + ','.join([
                     str(x) for x in get_sides(interaction, self.bot.servers[server_name])
                 ]) + ')'
-        sql += ' AND ' + flt.filter(self.env.bot)
-        sql += f' AND s.hop_off IS NOT NULL GROUP BY 1, 2 HAVING {sql_parts[kill_type]} > 0'
+        sql += f' GROUP BY 1, 2 HAVING {sql_parts[kill_type]} > 0'
         if kill_type in ['Most Efficient Killers', 'Most Wasteful Pilots']:
-            sql += f' AND SUM(EXTRACT(EPOCH FROM (s.hop_off - s.hop_on))) > 1800'
+            sql += ' AND SUM(s.playtime) > 1800'
         sql += f' ORDER BY 3 DESC LIMIT {limit}'
 
         async with self.apool.connection() as conn:
@@ -1,9 +1,11 @@
 import asyncio
 import psycopg
+import weakref
 
+from contextlib import asynccontextmanager
 from core import EventListener, Status, Server, Side, Player, event
-from psycopg import Connection
-from typing import Union, TYPE_CHECKING
+from discord.ext import tasks
+from typing import Union, Optional, AsyncIterator, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .commands import UserStatistics
@@ -11,28 +13,30 @@ if TYPE_CHECKING:
 
 class UserStatisticsEventListener(EventListener["UserStatistics"]):
 
-    SQL_EVENT_UPDATES = {
-        'takeoff': 'UPDATE statistics SET takeoffs = takeoffs + 1 WHERE mission_id = %s AND player_ucid = %s AND hop_off IS NULL',
-        'landing': 'UPDATE statistics SET landings = landings + 1 WHERE mission_id = %s AND player_ucid = %s AND hop_off IS NULL',
-        'eject': 'UPDATE statistics SET ejections = ejections + 1 WHERE mission_id = %s AND player_ucid = %s AND hop_off IS NULL',
-        'crash': 'UPDATE statistics SET crashes = crashes + 1 WHERE mission_id = %s AND player_ucid = %s AND hop_off IS NULL',
-        'pilot_death': 'UPDATE statistics SET deaths = deaths + 1 WHERE mission_id = %s AND player_ucid = %s AND hop_off IS NULL',
-        'pvp_planes': 'UPDATE statistics SET kills = kills + 1, pvp = pvp + 1, kills_planes = kills_planes + 1 WHERE mission_id = %s AND player_ucid = %s AND hop_off IS NULL',
-        'pvp_helicopters': 'UPDATE statistics SET kills = kills + 1, pvp = pvp + 1, kills_helicopters = kills_helicopters + 1 WHERE mission_id = %s AND player_ucid = %s AND hop_off IS NULL',
-        'teamkill': 'UPDATE statistics SET teamkills = teamkills + 1 WHERE mission_id = %s AND player_ucid = %s AND hop_off IS NULL',
-        'kill_planes': 'UPDATE statistics SET kills = kills + 1, kills_planes = kills_planes + 1 WHERE mission_id = %s AND player_ucid = %s AND hop_off IS NULL',
-        'kill_helicopters': 'UPDATE statistics SET kills = kills + 1, kills_helicopters = kills_helicopters + 1 WHERE mission_id = %s AND player_ucid = %s AND hop_off IS NULL',
-        'kill_ships': 'UPDATE statistics SET kills = kills + 1, kills_ships = kills_ships + 1 WHERE mission_id = %s AND player_ucid = %s AND hop_off IS NULL',
-        'kill_sams': 'UPDATE statistics SET kills = kills + 1, kills_sams = kills_sams + 1 WHERE mission_id = %s AND player_ucid = %s AND hop_off IS NULL',
-        'kill_ground': 'UPDATE statistics SET kills = kills + 1, kills_ground = kills_ground + 1 WHERE mission_id = %s AND player_ucid = %s AND hop_off IS NULL',
-        'deaths_pvp_planes': 'UPDATE statistics SET deaths_pvp = deaths_pvp + 1, deaths_planes = deaths_planes + 1 WHERE mission_id = %s AND player_ucid = %s AND hop_off IS NULL',
-        'deaths_pvp_helicopters': 'UPDATE statistics SET deaths_pvp = deaths_pvp + 1, deaths_helicopters = deaths_helicopters + 1 WHERE mission_id = %s AND player_ucid = %s AND hop_off IS NULL',
-        'deaths_planes': 'UPDATE statistics SET deaths_planes = deaths_planes + 1 WHERE mission_id = %s AND player_ucid = %s AND hop_off IS NULL',
-        'deaths_helicopters': 'UPDATE statistics SET deaths_helicopters = deaths_helicopters + 1 WHERE mission_id = %s AND player_ucid = %s AND hop_off IS NULL',
-        'deaths_ships': 'UPDATE statistics SET deaths_ships = deaths_ships + 1 WHERE mission_id = %s AND player_ucid = %s AND hop_off IS NULL',
-        'deaths_sams': 'UPDATE statistics SET deaths_sams = deaths_sams + 1 WHERE mission_id = %s AND player_ucid = %s AND hop_off IS NULL',
-        'deaths_ground': 'UPDATE statistics SET deaths_ground = deaths_ground + 1 WHERE mission_id = %s AND player_ucid = %s AND hop_off IS NULL'
+    # statistics counters that are increased by an event
+    EVENT_COUNTERS = {
+        'takeoff': ('takeoffs', ),
+        'landing': ('landings', ),
+        'eject': ('ejections', ),
+        'crash': ('crashes', ),
+        'pilot_death': ('deaths', ),
+        'pvp_planes': ('kills', 'pvp', 'kills_planes'),
+        'pvp_helicopters': ('kills', 'pvp', 'kills_helicopters'),
+        'teamkill': ('teamkills', ),
+        'kill_planes': ('kills', 'kills_planes'),
+        'kill_helicopters': ('kills', 'kills_helicopters'),
+        'kill_ships': ('kills', 'kills_ships'),
+        'kill_sams': ('kills', 'kills_sams'),
+        'kill_ground': ('kills', 'kills_ground'),
+        'deaths_pvp_planes': ('deaths_pvp', 'deaths_planes'),
+        'deaths_pvp_helicopters': ('deaths_pvp', 'deaths_helicopters'),
+        'deaths_planes': ('deaths_planes', ),
+        'deaths_helicopters': ('deaths_helicopters', ),
+        'deaths_ships': ('deaths_ships', ),
+        'deaths_sams': ('deaths_sams', ),
+        'deaths_ground': ('deaths_ground', )
     }
+    COUNTERS = list(dict.fromkeys(column for columns in EVENT_COUNTERS.values() for column in columns))
 
     SQL_MISSION_HANDLING = {
         'start_mission': 'INSERT INTO missions (server_name, mission_name, mission_theatre) VALUES (%s, %s, %s)',
@@ -48,6 +52,99 @@ class UserStatisticsEventListener(EventListener["UserStatistics"]):
     def __init__(self, plugin: "UserStatistics"):
         super().__init__(plugin)
         self.active_servers: set[str] = set()
+        # pending counter increments per (mission_id, ucid)
+        self.counters: dict[tuple[int, str], dict[str, int]] = {}
+        # one lock per mission, locks are dropped when they are not in use anymore
+        self.locks: weakref.WeakValueDictionary[int, asyncio.Lock] = weakref.WeakValueDictionary()
+        self.flush_counters.start()
+
+    async def shutdown(self) -> None:
+        self.flush_counters.cancel()
+        async with self.counters_flushed():
+            pass
+        await super().shutdown()
+
+    def add_counters(self, server: Server, ucid: str, event_name: str) -> None:
+        deltas = self.counters.setdefault((server.mission_id, ucid), {})
+        for column in self.EVENT_COUNTERS[event_name]:
+            deltas[column] = deltas.get(column, 0) + 1
+
+    def _pop_counters(self, mission_id: Optional[int],
+                      ucid: Optional[str] = None) -> dict[tuple[int, str], dict[str, int]]:
+        return {
+            key: self.counters.pop(key)
+            for key in list(self.counters.keys())
+            if key[0] == mission_id and (ucid is None or key[1] == ucid)
+        }
+
+    def _merge_counters(self, pending: dict[tuple[int, str], dict[str, int]]) -> None:
+        for key, deltas in pending.items():
+            current = self.counters.setdefault(key, {})
+            for column, value in deltas.items():
+                current[column] = current.get(column, 0) + value
+
+    async def _write_counters(self, conn: psycopg.AsyncConnection,
+                              pending: dict[tuple[int, str], dict[str, int]]) -> None:
+        if not pending:
+            return
+        row = '(' + ', '.join(['%s::INTEGER', '%s::TEXT'] + ['%s::INTEGER'] * len(self.COUNTERS)) + ')'
+        params = []
+        for (mission_id, ucid), deltas in pending.items():
+            params.extend([mission_id, ucid] + [deltas.get(column, 0) for column in self.COUNTERS])
+        await conn.execute(f"""
+            UPDATE statistics s SET {', '.join(f'{x} = s.{x} + v.{x}' for x in self.COUNTERS)}
+            FROM (VALUES {', '.join([row] * len(pending))}) AS v(mission_id, player_ucid, {', '.join(self.COUNTERS)})
+            WHERE s.mission_id = v.mission_id AND s.player_ucid = v.player_ucid AND s.hop_off IS NULL
+        """, params)
+
+    def _get_lock(self, mission_id: Optional[int]) -> asyncio.Lock:
+        lock = self.locks.get(mission_id)
+        if lock is None:
+            lock = self.locks[mission_id] = asyncio.Lock()
+        return lock
+
+    @asynccontextmanager
+    async def counters_flushed(self, mission_id: Optional[int] = None,
+                               ucid: Optional[str] = None) -> AsyncIterator[psycopg.AsyncConnection]:
+        """
+        Writes the pending counters (of a mission or a player) and yields the connection, so that the statistics
+        can be closed in the same transaction afterward.
+        Flushes of the same mission wait for each other, as counters must not be written after their statistics were
+        closed. Without a mission, the counters of all missions are written (each mission in its own transaction).
+        """
+        if mission_id is None:
+            for _mission_id in {x[0] for x in self.counters}:
+                async with self._mission_counters_flushed(_mission_id):
+                    pass
+            async with self.apool.connection() as conn:
+                async with conn.transaction():
+                    yield conn
+        else:
+            async with self._mission_counters_flushed(mission_id, ucid) as conn:
+                yield conn
+
+    @asynccontextmanager
+    async def _mission_counters_flushed(self, mission_id: Optional[int],
+                                        ucid: Optional[str] = None) -> AsyncIterator[psycopg.AsyncConnection]:
+        async with self._get_lock(mission_id):
+            pending = self._pop_counters(mission_id, ucid)
+            try:
+                async with self.apool.connection() as conn:
+                    async with conn.transaction():
+                        await self._write_counters(conn, pending)
+                        yield conn
+            except Exception:
+                # keep the counters for the next try
+                self._merge_counters(pending)
+                raise
+
+    @tasks.loop(seconds=10)
+    async def flush_counters(self):
+        try:
+            async with self.counters_flushed():
+                pass
+        except Exception as ex:
+            self.log.exception(ex)
 
     async def processEvent(self, name: str, server: Server, data: dict) -> None:
         try:
@@ -67,8 +164,8 @@ class UserStatisticsEventListener(EventListener["UserStatistics"]):
         return unit_type
 
     @staticmethod
-    def close_all_statistics(conn: psycopg.Connection, server: Server):
-        conn.execute("""
+    async def close_all_statistics(conn: psycopg.AsyncConnection, server: Server):
+        await conn.execute("""
             UPDATE missions m1 SET mission_end = (
                 SELECT mission_start - INTERVAL '1 second' FROM missions m2 
                 WHERE m1.server_name = m2.server_name
@@ -76,24 +173,24 @@ class UserStatisticsEventListener(EventListener["UserStatistics"]):
                 ORDER BY 1 LIMIT 1)
             WHERE m1.server_name = %s AND m1.mission_end IS NULL
         """, (server.name,))
-        conn.execute("""
+        await conn.execute("""
             UPDATE missions SET mission_end = (now() AT TIME ZONE 'utc') WHERE server_name = %s AND mission_end IS NULL
         """, (server.name,))
 
-        cursor = conn.execute("""
+        cursor = await conn.execute("""
                     SELECT mission_id, player_ucid, slot 
                     FROM statistics 
                     WHERE mission_id IN (
                         SELECT id FROM missions WHERE server_name = %s
                     ) AND hop_off IS NULL
                 """, (server.name,))
-        rows = cursor.fetchall()
+        rows = await cursor.fetchall()
         for row in rows:
-            conn.execute("""
+            await conn.execute("""
                 UPDATE statistics SET hop_off = (SELECT mission_end FROM missions WHERE id = %s)
                 WHERE mission_id = %s AND player_ucid = %s AND slot = %s AND hop_off IS NULL
             """, (row[0], row[0], row[1], row[2]))
-        conn.execute("""
+        await conn.execute("""
             UPDATE statistics SET hop_off = (now() AT TIME ZONE 'utc') WHERE mission_id IN (
                 SELECT id FROM missions WHERE server_name = %s
             ) AND hop_off IS NULL
@@ -109,109 +206,114 @@ class UserStatisticsEventListener(EventListener["UserStatistics"]):
         if server.status == Status.STOPPED or not data['channel'].startswith('sync-') or 'current_mission' not in data:
             return
 
-        with self.pool.connection() as conn:
-            with conn.transaction():
-                with conn.cursor() as cursor:
-                    mission_id = -1
-                    cursor.execute(self.SQL_MISSION_HANDLING['current_mission_id'], (server.name,))
+        async with self.counters_flushed() as conn:
+            async with conn.cursor() as cursor:
+                mission_id = -1
+                await cursor.execute(self.SQL_MISSION_HANDLING['current_mission_id'], (server.name,))
+                if cursor.rowcount == 1:
+                    row = await cursor.fetchone()
+                    if row[1] == data['current_mission']:
+                        mission_id = row[0]
+                    else:
+                        self.log.warning('The mission in the database does not match the mission that is live '
+                                         'on this server. Fixing...')
+                if mission_id == -1:
+                    # close ambiguous missions
+                    if cursor.rowcount >= 1:
+                        await self.close_all_statistics(conn, server)
+                    # create a new mission
+                    await cursor.execute(self.SQL_MISSION_HANDLING['start_mission'],
+                                         (server.name, data['current_mission'], data['current_map']))
+                    await cursor.execute(self.SQL_MISSION_HANDLING['current_mission_id'], (server.name,))
                     if cursor.rowcount == 1:
-                        row = cursor.fetchone()
-                        if row[1] == data['current_mission']:
-                            mission_id = row[0]
-                        else:
-                            self.log.warning('The mission in the database does not match the mission that is live '
-                                             'on this server. Fixing...')
-                    if mission_id == -1:
-                        # close ambiguous missions
-                        if cursor.rowcount >= 1:
-                            self.close_all_statistics(cursor, server)
-                        # create a new mission
-                        cursor.execute(self.SQL_MISSION_HANDLING['start_mission'],
-                                       (server.name, data['current_mission'], data['current_map']))
-                        cursor.execute(self.SQL_MISSION_HANDLING['current_mission_id'], (server.name,))
+                        mission_id = (await cursor.fetchone())[0]
+                    else:
+                        self.log.error('FATAL: Initialization of mission table failed. Statistics will not be '
+                                       'gathered for this session.')
+                server.mission_id = mission_id
+                if mission_id != -1:
+                    # initialize active players
+                    players = server.get_active_players()
+                    ucids = []
+                    for player in players:
+                        ucids.append(player.ucid)
+                        # make sure we get slot changes that might have occurred in the meantime
+                        await cursor.execute(self.SQL_MISSION_HANDLING['check_player'], (mission_id, player.ucid))
+                        player_started = False
                         if cursor.rowcount == 1:
-                            mission_id = (cursor.fetchone())[0]
-                        else:
-                            self.log.error('FATAL: Initialization of mission table failed. Statistics will not be '
-                                           'gathered for this session.')
-                    server.mission_id = mission_id
-                    if mission_id != -1:
-                        # initialize active players
-                        players = server.get_active_players()
-                        ucids = []
-                        for player in players:
-                            ucids.append(player.ucid)
-                            # make sure we get slot changes that might have occurred in the meantime
-                            cursor.execute(self.SQL_MISSION_HANDLING['check_player'], (mission_id, player.ucid))
-                            player_started = False
-                            if cursor.rowcount == 1:
-                                # the player is there already ...
-                                if (cursor.fetchone())[0] != player.unit_type:
-                                    # ... but with a different aircraft, so close the old session
-                                    cursor.execute(self.SQL_MISSION_HANDLING['stop_player'],
-                                                   (mission_id, player.ucid))
-                                else:
-                                    # session will be kept
-                                    player_started = True
-                            if not player_started and player.side != Side.SPECTATOR:
-                                cursor.execute(self.SQL_MISSION_HANDLING['start_player'],
-                                               (mission_id, player.ucid, self.get_unit_type(player), player.side.value))
-                        # close dead entries in the database (if existent)
-                        cursor.execute(self.SQL_MISSION_HANDLING['all_players'], (mission_id, ))
-                        for row in cursor.fetchall():
-                            if row[0] not in ucids:
-                                cursor.execute(self.SQL_MISSION_HANDLING['stop_player'], (mission_id, row[0]))
+                            # the player is there already ...
+                            if (await cursor.fetchone())[0] != player.unit_type:
+                                # ... but with a different aircraft, so close the old session
+                                await cursor.execute(self.SQL_MISSION_HANDLING['stop_player'],
+                                                     (mission_id, player.ucid))
+                            else:
+                                # session will be kept
+                                player_started = True
+                        if not player_started and player.side != Side.SPECTATOR:
+                            await cursor.execute(self.SQL_MISSION_HANDLING['start_player'],
+                                                 (mission_id, player.ucid, self.get_unit_type(player),
+                                                  player.side.value))
+                    # close dead entries in the database (if existent)
+                    await cursor.execute(self.SQL_MISSION_HANDLING['all_players'], (mission_id, ))
+                    for row in await cursor.fetchall():
+                        if row[0] not in ucids:
+                            await conn.execute(self.SQL_MISSION_HANDLING['stop_player'], (mission_id, row[0]))
 
     @event(name="onMissionLoadEnd")
     async def onMissionLoadEnd(self, server: Server, data: dict) -> None:
-        with self.pool.connection() as conn:
-            with conn.transaction():
-                self.close_all_statistics(conn, server)
-                conn.execute(self.SQL_MISSION_HANDLING['start_mission'],
-                             (server.name, data['current_mission'], data['current_map']))
-                cursor = conn.execute(self.SQL_MISSION_HANDLING['current_mission_id'], (server.name,))
-                if cursor.rowcount == 1:
-                    server.mission_id = (cursor.fetchone())[0]
-                else:
-                    server.mission_id = -1
-                    self.log.error('FATAL: Initialization of mission table failed. Statistics will not be '
-                                   'gathered for this session.')
-
-    def close_mission_stats(self, server: Server):
-        with self.pool.connection() as conn:
-            with conn.transaction():
-                conn.execute(self.SQL_MISSION_HANDLING['close_statistics'], (server.mission_id,))
-                conn.execute(self.SQL_MISSION_HANDLING['close_mission'], (server.mission_id,))
+        async with self.counters_flushed() as conn:
+            await self.close_all_statistics(conn, server)
+            await conn.execute(self.SQL_MISSION_HANDLING['start_mission'],
+                               (server.name, data['current_mission'], data['current_map']))
+            cursor = await conn.execute(self.SQL_MISSION_HANDLING['current_mission_id'], (server.name,))
+            if cursor.rowcount == 1:
+                server.mission_id = (await cursor.fetchone())[0]
+            else:
+                server.mission_id = -1
+                self.log.error('FATAL: Initialization of mission table failed. Statistics will not be '
+                               'gathered for this session.')
+
+    async def close_mission_stats(self, server: Server):
+        async with self.counters_flushed(server.mission_id) as conn:
+            await conn.execute(self.SQL_MISSION_HANDLING['close_statistics'], (server.mission_id,))
+            await conn.execute(self.SQL_MISSION_HANDLING['close_mission'], (server.mission_id,))
 
     @event(name="onSimulationStop")
     async def onSimulationStop(self, server: Server, _: dict) -> None:
-        self.close_mission_stats(server)
+        await self.close_mission_stats(server)
 
     @event(name="onPlayerChangeSlot")
     async def onPlayerChangeSlot(self, server: Server, data: dict) -> None:
         if 'side' not in data:
             return
-        with self.pool.connection() as conn:
-            with conn.transaction():
-                conn.execute(self.SQL_MISSION_HANDLING['stop_player'], (server.mission_id, data['ucid']))
-                if Side(data['side']) != Side.SPECTATOR:
-                    conn.execute(self.SQL_MISSION_HANDLING['start_player'],
-                                 (server.mission_id, data['ucid'], self.get_unit_type(data), data['side']))
+        async with self.counters_flushed(server.mission_id, data['ucid']) as conn:
+            await conn.execute(self.SQL_MISSION_HANDLING['stop_player'], (server.mission_id, data['ucid']))
+            if Side(data['side']) != Side.SPECTATOR:
+                await conn.execute(self.SQL_MISSION_HANDLING['start_player'],
+                                   (server.mission_id, data['ucid'], self.get_unit_type(data), data['side']))
+
+    @event(name="onPlayerStop")
+    async def onPlayerStop(self, server: Server, data: dict) -> None:
+        if 'ucid' not in data:
+            return
+        async with self.counters_flushed(server.mission_id, data['ucid']):
+            pass
 
     @event(name="disableUserStats")
     async def disableUserStats(self, server: Server, _: dict) -> None:
         self.active_servers.discard(server.name)
-        self.close_mission_stats(server)
+        await self.close_mission_stats(server)
 
-    def _handle_disconnect_event(self, conn: Connection, server: Server, data: dict) -> None:
+    async def _handle_disconnect_event(self, server: Server, data: dict) -> None:
         if data['arg1'] != 1:
             player: Player = server.get_player(id=data['arg1'])
             if not player:
                 self.log.warning(f"Player id={data['arg1']} not found. Can't close their statistics.")
                 return
-            conn.execute(self.SQL_MISSION_HANDLING['stop_player'], (server.mission_id, player.ucid))
+            async with self.counters_flushed(server.mission_id, player.ucid) as conn:
+                await conn.execute(self.SQL_MISSION_HANDLING['stop_player'], (server.mission_id, player.ucid))
 
-    def _handle_kill_killer(self, conn: Connection, server: Server, data: dict) -> None:
+    def _handle_kill_killer(self, server: Server, data: dict) -> None:
         if data['arg4'] != -1:
             # selfkill
             if data['arg1'] == data['arg4']:
@@ -236,12 +338,12 @@ class UserStatisticsEventListener(EventListener["UserStatistics"]):
             kill_type = 'kill_ground'
         else:
             kill_type = 'kill_other'  # Static objects
-        if kill_type in self.SQL_EVENT_UPDATES.keys():
+        if kill_type in self.EVENT_COUNTERS:
             pilot: Player = server.get_player(id=data['arg1'])
             for crew_member in server.get_crew_members(pilot):
-                conn.execute(self.SQL_EVENT_UPDATES[kill_type], (server.mission_id, crew_member.ucid))
+                self.add_counters(server, crew_member.ucid, kill_type)
 
-    def _handle_kill_victim(self, conn: Connection, server: Server, data: dict) -> None:
+    def _handle_kill_victim(self, server: Server, data: dict) -> None:
         if data['arg1'] != -1:
             if data['arg1'] == data['arg4']:  # self kill
                 death_type = 'self_kill'
@@ -264,56 +366,50 @@ class UserStatisticsEventListener(EventListener["UserStatistics"]):
             death_type = 'deaths_ground'
         else:
             death_type = 'other'
-        if death_type in self.SQL_EVENT_UPDATES.keys():
+        if death_type in self.EVENT_COUNTERS:
             pilot: Player = server.get_player(id=data['arg4'])
             for crew_member in server.get_crew_members(pilot):
-                conn.execute(self.SQL_EVENT_UPDATES[death_type], (server.mission_id, crew_member.ucid))
+                self.add_counters(server, crew_member.ucid, death_type)
 
-    def _handle_kill_event(self, conn: Connection, server: Server, data: dict) -> None:
+    def _handle_kill_event(self, server: Server, data: dict) -> None:
         # Player is an AI => return
         if data['arg1'] != -1:
-            self._handle_kill_killer(conn, server, data)
+            self._handle_kill_killer(server, data)
         # Victim is an AI => return
         if data['arg4'] != -1:
-            self._handle_kill_victim(conn, server, data)
+            self._handle_kill_victim(server, data)
 
-    def _handle_common_event(self, conn: Connection, server: Server, data: dict) -> None:
+    def _handle_common_event(self, server: Server, data: dict) -> None:
         if data['arg1'] != -1:
-            if data['eventName'] in self.SQL_EVENT_UPDATES.keys():
+            if data['eventName'] in self.EVENT_COUNTERS:
                 player: Player = server.get_player(id=data['arg1'])
                 if not player:
                     return
-                conn.execute(self.SQL_EVENT_UPDATES[data['eventName']], (server.mission_id, player.ucid))
+                self.add_counters(server, player.ucid, data['eventName'])
 
-    def _handle_eject_event(self, conn: Connection, server: Server, data: dict) -> None:
+    def _handle_eject_event(self, server: Server, data: dict) -> None:
         if data['arg1'] != -1:
-            if data['eventName'] in self.SQL_EVENT_UPDATES.keys():
+            if data['eventName'] in self.EVENT_COUNTERS:
                 # TODO: when DCS bug wih multicrew eject gets fixed, change this to single player only
                 pilot: Player = server.get_player(id=data['arg1'])
                 crew_members = server.get_crew_members(pilot)
                 if len(crew_members) == 1:
-                    conn.execute(self.SQL_EVENT_UPDATES[data['eventName']], (server.mission_id, crew_members[0].ucid))
+                    self.add_counters(server, crew_members[0].ucid, data['eventName'])
 
     @event(name="onGameEvent")
     async def onGameEvent(self, server: Server, data: dict) -> None:
         event_name = data['eventName']
 
-        with self.pool.connection() as conn:
-            with conn.transaction():
-                if event_name == 'disconnect':
-                    self._handle_disconnect_event(conn, server, data)
-                    return
-                elif event_name == 'kill':
-                    self._handle_kill_event(conn, server, data)
-                    return
-                elif event_name in ['takeoff', 'landing', 'crash', 'pilot_death']:
-                    self._handle_common_event(conn, server, data)
-                    return
-                elif event_name == 'eject':
-                    self._handle_eject_event(conn, server, data)
-                    return
-        # do not block the database connection for too long
-        if event_name == 'mission_end':
+        # counters are only collected here and written in batches
+        if event_name == 'disconnect':
+            await self._handle_disconnect_event(server, data)
+        elif event_name == 'kill':
+            self._handle_kill_event(server, data)
+        elif event_name in ['takeoff', 'landing', 'crash', 'pilot_death']:
+            self._handle_common_event(server, data)
+        elif event_name == 'eject':
+            self._handle_eject_event(server, data)
+        elif event_name == 'mission_end':
             config = self.get_config(server)
             if 'highscore' in config:
                 # noinspection PyAsyncCall
@@ -44,17 +44,15 @@ class Header(report.EmbedElement):
 class PlaytimesPerPlane(report.GraphElement):
 
     async def render(self, member: Union[discord.Member, str], server_name: str, flt: StatisticsFilter):
-        sql = 'SELECT s.slot, ROUND(SUM(EXTRACT(EPOCH FROM (s.hop_off - s.hop_on)))) AS playtime FROM ' \
-              'statistics s, players p, missions m WHERE s.player_ucid = p.ucid AND ' \
-              's.hop_off IS NOT NULL AND s.mission_id = m.id '
+        sql = f'SELECT s.slot, ROUND(SUM(s.playtime)) AS playtime FROM {flt.source(self.env.bot)} s, players p ' \
+              f'WHERE s.player_ucid = p.ucid '
         if isinstance(member, discord.Member):
             sql += 'AND p.discord_id = %s '
         else:
             sql += 'AND p.ucid = %s '
         if server_name:
             self.env.embed.description = utils.escape_string(server_name)
-            sql += "AND m.server_name = '{}'".format(server_name.replace('\'', '\'\''))
-        sql += ' AND ' + flt.filter(self.env.bot)
+            sql += "AND s.server_name = '{}'".format(server_name.replace('\'', '\'\''))
         sql += ' GROUP BY s.slot ORDER BY 2'
 
         async with self.apool.connection() as conn:
@@ -83,17 +81,15 @@ class PlaytimesPerPlane(report.GraphElement):
 class PlaytimesPerServer(report.GraphElement):
 
     async def render(self, member: Union[discord.Member, str], server_name: str, flt: StatisticsFilter):
-        sql = f"SELECT regexp_replace(m.server_name, '{self.bot.filter['server_name']}', '', 'g') AS " \
-              f"server_name, ROUND(SUM(EXTRACT(EPOCH FROM (s.hop_off - s.hop_on)))) AS playtime FROM statistics s, " \
-              f"players p, missions m WHERE s.player_ucid = p.ucid AND m.id = s.mission_id AND " \
-              f"s.hop_off IS NOT NULL "
+        sql = f"SELECT regexp_replace(s.server_name, '{self.bot.filter['server_name']}', '', 'g') AS " \
+              f"server_name, ROUND(SUM(s.playtime)) AS playtime FROM {flt.source(self.env.bot)} s, players p " \
+              f"WHERE s.player_ucid = p.ucid "
         if isinstance(member, discord.Member):
             sql += 'AND p.discord_id = %s '
         else:
             sql += 'AND p.ucid = %s '
         if server_name:
-            sql += "AND m.server_name = '{}'".format(server_name.replace('\'', '\'\''))
-        sql += ' AND ' + flt.filter(self.env.bot)
+            sql += "AND s.server_name = '{}'".format(server_name.replace('\'', '\'\''))
         sql += ' GROUP BY 1'
 
         labels = []
@@ -122,17 +118,15 @@ class PlaytimesPerServer(report.GraphElement):
 class PlaytimesPerMap(report.GraphElement):
 
     async def render(self, member: Union[discord.Member, str], server_name: str, flt: StatisticsFilter):
-        sql = 'SELECT m.mission_theatre, ROUND(SUM(EXTRACT(EPOCH FROM (s.hop_off - s.hop_on)))) AS ' \
-              'playtime FROM statistics s, players p, missions m WHERE s.player_ucid = p.ucid AND ' \
-              'm.id = s.mission_id AND s.hop_off IS NOT NULL '
+        sql = f'SELECT s.mission_theatre, ROUND(SUM(s.playtime)) AS playtime FROM {flt.source(self.env.bot)} s, ' \
+              f'players p WHERE s.player_ucid = p.ucid '
         if isinstance(member, discord.Member):
             sql += 'AND p.discord_id = %s '
         else:
             sql += 'AND p.ucid = %s '
         if server_name:
-            sql += "AND m.server_name = '{}'".format(server_name.replace('\'', '\'\''))
-        sql += ' AND ' + flt.filter(self.env.bot)
-        sql += ' GROUP BY m.mission_theatre'
+            sql += "AND s.server_name = '{}'".format(server_name.replace('\'', '\'\''))
+        sql += ' GROUP BY s.mission_theatre'
 
         labels = []
         values = []
@@ -1 +1 @@
-__version__ = "3.6"
+__version__ = "3.7"
@@ -190,7 +190,7 @@ class VotingListener(EventListener["Voting"]):
             await player.sendChatMessage('Usage: {prefix}{command} <{params}>'.format(
                 prefix=self.prefix, command=self.vote.name, params='|'.join(choices)))
             return
-        config['prefix'] = self.prefix
+        config = config | {'prefix': self.prefix}
         try:
             class_name = f"plugins.voting.options.{what}.{what.title()}"
             item: VotableItem = utils.str_to_class(class_name)(
@@ -0,0 +1,4 @@
+"""
+Standalone rendering of matplotlib figures, used by the process pool of core.report.renderer.
+This package must not import anything of DCSServerBot, see rendering.worker.
+"""
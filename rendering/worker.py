@@ -0,0 +1,61 @@
+"""
+The rendering processes of core.report.renderer.
+Every process of the pool imports this module, when it unpickles init_worker() and render(). It must only import
+matplotlib: importing anything of DCSServerBot (like the core package, which is why it does not live in core.report)
+would load discord, psycopg and all services into each process.
+"""
+import os
+import pickle
+import re
+import warnings
+
+from io import BytesIO
+from matplotlib import font_manager, pyplot as plt
+from typing import Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+_languages: Optional[set[str]] = None
+
+
+def get_supported_fonts() -> set[str]:
+    global _languages
+
+    if _languages is None:
+        _languages = set()
+        if os.path.exists('fonts'):
+            for filename in os.listdir('fonts'):
+                if filename.startswith("NotoSans"):
+                    match = re.search(r"NotoSans(..)-", filename)
+                    if match:
+                        lang = match.group(1)
+                        _languages.add(lang)
+    return _languages
+
+
+def apply_style():
+    plt.style.use('dark_background')
+    plt.rcParams['axes.facecolor'] = '2C2F33'
+    fonts = get_supported_fonts()
+    if fonts:
+        plt.rcParams['font.family'] = [f"Noto Sans {x}" for x in fonts] + ['sans-serif']
+
+
+def init_worker():
+    plt.switch_backend('agg')
+    for f in font_manager.findSystemFonts('fonts'):
+        font_manager.fontManager.addfont(f)
+    # ticks and labels are created when the figure is drawn, so they need the same style as in the bot
+    apply_style()
+    warnings.filterwarnings("ignore", category=UserWarning, message=".*Glyph.*")
+
+
+def savefig(figure: "Figure") -> bytes:
+    buffer = BytesIO()
+    figure.savefig(buffer, format='png', bbox_inches='tight', facecolor='#2C2F33')
+    return buffer.getvalue()
+
+
+def render(data: bytes) -> bytes:
+    return savefig(pickle.loads(data))
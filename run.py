@@ -186,7 +186,9 @@ class Main:
 
 async def run_node(name, config_dir=None, no_autoupdate=False) -> int:
     async with NodeImpl(name=name, config_dir=config_dir) as node:
-        await Main(node, no_autoupdate=no_autoupdate).run()
+        # log callbacks that block the event loop for longer than loop_monitor ms (0 = disabled)
+        with utils.LoopMonitor(node.config.get('logging', {}).get('loop_monitor', 0)):
+            await Main(node, no_autoupdate=no_autoupdate).run()
         return node.rc
 
 
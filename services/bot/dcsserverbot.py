@@ -1,6 +1,9 @@
 import asyncio
 import discord
+import hashlib
+import json
 
+from collections import defaultdict
 from core import Channel, utils, Status, PluginError, Group, Node, DEFAULT_PLUGINS
 from core.data.node import FatalException
 from core.listener import EventListener
@@ -34,9 +37,14 @@ class DCSServerBot(commands.Bot):
         self.audit_channel = None
         self.member: Optional[discord.Member] = None
         self.lock: asyncio.Lock = asyncio.Lock()
+        # setEmbed: one lock per channel, so that independent channels can be updated concurrently
+        self.embed_locks: dict[int, asyncio.Lock] = defaultdict(asyncio.Lock)
+        # setEmbed: (server_name, embed_name) => (channel_id, message, hash of the last embed sent)
+        self.embed_cache: dict[tuple[str, str], tuple[int, discord.Message, str]] = {}
         self.synced: bool = False
         self.tree.on_error = self.on_app_command_error
         self._roles = None
+        self._member_index: Optional[utils.MemberIndex] = None
 
     async def start(self, token: str, *, reconnect: bool = True) -> None:
         self.synced: bool = False
@@ -65,6 +73,12 @@ class DCSServerBot(commands.Bot):
                 self._roles['Alert'] = self._roles['DCS Admin']
         return self._roles
 
+    @property
+    def member_index(self) -> utils.MemberIndex:
+        if self._member_index is None:
+            self._member_index = utils.MemberIndex(self.get_all_members())
+        return self._member_index
+
     @property
     def filter(self) -> dict:
         return self.bus.filter
@@ -83,6 +97,9 @@ class DCSServerBot(commands.Bot):
         # cleanup remote servers (if any)
         for key in [key for key, value in self.bus.servers.items() if value.is_remote]:
             self.bus.servers.pop(key)
+        # load the player index for autocompletion and the campaigns in the background
+        asyncio.get_running_loop().run_in_executor(None, utils.player_index.load, self.pool)
+        asyncio.get_running_loop().run_in_executor(None, utils.campaign_cache.load, self.pool)
 
     async def load_plugin(self, plugin: str) -> bool:
         try:
@@ -192,6 +209,8 @@ class DCSServerBot(commands.Bot):
     async def on_ready(self):
         try:
             await self.wait_until_ready()
+            # (re)build the member index on the loop, which owns the member cache, events might have been missed
+            self._member_index = utils.MemberIndex(self.get_all_members())
             if not self.synced:
                 self.log.info(f'- Preparing Discord Bot "{self.user.name}" ...')
                 if len(self.guilds) > 1:
@@ -250,6 +269,24 @@ class DCSServerBot(commands.Bot):
             self.log.exception(ex)
             raise
 
+    async def on_member_join(self, member: discord.Member):
+        if self._member_index is not None:
+            self._member_index.add(member)
+
+    async def on_member_remove(self, member: discord.Member):
+        if self._member_index is not None:
+            self._member_index.remove(member)
+
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        if self._member_index is not None and before.display_name != after.display_name:
+            self._member_index.update(after)
+
+    async def on_user_update(self, before: discord.User, after: discord.User):
+        if self._member_index is not None and (before.name != after.name or before.global_name != after.global_name):
+            member = self.guilds[0].get_member(after.id) if self.guilds else None
+            if member:
+                self._member_index.update(member)
+
     async def on_command_error(self, ctx: commands.Context, err: Exception):
         if isinstance(err, commands.CommandNotFound):
             pass
@@ -399,12 +436,24 @@ class DCSServerBot(commands.Bot):
             else:
                 return None
 
+    async def get_members_by_ucid(self, ucids: list[str], verified: Optional[bool] = False) -> dict[str, discord.Member]:
+        async with self.apool.connection() as conn:
+            sql = 'SELECT ucid, discord_id FROM players WHERE ucid = ANY(%s) AND discord_id <> -1'
+            if verified:
+                sql += ' AND manual IS TRUE'
+            cursor = await conn.execute(sql, (ucids, ))
+            return {
+                row[0]: member
+                async for row in cursor
+                if (member := self.guilds[0].get_member(row[1])) is not None
+            }
+
     def match_user(self, data: dict, rematch=False) -> Optional[discord.Member]:
         if not rematch:
             member = self.get_member_by_ucid(data['ucid'])
             if member:
                 return member
-        return utils.match(data['name'], [x for x in self.get_all_members() if not x.bot])
+        return utils.match(data['name'], self.member_index)
 
     def get_server(self, ctx: Union[discord.Interaction, discord.Message, str], *,
                    admin_only: Optional[bool] = False) -> Optional["Server"]:
@@ -431,17 +480,48 @@ class DCSServerBot(commands.Bot):
 
     async def setEmbed(self, *, embed_name: str, embed: discord.Embed, channel_id: Union[Channel, int] = Channel.STATUS,
                        file: Optional[discord.File] = None, server: Optional["Server"] = None):
-        async with self.lock:
-            # do not update any embed, if the session is closed already
+        # do not update any embed, if the session is closed already
+        if self.is_closed():
+            return
+        if server and isinstance(channel_id, Channel):
+            channel_id = int(server.channels.get(channel_id, -1))
+            # we should not write to this channel
+            if channel_id == -1:
+                return
+        else:
+            channel_id = int(channel_id)
+        key = (server.name if server else 'Master', embed_name)
+        # attachments (like graphs) are not compared, embeds with files are always sent
+        embed_hash = hashlib.sha1(
+            json.dumps(embed.to_dict(), sort_keys=True, default=str).encode('utf-8')
+        ).hexdigest() if not file else None
+
+        async with self.embed_locks[channel_id]:
             if self.is_closed():
                 return
-            if server and isinstance(channel_id, Channel):
-                channel_id = int(server.channels.get(channel_id, -1))
-                # we should not write to this channel
-                if channel_id == -1:
+            cached = self.embed_cache.get(key)
+            if cached and cached[0] == channel_id:
+                _, message, last_hash = cached
+                # nothing has changed, no need to call Discord
+                if embed_hash and embed_hash == last_hash:
                     return
-            else:
-                channel_id = int(channel_id)
+                try:
+                    if not file:
+                        await message.edit(embed=embed)
+                    else:
+                        await message.edit(embed=embed, attachments=[file])
+                    self.embed_cache[key] = (channel_id, message, embed_hash)
+                    return
+                except discord.errors.NotFound:
+                    # the message was deleted, create a new one
+                    self.embed_cache.pop(key, None)
+                except discord.errors.DiscordException as ex:
+                    self.log.warning(f"Error during update of embed {embed_name}: " + str(ex))
+                    return
+                except Exception as ex:
+                    self.log.exception(ex)
+                    return
+
             channel = self.get_channel(channel_id)
             if not channel:
                 try:
@@ -456,13 +536,15 @@ class DCSServerBot(commands.Bot):
                 self.log.error(f"Channel {channel_id} not found, can't add or change an embed in there!")
                 return
 
-            async with self.apool.connection() as conn:
-                # check if we have a message persisted already
-                cursor = await conn.execute("""
-                    SELECT embed, thread FROM message_persistence 
-                    WHERE server_name = %s AND embed_name = %s
-                """, (server.name if server else 'Master', embed_name))
-                row = await cursor.fetchone()
+            row = None
+            if not cached:
+                async with self.apool.connection() as conn:
+                    # check if we have a message persisted already
+                    cursor = await conn.execute("""
+                        SELECT embed, thread FROM message_persistence 
+                        WHERE server_name = %s AND embed_name = %s
+                    """, key)
+                    row = await cursor.fetchone()
 
             message = None
             if row:
@@ -478,6 +560,7 @@ class DCSServerBot(commands.Bot):
                             await message.edit(embed=embed)
                         else:
                             await message.edit(embed=embed, attachments=[file])
+                        self.embed_cache[key] = (channel_id, message, embed_hash)
                 except discord.errors.NotFound:
                     message = None
                 except discord.errors.DiscordException as ex:
@@ -500,6 +583,7 @@ class DCSServerBot(commands.Bot):
                 else:
                     message = await channel.send(embed=embed, file=file)
                     thread = None
+                self.embed_cache[key] = (channel_id, message, embed_hash)
                 async with self.apool.connection() as conn:
                     async with conn.transaction():
                         await conn.execute("""
@@ -507,5 +591,4 @@ class DCSServerBot(commands.Bot):
                             VALUES (%s, %s, %s, %s) 
                             ON CONFLICT (server_name, embed_name) 
                             DO UPDATE SET embed=excluded.embed, thread=excluded.thread
-                        """, (server.name if server else 'Master', embed_name, message.id,
-                              thread.id if thread else None))
+                        """, (key[0], embed_name, message.id, thread.id if thread else None))
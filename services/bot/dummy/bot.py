@@ -121,6 +121,15 @@ class DummyBot:
     def get_member_by_ucid(self, ucid: str, verified: Optional[bool] = False) -> Optional[DummyMember]:
         return self.guilds[0].get_member(ucid)
 
+    async def get_members_by_ucid(self, ucids: list[str], verified: Optional[bool] = False) -> dict[str, DummyMember]:
+        # members are configured in bot.yaml, there is nothing to read from the database
+        guild = self.guilds[0]
+        return {
+            ucid: member
+            for ucid in ucids
+            if (member := guild.get_member(ucid)) is not None
+        }
+
     def match_user(self, data: dict, rematch=False) -> None:
         ...
 
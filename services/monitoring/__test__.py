@@ -0,0 +1,133 @@
+# run from the root directory with: python -m services.monitoring.__test__
+import psutil
+import unittest
+
+from contextlib import nullcontext
+from services.monitoring import sampler
+from services.monitoring.sampler import LoadSampler
+from types import SimpleNamespace
+from unittest.mock import patch
+
+
+class _Process:
+    """
+    Stands in for the psutil.Process of a DCS server.
+    """
+    def __init__(self, pid: int):
+        self.pid = pid
+        self.cpu = 0.0
+        self.vms = 0
+        self.rss = 0
+        self.read_bytes = 0
+        self.write_bytes = 0
+        self.error = None
+
+    def oneshot(self):
+        return nullcontext()
+
+    def cpu_percent(self) -> float:
+        if self.error:
+            raise self.error
+        return self.cpu
+
+    def memory_info(self):
+        return SimpleNamespace(vms=self.vms, rss=self.rss)
+
+    def io_counters(self):
+        return SimpleNamespace(read_bytes=self.read_bytes, write_bytes=self.write_bytes)
+
+
+class TestLoadSampler(unittest.TestCase):
+
+    def setUp(self):
+        self.sampler = LoadSampler(interval=10, history=60)
+        self.now = 1000.0
+        self.net = SimpleNamespace(bytes_sent=0, bytes_recv=0)
+        clock = patch.object(sampler, 'time', SimpleNamespace(time=lambda: self.now, monotonic=lambda: self.now))
+        net = patch.object(sampler.psutil, 'net_io_counters',
+                           lambda pernic: SimpleNamespace(bytes_sent=self.net.bytes_sent,
+                                                          bytes_recv=self.net.bytes_recv))
+        for p in [clock, net]:
+            p.start()
+            self.addCleanup(p.stop)
+        self.process = _Process(4711)
+        self.server = SimpleNamespace(name='Server A', process=self.process)
+
+    def step(self, seconds: float, *, cpu: float = 0.0, read: int = 0, write: int = 0, sent: int = 0, recv: int = 0):
+        self.now += seconds
+        self.process.cpu = cpu
+        self.process.read_bytes += read
+        self.process.write_bytes += write
+        self.net.bytes_sent += sent
+        self.net.bytes_recv += recv
+        self.sampler.sample([self.server])
+
+    def test_baseline(self):
+        self.step(0, read=1000000)
+        # the first call only takes the baseline
+        self.assertNotIn('Server A', self.sampler.samples)
+        self.assertIsNone(self.sampler.aggregate('Server A'))
+
+    def test_rate(self):
+        self.step(0)
+        self.step(10, cpu=50.0, read=1000, write=2000, sent=300, recv=400)
+        sample = self.sampler.samples['Server A'][-1]
+        self.assertEqual(sample.cpu, 50.0)
+        self.assertEqual((sample.read_bytes, sample.write_bytes), (100.0, 200.0))
+        self.assertEqual((sample.bytes_sent, sample.bytes_recv), (30.0, 40.0))
+        # the rate depends on the time that passed, not on the interval
+        self.step(20, read=1000)
+        self.assertEqual(self.sampler.samples['Server A'][-1].read_bytes, 50.0)
+
+    def test_counter_reset(self):
+        self.step(0, read=1000)
+        self.process.read_bytes = 0
+        self.step(10)
+        self.assertEqual(self.sampler.samples['Server A'][-1].read_bytes, 0.0)
+
+    def test_restart(self):
+        self.step(0)
+        self.step(10, read=1000)
+        # the server was restarted, the counters of the new process start with its own baseline
+        self.process = self.server.process = _Process(815)
+        self.process.read_bytes = 5000000
+        self.step(10)
+        self.assertEqual(len(self.sampler.samples['Server A']), 1)
+        self.assertNotIn(4711, self.sampler._io)
+        self.step(10, read=1000)
+        self.assertEqual(self.sampler.samples['Server A'][-1].read_bytes, 100.0)
+
+    def test_inaccessible(self):
+        self.step(0)
+        self.process.error = psutil.AccessDenied(4711)
+        self.step(10)
+        self.assertNotIn('Server A', self.sampler.samples)
+        self.assertNotIn(4711, self.sampler._io)
+
+    def test_aggregate(self):
+        self.step(0)
+        self.process.vms = 3000
+        self.process.rss = 1001
+        self.step(10, cpu=10.0, read=1000)
+        self.process.rss = 1002
+        self.step(10, cpu=30.0, read=3000)
+        ret = self.sampler.aggregate('Server A')
+        self.assertEqual(ret['cpu'], 20.0)
+        self.assertEqual(ret['read_bytes'], 200.0)
+        self.assertEqual((ret['mem_total'], ret['mem_ram']), (3000, 1001))
+        self.assertNotIn('time', ret)
+        # only samples since the last call are aggregated
+        self.assertIsNone(self.sampler.aggregate('Server A'))
+        self.step(10, cpu=60.0)
+        self.assertEqual(self.sampler.aggregate('Server A')['cpu'], 60.0)
+
+    def test_history(self):
+        self.step(0)
+        for i in range(10):
+            self.step(10, cpu=float(i))
+        # one hour of samples at the default interval, one minute here
+        self.assertEqual([x.cpu for x in self.sampler.samples['Server A']], [4.0, 5.0, 6.0, 7.0, 8.0, 9.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
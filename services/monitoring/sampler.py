@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import psutil
+import threading
+import time
+
+from collections import deque
+from typing import Any, NamedTuple, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from core import Server
+
+__all__ = [
+    "Sample",
+    "LoadSampler"
+]
+
+
+class Sample(NamedTuple):
+    time: float
+    cpu: float
+    mem_total: int
+    mem_ram: int
+    # rates in bytes per second
+    read_bytes: float
+    write_bytes: float
+    # the network counters are only available for the whole node
+    bytes_sent: float
+    bytes_recv: float
+
+
+class LoadSampler:
+    """
+    Samples the load of all DCS processes of a node in one pass and keeps the samples of the last hour in memory.
+    Disk and network counters are converted into rates per second, based on the time that passed between two samples.
+    """
+    def __init__(self, interval: int = 10, history: int = 3600):
+        self.interval = interval
+        self.samples: dict[str, deque[Sample]] = {}
+        self._maxlen = max(history // interval, 1)
+        self._io: dict[int, tuple[float, Any]] = {}
+        self._net: Optional[tuple[float, Any]] = None
+        self._aggregated: dict[str, float] = {}
+        # samples are taken in a thread
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _rate(new: int, old: int, elapsed: float) -> float:
+        # counters might be reset (or overflow)
+        return max(new - old, 0) / elapsed if elapsed > 0 else 0.0
+
+    def sample(self, servers: list[Server]) -> None:
+        """
+        Takes one sample of each server's process. Servers, whose process can't be accessed, are skipped.
+        The first call for a process only takes the baseline of its counters.
+        """
+        now = time.monotonic()
+        net = psutil.net_io_counters(pernic=False)
+        if self._net:
+            elapsed = now - self._net[0]
+            bytes_sent = self._rate(net.bytes_sent, self._net[1].bytes_sent, elapsed)
+            bytes_recv = self._rate(net.bytes_recv, self._net[1].bytes_recv, elapsed)
+        else:
+            bytes_sent = bytes_recv = 0.0
+        self._net = (now, net)
+
+        pids = set()
+        for server in servers:
+            process = server.process
+            try:
+                with process.oneshot():
+                    cpu = process.cpu_percent()
+                    # memory_full_info() would walk through all pages of the process
+                    memory = process.memory_info()
+                    io = process.io_counters()
+            except (psutil.NoSuchProcess, psutil.AccessDenied, PermissionError):
+                continue
+            pids.add(process.pid)
+            previous = self._io.get(process.pid)
+            self._io[process.pid] = (now, io)
+            if not previous:
+                # the first call only takes the baseline of the counters (and of cpu_percent)
+                continue
+            elapsed = now - previous[0]
+            read_bytes = self._rate(io.read_bytes, previous[1].read_bytes, elapsed)
+            write_bytes = self._rate(io.write_bytes, previous[1].write_bytes, elapsed)
+            with self._lock:
+                samples = self.samples.get(server.name)
+                if samples is None:
+                    samples = self.samples[server.name] = deque(maxlen=self._maxlen)
+                samples.append(Sample(time.time(), cpu, memory.vms, memory.rss, read_bytes, write_bytes, bytes_sent,
+                                      bytes_recv))
+        for pid in self._io.keys() - pids:
+            del self._io[pid]
+
+    def aggregate(self, server_name: str) -> Optional[dict]:
+        """
+        Returns the average of all samples of a server, that were taken since the last call.
+        """
+        since = self._aggregated.get(server_name, 0)
+        with self._lock:
+            samples = [x for x in self.samples.get(server_name, []) if x.time > since]
+        if not samples:
+            return None
+        self._aggregated[server_name] = samples[-1].time
+        ret = {
+            name: sum(getattr(x, name) for x in samples) / len(samples)
+            for name in Sample._fields if name != 'time'
+        }
+        for name in ['mem_total', 'mem_ram']:
+            ret[name] = int(ret[name])
+        return ret
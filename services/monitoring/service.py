@@ -4,7 +4,6 @@ import asyncio
 import ctypes
 import logging
 import os
-import psutil
 import shutil
 import sys
 
@@ -24,12 +23,15 @@ from typing import cast
 
 from ..servicebus import ServiceBus
 from ..bot import BotService
+from .sampler import LoadSampler
 
 __all__ = [
     "MonitoringService"
 ]
 
 last_wait_time = 0
+# seconds between two samples of the server load
+SAMPLE_INTERVAL = 10
 
 
 @ServiceRegistry.register(depends_on=[ServiceBus])
@@ -37,8 +39,7 @@ class MonitoringService(Service):
     def __init__(self, node):
         super().__init__(node, name="Monitoring")
         self.bus = ServiceRegistry.get(ServiceBus)
-        self.io_counters = {}
-        self.net_io_counters = None
+        self.sampler = LoadSampler(interval=SAMPLE_INTERVAL)
         self.space_warning_sent: dict[str, bool] = {}
         self.space_alert_sent: dict[str, bool] = {}
 
@@ -51,6 +52,8 @@ class MonitoringService(Service):
             self.space_warning_sent['C:'] = False
             self.space_alert_sent['C:'] = False
         self.check_autoexec()
+        if 'serverstats' in self.node.plugins:
+            self.sampling.start()
         self.monitoring.start()
         if self.get_config().get('time_sync', False):
             time_server = self.get_config().get('time_server', None)
@@ -81,6 +84,8 @@ class MonitoringService(Service):
         if self.get_config().get('time_sync', False):
             self.time_sync.cancel()
         self.monitoring.cancel()
+        if self.sampling.is_running():
+            self.sampling.cancel()
         await super().stop()
 
     def check_autoexec(self):
@@ -251,75 +256,23 @@ class MonitoringService(Service):
                       len(asyncio.all_tasks(self.bus.loop))))
         self.apool.pop_stats()
 
-    def _pull_load_params(self, server: Server) -> dict:
-        process = server.process
-        pid = process.pid
-
-        # Fetch process resource statistics
-        cpu = process.cpu_percent()
-        memory = process.memory_full_info()
-
-        io_counters = process.io_counters()
-
-        # Calculate I/O metrics (read_bytes, write_bytes)
-        previous_io = self.io_counters.get(pid)  # Get previous I/O counters, if available.
-        if previous_io is None:  # If no previous data, assume no I/O activity.
-            write_bytes = read_bytes = 0
-        else:
-            write_bytes = io_counters.write_bytes - previous_io.write_bytes
-            read_bytes = io_counters.read_bytes - previous_io.read_bytes
-
-        # Update the stored I/O counters for the current process.
-        self.io_counters[pid] = io_counters
-
-        # Network I/O counters (bytes sent/recv logic with batching interval optimization)
-        net_io_counters = psutil.net_io_counters(pernic=False)
-        if not self.net_io_counters:  # No previous data, assume 0 activity.
-            bytes_sent = bytes_recv = 0
-        else:
-            interval_inverse = 1 / 7200
-            bytes_sent = int((net_io_counters.bytes_sent - self.net_io_counters.bytes_sent) * interval_inverse)
-            bytes_recv = int((net_io_counters.bytes_recv - self.net_io_counters.bytes_recv) * interval_inverse)
-
-        # Update the stored network I/O counters.
-        self.net_io_counters = net_io_counters
-
-        return {
-            "command": "serverLoad",
-            "cpu": cpu,
-            "mem_total": memory.vms,
-            "mem_ram": memory.rss,
-            "read_bytes": read_bytes,
-            "write_bytes": write_bytes,
-            "bytes_recv": bytes_recv,
-            "bytes_sent": bytes_sent,
-            "server_name": server.name,
-        }
-
     async def serverload(self):
-        async def process_server(server):
+        for server in self.bus.servers.values():
             if server.is_remote or server.status not in [Status.RUNNING, Status.PAUSED]:
-                return
+                continue
             elif not server.process or not server.process.is_running():
                 self.log.warning(f"DCSServerBot is not attached to a DCS.exe or DCS_Server.exe process on "
                                  f"server {server.name}, skipping server load gathering.")
-                return
-
-            try:
-                # Offload `_pull_load_params` to a thread (CPU-bound operation)
-                load_params = await asyncio.to_thread(self._pull_load_params, server)
-                await self.bus.send_to_node(load_params)
-            except (psutil.AccessDenied, PermissionError):
-                self.log.debug(
-                    f"Server {server.name} was not started by the bot, skipping server load gathering."
-                )
-            except psutil.NoSuchProcess:
-                self.log.debug(
-                    f"Server {server.name} died, skipping server load gathering."
-                )
-
-        tasks = [process_server(server) for server in self.bus.servers.values()]
-        await asyncio.gather(*tasks)
+                continue
+            load = self.sampler.aggregate(server.name)
+            if not load:
+                self.log.debug(f"No load samples for server {server.name} (not started by the bot?), skipping "
+                               f"server load gathering.")
+                continue
+            await self.bus.send_to_node({
+                "command": "serverLoad",
+                "server_name": server.name
+            } | load)
 
     @staticmethod
     def convert_bytes(size_bytes: int) -> str:
@@ -376,6 +329,21 @@ class MonitoringService(Service):
         except Exception as ex:
             self.log.exception(ex)
 
+    @tasks.loop(seconds=SAMPLE_INTERVAL)
+    async def sampling(self):
+        servers = [
+            server for server in self.bus.servers.values()
+            if not server.is_remote and server.status in [Status.RUNNING, Status.PAUSED]
+            and server.process and server.process.is_running()
+        ]
+        if not servers:
+            return
+        try:
+            # all processes are sampled in one go
+            await asyncio.to_thread(self.sampler.sample, servers)
+        except Exception as ex:
+            self.log.exception(ex)
+
     @monitoring.before_loop
     async def before_loop(self):
         if self.node.master:
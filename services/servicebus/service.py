@@ -1,12 +1,10 @@
 from __future__ import annotations
 import asyncio
-import concurrent
 import inspect
 import json
+import socket
 import uuid
 
-from concurrent.futures import ThreadPoolExecutor
-from contextlib import closing
 from copy import deepcopy
 from core import Server, Mission, Node, DataObjectFactory, Status, Autoexec, ServerProxy, utils, PubSub, PerformanceLog, \
     ThreadSafeDict, Instance
@@ -19,9 +17,7 @@ from enum import Enum
 from functools import reduce
 from psycopg.rows import dict_row
 from psycopg.types.json import Json
-from queue import Queue
-from socketserver import BaseRequestHandler, ThreadingUDPServer
-from typing import Callable, Optional, cast, Union, Any, TYPE_CHECKING
+from typing import Optional, cast, Union, Any, Iterable, TYPE_CHECKING
 
 __all__ = [
     "ServiceBus"
@@ -41,10 +37,13 @@ class ServiceBus(Service):
         self.version = self.node.bot_version
         self.listeners: dict[str, asyncio.Future] = dict()
         self.eventListeners: list[EventListener] = []
+        # routing table: command => list of (listener, mutable) for all listeners that handle the command
+        self.routes: dict[str, list[tuple[EventListener, bool]]] = dict()
         self.servers: dict[str, Server] = ThreadSafeDict()
         self.init_servers()
         self.udp_server = None
-        self.executor = None
+        # long-lived transport to send messages to the local DCS servers
+        self.dcs_transport: Optional[asyncio.DatagramTransport] = None
         if 'DCS' in self.locals and self.node.locals['DCS'].get('desanitize', True):
             if not self.node.locals['DCS'].get('cloud', False) or self.master:
                 utils.desanitize(self)
@@ -52,18 +51,20 @@ class ServiceBus(Service):
         db_pass = utils.get_password('database', self.node.config_dir)
         # main.yaml database connection has priority for intercom
         url = self.node.config.get("database", self.node.locals.get('database'))['url'].replace('SECRET', db_pass)
-        self.intercom_channel = PubSub(self.node, 'intercom', url, self.handle_rpc)
+        inline = self.node.locals.get('inline_messages', False)
+        self.intercom_channel = PubSub(self.node, 'intercom', url, self.handle_rpc, inline=inline)
         # nodes.yaml database connection has priority for broadcasts
         url = self.node.locals.get("database", self.node.config.get('database'))['url'].replace('SECRET', db_pass)
-        self.broadcasts_channel = PubSub(self.node, 'broadcasts', url, self.handle_broadcast_event)
+        self.broadcasts_channel = PubSub(self.node, 'broadcasts', url, self.handle_broadcast_event, inline=inline)
         self._lock = asyncio.Lock()
 
     async def start(self):
         await super().start()
         try:
             # Start the DCS listener
-            self.executor = ThreadPoolExecutor(thread_name_prefix='ServiceBus', max_workers=20)
             await self.start_udp_listener()
+            self.dcs_transport, _ = await self.loop.create_datagram_endpoint(
+                asyncio.DatagramProtocol, local_addr=('127.0.0.1', 0))
 
             # cleanup the intercom and broadcast channels
             await self.intercom_channel.clear()
@@ -118,14 +119,12 @@ class ServiceBus(Service):
     async def stop(self):
         if self.udp_server:
             self.log.debug("- Processing unprocessed messages ...")
-            await asyncio.to_thread(self.udp_server.shutdown)
+            await self.udp_server.shutdown()
             self.log.debug("- All messages processed.")
-            self.udp_server.server_close()
         await self.broadcasts_channel.close()
         self.log.debug('- Listener stopped.')
-        if self.executor:
-            self.executor.shutdown(wait=True)
-            self.log.debug('- Executor stopped.')
+        if self.dcs_transport:
+            self.dcs_transport.close()
         if not self.master:
             await self.send_to_node({
                 "command": "rpc",
@@ -153,11 +152,26 @@ class ServiceBus(Service):
     def register_eventListener(self, listener: EventListener):
         self.log.debug(f'  - Registering EventListener {type(listener).__name__}')
         self.eventListeners.append(listener)
+        self._build_routes()
 
     def unregister_eventListener(self, listener: EventListener):
         self.eventListeners.remove(listener)
+        self._build_routes()
         self.log.debug(f'  - EventListener {type(listener).__name__} unregistered.')
 
+    def _build_routes(self):
+        routes: dict[str, list[tuple[EventListener, bool]]] = dict()
+        for listener in self.eventListeners:
+            for event in listener.events:
+                routes.setdefault(event.name, []).append((listener, event.mutable))
+        # replace the whole table at once, as it is read from other threads
+        self.routes = routes
+
+    @staticmethod
+    def _event_payload(data: dict, mutable: bool) -> dict:
+        # every listener gets its own top-level dict, nested structures are shared read-only
+        return deepcopy(data) if mutable else dict(data)
+
     def init_servers(self):
         for instance in self.node.instances:
             try:
@@ -278,11 +292,12 @@ class ServiceBus(Service):
                 self.log.info(f"  => Remote DCS-server \"{server_name}\" unregistered.")
                 server.status = Status.UNREGISTERED
                 del self.servers[server_name]
+                self.remove_message_queue(server_name)
         # we do not delete the node but set it to None, to reactivate it later
         self.node.all_nodes[node.name] = None
         self.log.info(f"- Remote node {node.name} unregistered.")
 
-    def register_server(self, data: dict) -> bool:
+    async def register_server(self, data: dict) -> bool:
         server_name = data['server_name']
         # check for protocol incompatibilities
         if data['hook_version'] != self.version:
@@ -296,7 +311,8 @@ class ServiceBus(Service):
         server: ServerImpl = cast(ServerImpl, self.servers[server_name])
         # set the PID
         if not server.process:
-            server.process = utils.find_process("DCS_server.exe|DCS.exe", server.instance.name)
+            server.process = await asyncio.to_thread(utils.find_process, "DCS_server.exe|DCS.exe",
+                                                     server.instance.name)
             if not server.process:
                 self.log.warning("Could not find active DCS process. Please check, if you have started DCS with -w!")
         # if we are an agent, initialize the server
@@ -336,22 +352,23 @@ class ServiceBus(Service):
             self.log.warning("     You need to configure DSMC on your own to prevent issues with the mission list.")
 
         # update the database and check for server name changes
-        with self.pool.connection() as conn:
-            with closing(conn.cursor()) as cursor:
-                cursor.execute(
-                    'SELECT server_name FROM instances WHERE node=%s AND port=%s AND server_name IS NOT NULL',
-                    (self.node.name, data['port'])
-                )
-                if cursor.rowcount == 1:
-                    _server_name = cursor.fetchone()[0]
-                    if _server_name != server_name:
-                        if utils.findDCSInstances(_server_name) and not self.servers.get(_server_name):
-                            self.log.info(f'Auto-renaming server "{_server_name}" to "{server_name}"')
-                            asyncio.run(server.rename(server_name))
-                        else:
-                            self.log.warning(f'Registration of server "{server_name}" aborted due to conflict.')
-                            self.servers.pop(server_name, None)
-                            return False
+        async with self.apool.connection() as conn:
+            cursor = await conn.execute(
+                'SELECT server_name FROM instances WHERE node=%s AND port=%s AND server_name IS NOT NULL',
+                (self.node.name, data['port'])
+            )
+            row = await cursor.fetchone() if cursor.rowcount == 1 else None
+        if row:
+            _server_name = row[0]
+            if _server_name != server_name:
+                if (await asyncio.to_thread(utils.findDCSInstances, _server_name) and
+                        not self.servers.get(_server_name)):
+                    self.log.info(f'Auto-renaming server "{_server_name}" to "{server_name}"')
+                    await server.rename(server_name)
+                else:
+                    self.log.warning(f'Registration of server "{server_name}" aborted due to conflict.')
+                    self.servers.pop(server_name, None)
+                    return False
         return True
 
     def rename_server(self, server: Server, new_name: str):
@@ -359,9 +376,8 @@ class ServiceBus(Service):
         if server.name in self.servers:
             self.servers.pop(server.name, None)
         if server.name in self.udp_server.message_queue:
-            self.udp_server.message_queue[server.name].put({})
-            self.udp_server.message_queue[new_name] = Queue()
-            self.executor.submit(self.udp_server.process, new_name)
+            self.remove_message_queue(server.name)
+            self.add_message_queue(new_name)
 
     async def ban(self, ucid: str, banned_by: str, reason: str = 'n/a', days: Optional[int] = None):
         if days:
@@ -379,15 +395,17 @@ class ServiceBus(Service):
                     SET banned_by = excluded.banned_by, reason = excluded.reason, 
                         banned_at = excluded.banned_at, banned_until = excluded.banned_until
                 """, (ucid, banned_by, reason, until.replace(tzinfo=None)))
-        for server in self.servers.values():
-            if server.status not in [Status.PAUSED, Status.RUNNING, Status.STOPPED]:
-                continue
-            await server.send_to_dcs({
-                "command": "ban",
-                "ucid": ucid,
-                "reason": reason,
-                "banned_until": until_str
-            })
+        servers = [
+            server for server in self.servers.values()
+            if server.status in [Status.PAUSED, Status.RUNNING, Status.STOPPED]
+        ]
+        await self.send_many(servers, {
+            "command": "ban",
+            "ucid": ucid,
+            "reason": reason,
+            "banned_until": until_str
+        })
+        for server in servers:
             player = server.get_player(ucid=ucid)
             if player:
                 player.banned = True
@@ -396,13 +414,15 @@ class ServiceBus(Service):
         async with self.apool.connection() as conn:
             async with conn.transaction():
                 await conn.execute("DELETE FROM bans WHERE ucid = %s", (ucid, ))
-        for server in self.servers.values():
-            if server.status not in [Status.PAUSED, Status.RUNNING, Status.STOPPED]:
-                continue
-            await server.send_to_dcs({
-                "command": "unban",
-                "ucid": ucid
-            })
+        servers = [
+            server for server in self.servers.values()
+            if server.status in [Status.PAUSED, Status.RUNNING, Status.STOPPED]
+        ]
+        await self.send_many(servers, {
+            "command": "unban",
+            "ucid": ucid
+        })
+        for server in servers:
             player = server.get_player(ucid=ucid)
             if player:
                 player.banned = False
@@ -462,14 +482,39 @@ class ServiceBus(Service):
                 server.locals['channels'] = channels
             # add eventlistener queue
             if server.name not in self.udp_server.message_queue:
-                self.udp_server.message_queue[server.name] = Queue()
-                self.executor.submit(self.udp_server.process, server.name)
+                self.add_message_queue(server.name)
             self.log.info(f"  => Remote DCS-Server \"{server.name}\" registered.")
         except StopIteration:
             self.log.error(f"No configuration found for instance {instance} in config\\nodes.yaml")
         except Exception as ex:
             self.log.exception(str(ex), exc_info=True)
 
+    def send_datagram(self, data: bytes, port: int):
+        if self.dcs_transport and not self.dcs_transport.is_closing():
+            self.dcs_transport.sendto(data, ('127.0.0.1', port))
+        else:
+            # the bus is not started (yet), use a temporary socket
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as dcs_socket:
+                dcs_socket.sendto(data, ('127.0.0.1', port))
+
+    async def send_many(self, servers: Iterable[Server], message: dict):
+        """
+        Sends the same message to multiple DCS servers. The message is only serialized once for all local servers.
+        """
+        local_servers: list[ServerImpl] = []
+        for server in servers:
+            if server.is_remote:
+                await server.send_to_dcs(message.copy())
+            else:
+                local_servers.append(cast(ServerImpl, server))
+        if not local_servers:
+            return
+        msg = json.dumps(ServerImpl.serialize(message))
+        self.log.debug(f"HOST->{','.join(x.name for x in local_servers)}: {msg}")
+        data = msg.encode('utf-8')
+        for server in local_servers:
+            self.send_datagram(data, int(server.port))
+
     async def send_to_node(self, data: dict, *, node: Optional[Union[Node, str]] = None):
         if isinstance(node, Node):
             node = node.name
@@ -490,7 +535,7 @@ class ServiceBus(Service):
                     self.log.debug(f"Message received for unregistered server {server_name}, ignoring.")
                 else:
                     self.log.debug('{}->HOST: {}'.format(server_name, json.dumps(data)))
-                    self.udp_server.message_queue[server_name].put(data)
+                    self.udp_server.message_queue[server_name].put_nowait(data)
             else:
                 await self.handle_rpc(data)
         else:
@@ -616,7 +661,7 @@ class ServiceBus(Service):
                 self.loop.call_soon_threadsafe(f.set_result, data)
             if data['command'] not in ['registerDCSServer', 'getMissionUpdate']:
                 return
-        self.udp_server.message_queue[server_name].put(data)
+        self.udp_server.message_queue[server_name].put_nowait(data)
 
     async def handle_agent(self, data: dict):
         self.log.debug(f"MASTER->{self.node.name}: {json.dumps(data)}")
@@ -699,22 +744,110 @@ class ServiceBus(Service):
         return None
 
     async def propagate_event(self, command: str, data: dict, server: Optional[Server] = None):
+        routes = self.routes.get(command)
+        if not routes:
+            return
+        data = utils.make_readonly(data)
         tasks = [
-            asyncio.create_task(listener.processEvent(command, server, deepcopy(data)))
-            for listener in self.eventListeners
-            if listener.has_event(command)
+            asyncio.create_task(listener.processEvent(command, server, self._event_payload(data, mutable)))
+            for listener, mutable in routes
         ]
         await asyncio.gather(*tasks, return_exceptions=True)
 
+    async def process(self, server_name: str):
+        timeout = 120.0 if self.node.locals.get('slow_system', False) else 60.0
+        queue = self.udp_server.message_queue[server_name]
+        try:
+            while True:
+                data: dict = await queue.get()
+                try:
+                    if not data:
+                        return
+                    server: Server = self.servers.get(server_name)
+                    if not server:
+                        return
+                    command = data['command']
+                    if command == 'registerDCSServer':
+                        if not server.is_remote:
+                            if not await self.register_server(data):
+                                self.log.error(f"Error while registering server {server.name}.")
+                                return
+                            if not self.master:
+                                self.log.debug(f"Registering server {server.name} on Master node ...")
+                    elif server.status == Status.UNREGISTERED and command not in ['getWeatherInfo', 'getAirbases']:
+                        self.log.debug(
+                            f"Command {command} received for unregistered server {server.name}, ignoring.")
+                        continue
+                    if self.master:
+                        routes = self.routes.get(command)
+                        if not routes:
+                            continue
+                        payload = utils.make_readonly(data)
+                        tasks = [
+                            asyncio.create_task(
+                                listener.processEvent(command, server, self._event_payload(payload, mutable))
+                            )
+                            for listener, mutable in routes
+                        ]
+                        done, not_done = await asyncio.wait(
+                            tasks, timeout=timeout if command != 'registerDCSServer' else None)
+
+                        if not_done:
+                            # Logging the commands that could not be processed due to timeout
+                            self.log.warning(f"Command {data} was not processed due to a timeout.")
+                            for task in not_done:
+                                pos = tasks.index(task)
+                                self.log.debug(f"Not processed: {routes[pos][0].plugin_name}")
+                                task.cancel()
+                    else:
+                        await self.send_to_node(data)
+                except Exception as ex:
+                    self.log.exception(ex)
+                finally:
+                    queue.task_done()
+        finally:
+            self.log.debug(f"Listener for server {server_name} stopped.")
+            # only remove our own queue, the server might have been renamed meanwhile
+            if self.udp_server.message_queue.get(server_name) is queue:
+                self.udp_server.message_queue.pop(server_name, None)
+            if self.udp_server.consumers.get(server_name) is asyncio.current_task():
+                self.udp_server.consumers.pop(server_name, None)
+
+    def add_message_queue(self, server_name: str):
+        self.remove_message_queue(server_name)
+        self.udp_server.message_queue[server_name] = asyncio.Queue()
+        self.udp_server.consumers[server_name] = asyncio.create_task(self.process(server_name))
+
+    def remove_message_queue(self, server_name: str):
+        """
+        Stops the consumer of a server that was renamed or unregistered. Pending messages of that server are dropped.
+        """
+        if not self.udp_server:
+            return
+        queue = self.udp_server.message_queue.pop(server_name, None)
+        if queue:
+            # wakes up the consumer, if it is the one that is calling us (rename during the registration)
+            queue.put_nowait({})
+        consumer = self.udp_server.consumers.pop(server_name, None)
+        if consumer and consumer is not asyncio.current_task():
+            consumer.cancel()
+
     async def start_udp_listener(self):
-        class RequestHandler(BaseRequestHandler):
+        class DCSProtocol(asyncio.DatagramProtocol):
+            def __init__(derived):
+                derived.transport: Optional[asyncio.DatagramTransport] = None
+                derived.message_queue: dict[str, asyncio.Queue[dict]] = {}
+                derived.consumers: dict[str, asyncio.Task] = {}
 
-            def handle(derived):
-                if not derived.request or not derived.request[0]:
+            def connection_made(derived, transport: asyncio.DatagramTransport):
+                derived.transport = transport
+
+            def datagram_received(derived, message: bytes, addr: tuple[str, int]):
+                if not message:
                     self.log.warning(f"Empty request received on port {self.node.listen_port} - ignoring.")
                     return
                 try:
-                    data: dict = json.loads(derived.request[0].strip())
+                    data: dict = json.loads(message.strip())
                 except json.JSONDecodeError:
                     self.log.warning(f"Invalid request received on port {self.node.listen_port} - ignoring.")
                     return
@@ -735,89 +868,33 @@ class ServiceBus(Service):
                     if data['channel'] in server.listeners:
                         f = server.listeners.get(data['channel'])
                         if f and not f.done():
-                            self.loop.call_soon_threadsafe(f.set_result, data)
+                            f.set_result(data)
                         if data['command'] not in ['registerDCSServer', 'getMissionUpdate']:
                             return
-                udp_server: MyThreadingUDPServer = cast(MyThreadingUDPServer, derived.server)
-                if server.name not in udp_server.message_queue:
-                    udp_server.message_queue[server.name] = Queue()
-                    self.executor.submit(udp_server.process, server.name)
-                udp_server.message_queue[server.name].put(data)
-
-        class MyThreadingUDPServer(ThreadingUDPServer):
-            def __init__(derived, server_address: tuple[str, int], request_handler: Callable[..., BaseRequestHandler]):
-                try:
-                    # enable reuse, in case the restart was too fast and the port was still in TIME_WAIT
-                    MyThreadingUDPServer.allow_reuse_address = True
-                    MyThreadingUDPServer.max_packet_size = 65504
-                    derived.message_queue: dict[str, Queue[dict]] = {}
-                    super().__init__(server_address, request_handler)
-                except Exception as ex:
-                    self.log.exception(ex)
+                if server.name not in derived.message_queue:
+                    self.add_message_queue(server.name)
+                derived.message_queue[server.name].put_nowait(data)
 
-            def process(derived, server_name: str):
-                try:
-                    timeout = 120.0 if self.node.locals.get('slow_system', False) else 60.0
-                    data: dict = derived.message_queue[server_name].get()
-                    while data:
-                        server: Server = self.servers.get(server_name)
-                        if not server:
-                            return
-                        try:
-                            command = data['command']
-                            if command == 'registerDCSServer':
-                                if not server.is_remote:
-                                    if not self.register_server(data):
-                                        self.log.error(f"Error while registering server {server.name}.")
-                                        return
-                                    if not self.master:
-                                        self.log.debug(f"Registering server {server.name} on Master node ...")
-                            elif server.status == Status.UNREGISTERED and command not in ['getWeatherInfo', 'getAirbases']:
-                                self.log.debug(
-                                    f"Command {command} received for unregistered server {server.name}, ignoring.")
-                                continue
-                            if self.master:
-                                futures = [
-                                    asyncio.run_coroutine_threadsafe(
-                                        listener.processEvent(command, server, deepcopy(data)), self.loop
-                                    )
-                                    for listener in self.eventListeners
-                                    if listener.has_event(command)
-                                ]
-                                done, not_done = concurrent.futures.wait(
-                                    futures, timeout=timeout if command != 'registerDCSServer' else None)
-
-                                if not_done:
-                                    # Logging the commands that could not be processed due to timeout
-                                    self.log.warning(f"Command {data} was not processed due to a timeout.")
-                                    listeners = [x for x in self.eventListeners if x.has_event(command)]
-                                    for future in not_done:
-                                        pos = futures.index(future)
-                                        self.log.debug(f"Not processed: {listeners[pos].plugin_name}")
-                                        future.cancel()
-                            else:
-                                asyncio.run_coroutine_threadsafe(self.send_to_node(data), self.loop)
-                        except Exception as ex:
-                            self.log.exception(ex)
-                        finally:
-                            derived.message_queue[server.name].task_done()
-                            data = derived.message_queue[server.name].get()
-                finally:
-                    self.log.debug(f"Listener for server {server_name} stopped.")
-                    derived.message_queue.pop(server_name, None)
+            def error_received(derived, ex: Exception):
+                self.log.debug(f"Error on port {self.node.listen_port}: {ex}")
 
-            def shutdown(derived):
-                super().shutdown()
+            async def shutdown(derived):
+                derived.transport.close()
                 try:
-                    for server_name, queue in derived.message_queue.items():
+                    for server_name, queue in list(derived.message_queue.items()):
                         if not queue.empty():
-                            queue.join()
-                        queue.put({})
+                            await queue.join()
+                        queue.put_nowait({})
+                    await asyncio.gather(*derived.consumers.values(), return_exceptions=True)
                 except Exception as ex:
                     self.log.exception(ex)
 
         host = self.node.listen_address
         port = self.node.listen_port
-        self.udp_server = MyThreadingUDPServer((host, port), RequestHandler)
-        self.executor.submit(self.udp_server.serve_forever)
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        # enable reuse, in case the restart was too fast and the port was still in use
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((host, port))
+        self.udp_server = DCSProtocol()
+        await self.loop.create_datagram_endpoint(lambda: self.udp_server, sock=sock)
         self.log.debug('  - Listener started on interface {} port {} accepting commands.'.format(host, port))
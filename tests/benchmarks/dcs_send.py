@@ -0,0 +1,139 @@
+"""
+Benchmark of sending messages to the DCS servers: the former path (deepcopy, recursive serialize and a new socket per
+message) against the shared transport, the non-mutating ServerImpl.serialize() and ServiceBus.send_many().
+Run from the root directory with: python -m tests.benchmarks.dcs_send
+"""
+import asyncio
+import json
+import logging
+import socket
+import time
+
+from copy import deepcopy
+from core import Status
+from core.data.impl.serverimpl import ServerImpl
+from enum import Enum
+from services.servicebus.service import ServiceBus
+from types import SimpleNamespace
+from typing import Any
+
+ITERATIONS = 2000
+FAN_OUT = [1, 10, 50]
+
+BAN = {
+    "command": "ban",
+    "ucid": "a4d9c4c8b8d8e1f0a4d9c4c8b8d8e1f0",
+    "reason": "Team killing",
+    "banned_until": "2024-06-30 12:00 (UTC)"
+}
+# a message with nested data, like the ones of the mission and slotblocking plugins
+PARAMS = {
+    "command": "loadParams",
+    "plugin": "slotblocking",
+    "params": {
+        "restricted": [
+            {"unit_type": f"F-{i}", "discord": 112233445566778899 + i, "side": Status.RUNNING, "points": i,
+             "crew": True, "message": f"You need {i} points to use this slot."}
+            for i in range(50)
+        ],
+        "messages": {"credits_taken": "{deficit} credits taken", "payback": True, "ratio": 0.5}
+    }
+}
+
+
+def old_serialize(message: dict):
+    # the former ServerImpl.serialize(), which changed the message
+    def _serialize_value(value: Any) -> Any:
+        if isinstance(value, bool):
+            return value
+        elif isinstance(value, int):
+            return str(value)
+        elif isinstance(value, Enum):
+            return value.value
+        elif isinstance(value, dict):
+            return old_serialize(value)
+        elif isinstance(value, list):
+            return [_serialize_value(x) for x in value]
+        return value
+
+    for key, value in message.items():
+        message[key] = _serialize_value(value)
+    return message
+
+
+def old_send_to_dcs(message: dict, port: int):
+    # the former ServerImpl.send_to_dcs()
+    message = old_serialize(deepcopy(message))
+    msg = json.dumps(message)
+    dcs_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    dcs_socket.sendto(msg.encode('utf-8'), ('127.0.0.1', port))
+    dcs_socket.close()
+
+
+class _Bus:
+    """
+    Stands in for the ServiceBus, with the real transport and send_many().
+    """
+    send_datagram = ServiceBus.send_datagram
+    send_many = ServiceBus.send_many
+
+    def __init__(self):
+        self.log = logging.getLogger('benchmark')
+        self.dcs_transport = None
+
+
+def timeit(func, iterations: int = ITERATIONS) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return 1e6 * (time.perf_counter() - start) / iterations
+
+
+async def atimeit(func, iterations: int = ITERATIONS) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await func()
+    return 1e6 * (time.perf_counter() - start) / iterations
+
+
+async def main():
+    # the DCS servers, nobody reads from them, the datagrams are dropped once the buffers are full
+    receivers = []
+    for _ in range(max(FAN_OUT)):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind(('127.0.0.1', 0))
+        receivers.append(sock)
+    servers = [
+        SimpleNamespace(name=f"Server {i}", port=x.getsockname()[1], is_remote=False)
+        for i, x in enumerate(receivers)
+    ]
+    bus = _Bus()
+    bus.dcs_transport, _ = await asyncio.get_running_loop().create_datagram_endpoint(
+        asyncio.DatagramProtocol, local_addr=('127.0.0.1', 0))
+    try:
+        for name, message in [('ban', BAN), ('loadParams', PARAMS)]:
+            old = timeit(lambda: old_serialize(deepcopy(message)))
+            new = timeit(lambda: ServerImpl.serialize(message))
+            print(f"{name:<10} serialize:        old {old:8.1f} µs, new {new:8.1f} µs")
+            port = servers[0].port
+            old = timeit(lambda: old_send_to_dcs(message, port))
+            new = timeit(lambda: bus.send_datagram(json.dumps(ServerImpl.serialize(message)).encode('utf-8'), port))
+            print(f"{name:<10} send to 1 server: old {old:8.1f} µs, new {new:8.1f} µs")
+            for count in FAN_OUT:
+                targets = servers[:count]
+
+                def old_fan_out():
+                    for server in targets:
+                        old_send_to_dcs(message, server.port)
+
+                old = timeit(old_fan_out, ITERATIONS // count)
+                new = await atimeit(lambda: bus.send_many(targets, message), ITERATIONS // count)
+                print(f"{name:<10} fan-out to {count:>2}:    old {old:8.1f} µs, new {new:8.1f} µs")
+    finally:
+        bus.dcs_transport.close()
+        for sock in receivers:
+            sock.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
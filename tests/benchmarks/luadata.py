@@ -0,0 +1,166 @@
+"""
+Benchmark of luadata.unserialize() with generated files of real size: a large mission, the options of a mission and a
+serverSettings.lua.
+If lupa is installed, the former implementation (a Lua runtime per call) is measured as well.
+Run from the root directory with: python -m tests.benchmarks.luadata
+"""
+import random
+import time
+
+from luadata import serialize, unserialize
+
+UNITS_PER_GROUP = 4
+MODULES = ['F-16C', 'FA-18C', 'F-14', 'A-10C', 'A-10C_2', 'AH-64D', 'Ka-50', 'Mi-24P', 'Mi-8MTV2', 'UH-1H', 'SA342',
+           'AV8BNA', 'M-2000C', 'JF-17', 'F-15E', 'F-5E', 'MiG-21Bis', 'MiG-29', 'Su-25T', 'Su-27', 'C-101', 'L-39C',
+           'Yak-52', 'P-51D', 'Spitfire', 'Bf-109K4', 'FW-190D9', 'I-16', 'Mosquito', 'CA', 'Supercarrier', 'AJS37',
+           'Mirage-F1', 'MB-339', 'CH-47F', 'OH-58D', 'Hercules', 'A-4E-C', 'T-45', 'Christen Eagle II']
+
+
+def make_mission(rnd: random.Random, units: int) -> dict:
+    groups = []
+    for g in range(units // UNITS_PER_GROUP):
+        groups.append({
+            "groupId": g + 1,
+            "name": f"Group {g + 1}",
+            "task": rnd.choice(["CAP", "CAS", "Ground Nothing"]),
+            "hidden": False,
+            "route": {
+                "points": [
+                    {"x": rnd.uniform(-300000, 300000), "y": rnd.uniform(-300000, 300000), "alt": rnd.randint(0, 9000),
+                     "speed": rnd.uniform(0, 300), "type": "Turning Point", "action": "Turning Point"}
+                    for _ in range(rnd.randint(1, 4))
+                ]
+            },
+            "units": [
+                {"unitId": g * UNITS_PER_GROUP + u + 1, "name": f"Unit {g + 1}-{u + 1}",
+                 "type": rnd.choice(["F-16C_50", "M-1 Abrams", "T-72B", "SA-11 Buk LN 9A310M1"]),
+                 "x": rnd.uniform(-300000, 300000), "y": rnd.uniform(-300000, 300000), "heading": rnd.uniform(0, 6.28),
+                 "skill": rnd.choice(["Average", "Good", "High", "Excellent", "Client"]), "playerCanDrive": True}
+                for u in range(UNITS_PER_GROUP)
+            ]
+        })
+    return {
+        "theatre": "Caucasus",
+        "date": {"Year": 2024, "Month": 6, "Day": 1},
+        "coalition": {
+            "blue": {"country": [{"id": 2, "name": "USA", "vehicle": {"group": groups[:len(groups) // 2]}}]},
+            "red": {"country": [{"id": 0, "name": "Russia", "vehicle": {"group": groups[len(groups) // 2:]}}]}
+        }
+    }
+
+
+def make_options(rnd: random.Random) -> dict:
+    # the options of a mission (and options.lua), most of it are the settings of the installed modules
+    def settings(count: int) -> dict:
+        return {
+            f"setting{i}": rnd.choice([True, False, rnd.randint(0, 100), rnd.uniform(0, 1), f"value{i}"])
+            for i in range(count)
+        }
+
+    return {
+        "difficulty": settings(40) | {"iconsTheme": "nato", "labels": 0, "externalViews": True},
+        "graphics": settings(60) | {
+            "width": 2560, "height": 1440, "aspect": 1.7777777777778, "multiMonitorSetup": "1camera"
+        },
+        "sound": settings(30),
+        "views": {"cockpit": {"mirrors": False, "reflections": False, "avionics": 0}},
+        "miscellaneous": settings(25),
+        "plugins": {
+            name: settings(rnd.randint(10, 40)) | {
+                "CPLocalList": "default", "callsigns": [f"{name} {i}" for i in range(4)]
+            }
+            for name in MODULES
+        },
+        "format": 1
+    }
+
+
+def make_server_settings(rnd: random.Random) -> dict:
+    return {
+        "description": "A busy PvE server with a long description, some rules and a link to the discord.",
+        "require_pure_textures": True,
+        "listStartIndex": 1,
+        "advanced": {
+            "allow_change_tailno": True, "disable_events": False, "allow_ownship_export": True, "allow_object_export":
+            True, "pause_on_load": False, "allow_sensor_export": True, "event_Takeoff": True, "pause_without_clients":
+            False, "client_outbound_limit": 0, "client_inbound_limit": 0, "server_can_screenshot": False,
+            "allow_players_pool": True, "voice_chat_server": True, "allow_change_skin": True, "event_Connect": True,
+            "event_Ejecting": True, "event_Kill": True, "event_Crash": True, "event_Role": False, "resume_mode": 1,
+            "maxPing": 0, "allow_trial_only_clients": False, "allow_dynamic_radio": True, "sav_autosave": False
+        },
+        "port": 10308,
+        "mode": 0,
+        "bind_address": "",
+        "isPublic": True,
+        "listShuffle": False,
+        "password": "",
+        "listLoop": False,
+        "name": "DCSServerBot Test Server",
+        "require_pure_scripts": False,
+        "missionList": [
+            f"C:\\Users\\dcs\\Saved Games\\DCS.server\\Missions\\Mission {i} {rnd.choice(['Caucasus', 'Syria'])}.miz"
+            for i in range(30)
+        ],
+        "require_pure_clients": False,
+        "require_pure_models": True,
+        "maxPlayers": 64
+    }
+
+
+def old_unserialize(raw: str):
+    # the former implementation, that executed the file in a Lua runtime
+    from lupa.lua51 import LuaRuntime, lua_type
+
+    def _lua_table_to_dict(lua_table):
+        keys = list(lua_table.keys())
+        if all(isinstance(key, int) for key in keys) and sorted(keys) == list(range(1, len(keys) + 1)):
+            return [lua_table[i] if lua_type(lua_table[i]) != "table" else _lua_table_to_dict(lua_table[i])
+                    for i in range(1, len(lua_table) + 1)]
+        return {
+            key: _lua_table_to_dict(value) if lua_type(value) == "table" else value
+            for key, value in lua_table.items()
+        }
+
+    lua = LuaRuntime(unpack_returned_tuples=False, encoding='utf-8', max_memory=0)
+    lua.execute(raw)
+    return _lua_table_to_dict(lua.globals()[raw.split("=")[0].strip()])
+
+
+def measure(func, text: str, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func(text)
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    try:
+        import lupa  # noqa: F401
+        baseline = True
+    except ImportError:
+        print("lupa is not installed, the former implementation is not measured.")
+        baseline = False
+
+    rnd = random.Random(4711)
+    for name, variable, data, iterations in [
+        ("mission (50k units)", "mission", make_mission(rnd, 50000), 1),
+        ("mission (2k units)", "mission", make_mission(rnd, 2000), 10),
+        ("options", "options", make_options(rnd), 100),
+        ("serverSettings.lua", "cfg", make_server_settings(rnd), 1000)
+    ]:
+        text = f"{variable} = " + serialize(data, indent="    ")
+        size = len(text.encode('utf-8'))
+        new = measure(unserialize, text, iterations)
+        line = f"{name:<20} {size / 1024:10.1f} KB: unserialize() {1000 * new:9.2f} ms"
+        if baseline:
+            try:
+                old = measure(old_unserialize, text, iterations)
+                line += f", former implementation {1000 * old:9.2f} ms"
+            except Exception as ex:
+                # Lua 5.1 can't load large files
+                line += f", former implementation failed: {ex}"
+        print(line + f", round trip {'matches' if unserialize(text) == data else 'DOES NOT match'}")
+
+
+if __name__ == '__main__':
+    main()
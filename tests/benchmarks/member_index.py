@@ -0,0 +1,96 @@
+"""
+Benchmark of the member matching (utils.match / MemberIndex) against the former full scan.
+Run from the root directory with: python -m tests.benchmarks.member_index
+"""
+import random
+import string
+import time
+
+from core.utils.discord import MemberIndex, normalize_name
+from fuzzywuzzy import fuzz
+from types import SimpleNamespace
+
+MEMBERS = 50000
+LOOKUPS = 200
+# the full scan takes seconds per lookup
+SCANS = 10
+
+
+def random_name(rnd: random.Random) -> str:
+    return ''.join(rnd.choice(string.ascii_letters + string.digits + ' _-') for _ in range(rnd.randint(4, 20)))
+
+
+def edit(rnd: random.Random, name: str) -> str:
+    # what players do to their discord name in DCS: change the case, add a tag, drop or swap a character
+    name = rnd.choice([name, name.lower(), name.upper()])
+    if rnd.random() < 0.3:
+        name = f"[{rnd.choice(['JG52', '104th', 'VFA-2'])}] {name}"
+    if len(name) > 5 and rnd.random() < 0.5:
+        i = rnd.randrange(len(name) - 1)
+        name = name[:i] + name[i + 1] + name[i] + name[i + 2:]
+    return name
+
+
+def full_scan(name: str, members: list, min_score: int = 70):
+    # the former implementation of utils.match()
+    name = normalize_name(name)
+    user_lists = [
+        [normalize_name(getattr(member, attr)) for member in members]
+        for attr in ['display_name', 'global_name', 'name']
+    ]
+    max_score = 0
+    best_match_index = None
+    for user_list in user_lists:
+        for idx, user in enumerate(user_list):
+            score = fuzz.ratio(name, user)
+            if score > max_score:
+                best_match_index = idx if score >= min_score else None
+                max_score = score if score >= min_score else 0
+    return members[best_match_index] if best_match_index is not None else None
+
+
+def main():
+    rnd = random.Random(4711)
+    members = []
+    for i in range(MEMBERS):
+        name = random_name(rnd)
+        members.append(SimpleNamespace(id=i, bot=False, name=name.lower().replace(' ', '_'),
+                                       global_name=name if rnd.random() < 0.8 else None,
+                                       display_name=rnd.choice([name, random_name(rnd)])))
+    names = [
+        edit(rnd, rnd.choice(members).display_name) if rnd.random() < 0.7 else random_name(rnd)
+        for _ in range(LOOKUPS)
+    ]
+
+    start = time.perf_counter()
+    index = MemberIndex(members)
+    print(f"Build index of {len(index)} members: {time.perf_counter() - start:.2f} s")
+
+    timings = []
+    found = 0
+    for name in names:
+        start = time.perf_counter()
+        if index.match(name):
+            found += 1
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    print(f"Index lookup: avg {1000 * sum(timings) / len(timings):.1f} ms, "
+          f"median {1000 * timings[len(timings) // 2]:.1f} ms, max {1000 * timings[-1]:.1f} ms, "
+          f"{found} of {LOOKUPS} names matched")
+
+    timings = []
+    same = 0
+    for name in names[:SCANS]:
+        start = time.perf_counter()
+        expected = full_scan(name, members)
+        timings.append(time.perf_counter() - start)
+        # both return the best match, but the scores of different members can be equal
+        actual = index.match(name)
+        if (expected is None) == (actual is None):
+            same += 1
+    print(f"Full scan: avg {sum(timings) / len(timings):.2f} s, "
+          f"{same} of {SCANS} lookups agree with the index on whether there is a match")
+
+
+if __name__ == '__main__':
+    main()
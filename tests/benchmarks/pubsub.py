@@ -0,0 +1,167 @@
+"""
+Benchmark of the node-to-master messaging (core.pubsub.PubSub): round trip latency of RPCs and throughput.
+Compares the inline delivery by NOTIFY, the table fallback for large messages and the batched writer against the
+former writer, that inserted every message on its own.
+The benchmark works on its own table (bench_intercom), that is dropped afterward.
+Run from the root directory with: DATABASE_URL=postgresql://... python -m tests.benchmarks.pubsub
+"""
+import asyncio
+import logging
+import os
+import psycopg
+import sys
+import time
+
+from contextlib import suppress
+from core.pubsub import PubSub
+from psycopg.types.json import Json
+from types import SimpleNamespace
+
+CHANNEL = 'bench_intercom'
+GUILD_ID = 4711
+RPCS = 200
+MESSAGES = 5000
+
+
+class _OldPubSub(PubSub):
+    """
+    The former writer: one INSERT (and one round trip) per message.
+    """
+    async def _process_write(self):
+        await asyncio.sleep(1)
+        while not self._stop_event.is_set():
+            with suppress(psycopg.OperationalError):
+                async with await psycopg.AsyncConnection.connect(self.url, autocommit=True) as conn:
+                    while not self._stop_event.is_set():
+                        message = await self.write_queue.get()
+                        if not message:
+                            return
+                        try:
+                            await conn.execute(f"""
+                                INSERT INTO {self.name} (guild_id, node, data)
+                                VALUES (%(guild_id)s, %(node)s, %(data)s)
+                            """, message)
+                        finally:
+                            self.write_queue.task_done()
+
+
+async def create_table(url: str):
+    async with await psycopg.AsyncConnection.connect(url, autocommit=True) as conn:
+        await conn.execute(f"DROP TABLE IF EXISTS {CHANNEL}")
+        await conn.execute(f"""
+            CREATE TABLE {CHANNEL} (
+                id SERIAL PRIMARY KEY, guild_id BIGINT NOT NULL, node TEXT NOT NULL,
+                time TIMESTAMP NOT NULL DEFAULT (now() AT TIME ZONE 'utc'), data JSON
+            )
+        """)
+        await conn.execute(f"CREATE INDEX ON {CHANNEL} (node)")
+        await conn.execute(f"""
+            CREATE OR REPLACE FUNCTION {CHANNEL}_notify() RETURNS trigger AS $$
+            BEGIN
+                PERFORM pg_notify('{CHANNEL}', NEW.node);
+                RETURN NEW;
+            END;
+            $$ LANGUAGE plpgsql
+        """)
+        await conn.execute(f"""
+            CREATE TRIGGER {CHANNEL}_trigger AFTER INSERT OR UPDATE ON {CHANNEL}
+            FOR EACH ROW EXECUTE PROCEDURE {CHANNEL}_notify()
+        """)
+
+
+async def drop_table(url: str):
+    async with await psycopg.AsyncConnection.connect(url, autocommit=True) as conn:
+        await conn.execute(f"DROP TABLE IF EXISTS {CHANNEL}")
+        await conn.execute(f"DROP FUNCTION IF EXISTS {CHANNEL}_notify()")
+
+
+class Cluster:
+    """
+    A master and an agent node, which answers every message of the agent.
+    """
+    def __init__(self, url: str, cls: type[PubSub], inline: bool, padding: int):
+        self.padding = 'x' * padding
+        self.replies: dict[int, asyncio.Future] = {}
+        self.received = 0
+        self.done = asyncio.Event()
+        self.expected = 0
+        log = logging.getLogger('benchmark')
+        self.master = cls(SimpleNamespace(name='Node1', master=True, guild_id=GUILD_ID, log=log), CHANNEL, url,
+                          self.handle_master, inline=inline)
+        self.agent = cls(SimpleNamespace(name='Node2', master=False, guild_id=GUILD_ID, log=log), CHANNEL, url,
+                         self.handle_agent, inline=inline)
+        self.listeners = [asyncio.create_task(x.subscribe()) for x in [self.master, self.agent]]
+
+    def message(self, node: str, data: dict) -> dict:
+        return {'guild_id': GUILD_ID, 'node': node, 'data': Json(data | {'padding': self.padding})}
+
+    async def handle_master(self, data: dict):
+        if data.get('reply'):
+            await self.master.publish(self.message('Node2', {'seq': data['seq']}))
+        else:
+            self.received += 1
+            if self.received == self.expected:
+                self.done.set()
+
+    async def handle_agent(self, data: dict):
+        future = self.replies.pop(data['seq'], None)
+        if future:
+            future.set_result(time.perf_counter())
+
+    async def wait_until_listening(self):
+        # the workers and listeners start after one second
+        await asyncio.sleep(2)
+
+    async def rpc(self, seq: int) -> float:
+        future = self.replies[seq] = asyncio.get_running_loop().create_future()
+        start = time.perf_counter()
+        await self.agent.publish(self.message('Master', {'seq': seq, 'reply': True}))
+        return await asyncio.wait_for(future, timeout=30) - start
+
+    async def burst(self, count: int) -> float:
+        self.received = 0
+        self.expected = count
+        self.done.clear()
+        start = time.perf_counter()
+        for i in range(count):
+            await self.agent.publish(self.message('Master', {'seq': i}))
+        await asyncio.wait_for(self.done.wait(), timeout=300)
+        return time.perf_counter() - start
+
+    async def close(self):
+        for x in self.listeners:
+            x.cancel()
+        await asyncio.gather(*self.listeners, return_exceptions=True)
+        await asyncio.gather(self.master.close(), self.agent.close())
+
+
+async def run(url: str, name: str, cls: type[PubSub], inline: bool, padding: int = 0):
+    await create_table(url)
+    cluster = Cluster(url, cls, inline, padding)
+    try:
+        await cluster.wait_until_listening()
+        timings = sorted([await cluster.rpc(i) for i in range(RPCS)])
+        elapsed = await cluster.burst(MESSAGES)
+        print(f"{name:<30} RPC p50 {1000 * timings[len(timings) // 2]:6.2f} ms, "
+              f"p99 {1000 * timings[int(len(timings) * 0.99)]:6.2f} ms | {MESSAGES / elapsed:8.0f} msgs/s")
+    finally:
+        await cluster.close()
+        await drop_table(url)
+
+
+async def main(url: str):
+    await run(url, 'one INSERT per message (old)', _OldPubSub, inline=False)
+    await run(url, 'batched INSERT', PubSub, inline=False)
+    await run(url, 'inline NOTIFY', PubSub, inline=True)
+    # payloads above the NOTIFY limit go through the table
+    await run(url, 'inline, table fallback (8 KB)', PubSub, inline=True, padding=8000)
+
+
+if __name__ == '__main__':
+    if 'DATABASE_URL' not in os.environ:
+        print("Set DATABASE_URL to the database to run the benchmark on.")
+        sys.exit(1)
+    if sys.platform == 'win32':
+        # psycopg does not support the proactor event loop
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+    asyncio.run(main(os.environ['DATABASE_URL']))
@@ -0,0 +1,86 @@
+"""
+Benchmark of the compiled slotblocking rules (SlotRules) against a scan of the "restricted" list.
+Run from the root directory with: python -m tests.benchmarks.slot_rules
+"""
+import random
+import re
+import time
+
+from core import utils
+from plugins.slotblocking.slots import SlotRules
+
+RULES = 1000
+LOOKUPS = 20000
+UNIT_TYPES = ['F-14B', 'F-16C_50', 'FA-18C_hornet', 'A-10C_2', 'AH-64D_BLK_II', 'Ka-50_3', 'UH-1H', 'Mi-24P',
+              'MiG-29A', 'Su-27', 'F-15ESE', 'AV8BNA', 'M-2000C', 'JF-17', 'Mi-8MT', 'SA342M']
+
+
+def make_rules(rnd: random.Random) -> list[dict]:
+    rules = []
+    for i in range(RULES):
+        rule = {"costs": rnd.randint(1, 100)}
+        kind = rnd.random()
+        if kind < 0.4:
+            rule['unit_type'] = f"{rnd.choice(UNIT_TYPES)}_{i}" if rnd.random() < 0.9 else rnd.choice(UNIT_TYPES)
+        elif kind < 0.7:
+            rule['unit_name'] = f"Squadron {i} "
+        elif kind < 0.9:
+            rule['group_name'] = f"^Group%-{i}%d"
+        else:
+            rule['unit_name'] = f"Ace {i}"
+            rule['group_name'] = f"^Flight {i}"
+        if rnd.random() < 0.5:
+            rule['side'] = rnd.choice([1, 2])
+        if rnd.random() < 0.3:
+            rule['points'] = rnd.randint(1, 10)
+        rules.append(rule)
+    return rules
+
+
+def scan(rules: list[dict], unit_type: str, unit_name: str, group_name: str, side: int):
+    # the lookup as it was done before the rules were compiled: translate the patterns on every call
+    for rule in rules:
+        if rule.get('side', side) != side:
+            continue
+        if 'unit_type' in rule and rule['unit_type'] == unit_type:
+            return rule
+        if 'unit_name' in rule and unit_name and re.search(utils.lua_pattern_to_python_regex(rule['unit_name']),
+                                                           unit_name):
+            return rule
+        if 'group_name' in rule and group_name and re.search(utils.lua_pattern_to_python_regex(rule['group_name']),
+                                                             group_name):
+            return rule
+    return None
+
+
+def main():
+    rnd = random.Random(4711)
+    rules = make_rules(rnd)
+    units = [
+        (rnd.choice(UNIT_TYPES), f"Squadron {rnd.randrange(RULES * 2)} #{rnd.randint(1, 4)}",
+         f"Group-{rnd.randrange(RULES * 2)}{rnd.randint(0, 9)}", rnd.choice([1, 2]))
+        for _ in range(LOOKUPS)
+    ]
+
+    start = time.perf_counter()
+    compiled = SlotRules(rules)
+    print(f"Compile {RULES} rules: {1000 * (time.perf_counter() - start):.1f} ms")
+
+    start = time.perf_counter()
+    found = [compiled.find(unit_type, unit_name, group_name, side=side)
+             for unit_type, unit_name, group_name, side in units]
+    elapsed = time.perf_counter() - start
+    print(f"SlotRules.find(): {1e6 * elapsed / LOOKUPS:.1f} µs per lookup, "
+          f"{sum(x is not None for x in found)} of {LOOKUPS} units restricted")
+
+    sample = units[:LOOKUPS // 20]
+    start = time.perf_counter()
+    expected = [scan(rules, *unit) for unit in sample]
+    elapsed = time.perf_counter() - start
+    print(f"Scan: {1e6 * elapsed / len(sample):.1f} µs per lookup")
+    mismatches = sum(x is not y for x, y in zip(found, expected))
+    print(f"{mismatches} of {len(sample)} lookups differ from the scan")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+"""
+Benchmark of the DCS listener of the ServiceBus: replays a stream of datagrams through DCSProtocol.datagram_received()
+into the queues and consumers of the servers and measures the events per second and the dispatch latency (from the
+reception of a datagram until a listener processes it).
+Without a capture, a stream of typical events of busy servers is generated. A captured stream is a file with one
+datagram (JSON) per line.
+Run from the root directory with: [UDP_CAPTURE=file] python -m tests.benchmarks.udp_replay
+"""
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+
+from collections import deque
+from core import Status
+from services.servicebus.service import ServiceBus
+from types import SimpleNamespace
+from typing import Optional
+
+SERVERS = 8
+EVENTS = 100000
+# datagrams that arrive before the event loop gets back to the consumers
+BURST = 50
+# datagrams per second of the latency run
+RATE = 2000
+# plugins that listen to every event, one of them gets its own copy of the data
+LISTENERS = 8
+
+
+def generate(rnd: random.Random) -> list[bytes]:
+    events = []
+    for i in range(EVENTS):
+        server_name = f"Server {rnd.randrange(SERVERS)}"
+        kind = rnd.random()
+        if kind < 0.7:
+            data = {
+                "command": "onMissionEvent", "server_name": server_name, "eventName": "S_EVENT_HIT",
+                "id": 2, "time": i / 10, "initiator": {
+                    "type": "UNIT", "unit_type": "F-16C_50", "name": f"Unit {rnd.randrange(500)}",
+                    "coalition": 2, "category": 0, "name_player": f"Player {rnd.randrange(100)}"
+                }, "target": {
+                    "type": "UNIT", "unit_type": "T-72B", "name": f"Unit {rnd.randrange(500)}",
+                    "coalition": 1, "category": 2
+                }, "weapon": {"name": "AIM_120C", "category": 1}
+            }
+        elif kind < 0.9:
+            data = {
+                "command": "onPlayerChangeSlot", "server_name": server_name, "id": rnd.randrange(2, 100),
+                "ucid": f"{rnd.randrange(100):032x}", "name": f"Player {rnd.randrange(100)}", "side": 2,
+                "slot": str(rnd.randrange(1000)), "unit_type": "F-16C_50", "unit_name": "Aerial-1-1",
+                "group_name": "Aerial-1", "group_id": 1, "unit_callsign": "Enfield11", "sub_slot": 0
+            }
+        else:
+            data = {
+                "command": "getMissionUpdate", "server_name": server_name, "pause": False,
+                "mission_time": i / 10, "real_time": i / 10, "num_players": rnd.randrange(100)
+            }
+        events.append(json.dumps(data).encode('utf-8'))
+    return events
+
+
+class _Listener:
+    def __init__(self, latencies: list[float], sent: dict[str, deque]):
+        self.latencies = latencies
+        self.sent = sent
+
+    async def processEvent(self, command: str, server, data: dict):
+        if self.latencies is not None:
+            self.latencies.append(time.perf_counter() - self.sent[server.name].popleft())
+
+
+class _Bus:
+    """
+    Stands in for the ServiceBus of the master node, with the real listener and consumers.
+    """
+    start_udp_listener = ServiceBus.start_udp_listener
+    process = ServiceBus.process
+    add_message_queue = ServiceBus.add_message_queue
+    remove_message_queue = ServiceBus.remove_message_queue
+    _event_payload = staticmethod(ServiceBus._event_payload)
+
+    def __init__(self, routes: dict):
+        self.log = logging.getLogger('benchmark')
+        self.node = SimpleNamespace(listen_address='127.0.0.1', listen_port=0, locals={})
+        self.loop = asyncio.get_running_loop()
+        self.master = True
+        self.routes = routes
+        self.udp_server = None
+        self.servers = {
+            f"Server {i}": SimpleNamespace(name=f"Server {i}", is_remote=False, status=Status.RUNNING, listeners={},
+                                           last_seen=None)
+            for i in range(SERVERS)
+        }
+
+
+async def replay(datagrams: list[bytes], rate: Optional[int] = None) -> tuple[float, list[float]]:
+    """
+    Replays the datagrams as fast as possible or with the given rate (datagrams per second).
+    Returns the elapsed time and the sorted dispatch latencies.
+    """
+    server_names = {json.loads(x)['server_name'] for x in datagrams}
+    commands = {json.loads(x)['command'] for x in datagrams}
+    latencies: list[float] = []
+    sent: dict[str, deque] = {x: deque() for x in server_names}
+    listeners = [(_Listener(latencies, sent), False)]
+    listeners += [(_Listener(None, sent), i == 0) for i in range(LISTENERS - 1)]
+    bus = _Bus({command: listeners for command in commands})
+    for name in server_names - bus.servers.keys():
+        bus.servers[name] = SimpleNamespace(name=name, is_remote=False, status=Status.RUNNING, listeners={},
+                                            last_seen=None)
+    await bus.start_udp_listener()
+    protocol = bus.udp_server
+    addr = ('127.0.0.1', 6666)
+
+    start = time.perf_counter()
+    for i, datagram in enumerate(datagrams):
+        sent[json.loads(datagram)['server_name']].append(time.perf_counter())
+        protocol.datagram_received(datagram, addr)
+        if i % BURST == BURST - 1:
+            if rate:
+                await asyncio.sleep(max(start + (i + 1) / rate - time.perf_counter(), 0))
+            else:
+                # the loop serves the consumers, before the next datagrams arrive
+                await asyncio.sleep(0)
+    for queue in list(protocol.message_queue.values()):
+        await queue.join()
+    elapsed = time.perf_counter() - start
+    await protocol.shutdown()
+    latencies.sort()
+    return elapsed, latencies
+
+
+async def main():
+    capture = os.environ.get('UDP_CAPTURE')
+    if capture:
+        with open(capture, mode='rb') as infile:
+            datagrams = [line.strip() for line in infile if line.strip()]
+    else:
+        datagrams = generate(random.Random(4711))
+    print(f"{len(datagrams)} datagrams for {len({json.loads(x)['server_name'] for x in datagrams})} servers, "
+          f"{LISTENERS} listeners per event")
+
+    elapsed, _ = await replay(datagrams)
+    print(f"Throughput: {len(datagrams) / elapsed:.0f} events/s")
+    # the latency is only meaningful below the throughput, otherwise it is the time spent in the queues
+    elapsed, latencies = await replay(datagrams[:RATE * 10], RATE)
+    print(f"Dispatch latency at {RATE} events/s: p50 {1000 * latencies[len(latencies) // 2]:.2f} ms, "
+          f"p99 {1000 * latencies[int(len(latencies) * 0.99)]:.2f} ms, max {1000 * latencies[-1]:.2f} ms")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())